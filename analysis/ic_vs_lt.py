@@ -1,8 +1,8 @@
+import numpy as np
 import pandas as pd
-import plotly.express as px
 
-from ic_model import independent_cascade
-from lt_model import linear_threshold
+from result_store import monte_carlo
+from result_writer import stream_rows
 
 
 # ============================================================
@@ -13,22 +13,27 @@ def analyze_ic_influence(
     G,
     seeds,
     p=0.1,
-    config_label="default"
+    config_label="default",
+    runs=1,
+    rng_seed=None,
+    store=None,
+    writer=None,
+    fingerprint=None
 ):
-    results = []
-
-    for s in seeds:
-        activated, _ = independent_cascade(G, s, p)
-
-        results.append({
-            "seed": s,
-            "model": "IC",
-            "activated_nodes": len(activated),
-            "p": p,
-            "config": config_label
-        })
-
-    return pd.DataFrame(results)
+    def rows():
+        for s in seeds:
+            df_runs = monte_carlo(G, "IC", [s], runs, rng_seed, store, fingerprint, p=p)
+            yield {
+                "seed": s,
+                "model": "IC",
+                "activated_nodes": df_runs["activated_nodes"].mean(),
+                "p": p,
+                "config": config_label
+            }
+
+    if writer is not None:
+        return stream_rows(rows(), writer)
+    return pd.DataFrame(list(rows()))
 
 
 # ============================================================
@@ -40,32 +45,74 @@ def analyze_lt_influence(
     seeds,
     threshold_mode="auto",
     fixed_threshold=None,
-    config_label="default"
+    config_label="default",
+    runs=1,
+    rng_seed=None,
+    store=None,
+    writer=None,
+    fingerprint=None
 ):
-    activated, _, thresholds, _ = linear_threshold(G, seeds)
+    df_runs = monte_carlo(
+        G, "LT", seeds, runs, rng_seed, store, fingerprint, fixed_threshold=fixed_threshold
+    )
 
-    rows = []
-    for s in seeds:
-        rows.append({
-            "seed": s,
-            "model": "LT",
-            "activated_nodes": len(activated),
-            "threshold": round(thresholds[s], 3),
-            "threshold_mode": threshold_mode,
-            "config": config_label
-        })
+    # seuil de chaque seed : fixe, ou moyenne des seuils tirés sur les runs
+    # (avec un seul run, le seuil tiré comme avant la mise en cache)
+    drawn = np.array(df_runs["seed_thresholds"].tolist(), dtype=float).reshape(len(df_runs), -1)
+    seed_thresholds = drawn.mean(axis=0) if len(df_runs) else np.full(len(seeds), np.nan)
 
-    return pd.DataFrame(rows)
+    def rows():
+        for s, threshold in zip(seeds, seed_thresholds):
+            yield {
+                "seed": s,
+                "model": "LT",
+                "activated_nodes": df_runs["activated_nodes"].mean(),
+                "threshold": round(float(threshold), 3),
+                "threshold_mode": threshold_mode,
+                "config": config_label
+            }
+
+    if writer is not None:
+        return stream_rows(rows(), writer)
+    return pd.DataFrame(list(rows()))
 
 
 # ============================================================
 # COMPARAISON IC vs LT
 # ============================================================
 
-def compare_ic_lt(G, seeds, p=0.1):
-    df_ic = analyze_ic_influence(G, seeds, p)
-    df_lt = analyze_lt_influence(G, seeds)
-    return pd.concat([df_ic, df_lt], ignore_index=True)
+def compare_ic_lt(G, seeds, p=0.1, runs=1, rng_seed=None, store=None, writer=None,
+                  fingerprint=None):
+    """
+    Comparaison IC vs LT sur les mêmes seeds.
+    Avec un ResultStore et un rng_seed, le tableau est relu depuis le cache.
+    Avec writer (StreamingResultWriter), les lignes sont écrites au fil de
+    l'eau et rien n'est renvoyé (relire avec read_partial).
+    fingerprint : empreinte de G déjà calculée, utilisée pour toutes les clés du cache.
+    """
+    if writer is not None:
+        # colonnes communes aux deux modèles, fixées avant la première ligne
+        if writer.columns is None:
+            writer.columns = ["seed", "model", "activated_nodes", "p",
+                              "threshold", "threshold_mode", "config"]
+        analyze_ic_influence(G, seeds, p, runs=runs, rng_seed=rng_seed, store=store, writer=writer,
+                             fingerprint=fingerprint)
+        analyze_lt_influence(G, seeds, runs=runs, rng_seed=rng_seed, store=store, writer=writer,
+                             fingerprint=fingerprint)
+        return None
+
+    def compute():
+        df_ic = analyze_ic_influence(G, seeds, p, runs=runs, rng_seed=rng_seed, store=store,
+                                     fingerprint=fingerprint)
+        df_lt = analyze_lt_influence(G, seeds, runs=runs, rng_seed=rng_seed, store=store,
+                                     fingerprint=fingerprint)
+        return pd.concat([df_ic, df_lt], ignore_index=True)
+
+    if store is None or rng_seed is None:
+        return compute()
+
+    key = store.key(fingerprint or G, "compare_ic_lt", {"p": p}, seeds, rng_seed, runs)
+    return store.cached(key, compute)
 
 
 # ============================================================
@@ -77,6 +124,7 @@ def plot_ic_lt_comparison(df):
     Affiche un graphe comparatif IC vs LT
     (nombre de nœuds activés par seed)
     """
+    import plotly.express as px
 
     fig = px.bar(
         df,
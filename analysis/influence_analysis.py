@@ -1,35 +1,48 @@
+import numpy as np
 import pandas as pd
 import networkx as nx
-import plotly.express as px
 
+from compiled_graph import compile_graph
 from ic_model import independent_cascade
+from reachability_sketches import build_sketches
 
 
 # ============================================================
 # TOP INFLUENCEURS STRUCTURELS
 # ============================================================
 
-def top_influencers(G, k=5):
+def top_influencers(G, k=5, store=None, degree=None, betweenness=None, verbose=True,
+                    fingerprint=None):
     """
     Top influenceurs structurels du réseau
+    degree, betweenness : dicts déjà calculés (ex : artefacts partagés du pipeline)
+    verbose : affiche le tableau (False quand l'appelant l'affiche lui-même)
+    fingerprint : empreinte de G déjà calculée (clé du cache)
     """
-    degree = dict(G.degree())
-    betweenness = nx.betweenness_centrality(G)
+    def compute():
+        degrees = dict(G.degree()) if degree is None else degree
+        btw = nx.betweenness_centrality(G) if betweenness is None else betweenness
 
-    rows = []
-    top_nodes = sorted(degree.items(), key=lambda x: x[1], reverse=True)[:k]
+        rows = []
+        top_nodes = sorted(degrees.items(), key=lambda x: x[1], reverse=True)[:k]
 
-    for node, deg in top_nodes:
-        rows.append({
-            "node": node,
-            "degree": deg,
-            "betweenness": round(betweenness[node], 4)
-        })
+        for node, deg in top_nodes:
+            rows.append({
+                "node": node,
+                "degree": deg,
+                "betweenness": round(btw[node], 4)
+            })
+
+        return pd.DataFrame(rows)
 
-    df = pd.DataFrame(rows)
+    if store is None:
+        df = compute()
+    else:
+        df = store.cached(store.key(fingerprint or G, "top_influencers", {"k": k}), compute)
 
-    print("\n=== Top influenceurs structurels du réseau ===")
-    print(df.to_string(index=False))
+    if verbose:
+        print("\n=== Top influenceurs structurels du réseau ===")
+        print(df.to_string(index=False))
 
     return df
 
@@ -38,12 +51,38 @@ def top_influencers(G, k=5):
 # STRUCTURE VS DIFFUSION
 # ============================================================
 
-def structure_vs_diffusion(G, seeds, p=0.3):
+def structure_vs_diffusion(G, seeds=None, p=0.3, degree=None, betweenness=None,
+                           sketches=None, rng_seed=None, store=None):
     """
     Compare centralité structurelle et diffusion réelle (IC)
+    degree, betweenness : dicts déjà calculés, comme pour top_influencers
+    seeds : nœuds simulés (une cascade chacun) ; None → TOUS les nœuds, avec
+            la diffusion estimée par esquisses de joignabilité
+            (reachability_sketches, construites ici si sketches est None)
+    store : cache de l'estimation sur tous les nœuds (avec rng_seed)
     """
-    degree = dict(G.degree())
-    betweenness = nx.betweenness_centrality(G)
+    if degree is None:
+        degree = dict(G.degree())
+    if betweenness is None:
+        betweenness = nx.betweenness_centrality(G)
+
+    if seeds is None:
+        def compute():
+            sk = sketches
+            if sk is None:
+                sk = build_sketches(compile_graph(G), p, rng=np.random.default_rng(rng_seed))
+            estimate = sk.estimate()
+            return pd.DataFrame({
+                "node": estimate.index,
+                "degree": [degree.get(v, 0) for v in estimate.index],
+                "betweenness": [round(betweenness.get(v, 0), 4) for v in estimate.index],
+                "influence_ic": estimate.to_numpy()
+            })
+
+        if store is None or rng_seed is None or sketches is not None:
+            return compute()
+        return store.cached(store.key(G, "structure_vs_diffusion_sketch", {"p": p},
+                                      rng_seed=rng_seed), compute)
 
     rows = []
 
@@ -64,6 +103,7 @@ def plot_structure_vs_diffusion(df):
     """
     Scatter plot : structure vs diffusion
     """
+    import plotly.express as px
     fig = px.scatter(
         df,
         x="degree",
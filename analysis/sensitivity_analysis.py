@@ -1,55 +1,78 @@
 import pandas as pd
-import plotly.express as px
 
-from ic_model import independent_cascade
-from lt_model import linear_threshold
+from result_store import monte_carlo
+from result_writer import stream_rows
 
 
 # ============================================================
 # SENSIBILITÉ IC — effet de p
 # ============================================================
 
-def sensitivity_ic(G, seed, p_values):
+def sensitivity_ic(G, seed, p_values, runs=1, rng_seed=None, store=None, writer=None,
+                   fingerprint=None):
     """
     Analyse de sensibilité du paramètre p (IC)
+    Avec writer (StreamingResultWriter), chaque point est écrit dès qu'il
+    est calculé et rien n'est renvoyé (relire avec read_partial).
+    fingerprint : empreinte de G déjà calculée, utilisée pour les clés du cache.
     """
-    rows = []
+    def rows():
+        for p in p_values:
+            df_runs = monte_carlo(G, "IC", [seed], runs, rng_seed, store, fingerprint, p=p)
+            yield {
+                "model": "IC",
+                "parameter": "p",
+                "value": p,
+                "activated_nodes": df_runs["activated_nodes"].mean(),
+                "steps": df_runs["steps"].mean()
+            }
 
-    for p in p_values:
-        activated, steps = independent_cascade(G, seed, p)
-        rows.append({
-            "model": "IC",
-            "parameter": "p",
-            "value": p,
-            "activated_nodes": len(activated),
-            "steps": len(steps)
-        })
+    def compute():
+        return pd.DataFrame(list(rows()))
 
-    return pd.DataFrame(rows)
+    if writer is not None:
+        return stream_rows(rows(), writer)
+    if store is None or rng_seed is None:
+        return compute()
+
+    key = store.key(fingerprint or G, "sensitivity_ic", {"p_values": list(p_values)}, [seed], rng_seed, runs)
+    return store.cached(key, compute)
 
 
 # ============================================================
 # SENSIBILITÉ LT — effet des seuils
 # ============================================================
 
-def sensitivity_lt(G, seeds, threshold_values):
+def sensitivity_lt(G, seeds, threshold_values, runs=1, rng_seed=None, store=None, writer=None,
+                   fingerprint=None):
     """
     Analyse de sensibilité des seuils (LT)
+    Avec writer, même fonctionnement que sensitivity_ic.
     """
-    rows = []
+    def rows():
+        for t in threshold_values:
+            df_runs = monte_carlo(G, "LT", seeds, runs, rng_seed, store, fingerprint,
+                                  fixed_threshold=t)
+            yield {
+                "model": "LT",
+                "parameter": "threshold",
+                "value": t,
+                "activated_nodes": df_runs["activated_nodes"].mean(),
+                "steps": df_runs["steps"].mean()
+            }
 
-    for t in threshold_values:
-        activated, steps, _, _ = linear_threshold(G, seeds)
+    def compute():
+        return pd.DataFrame(list(rows()))
 
-        rows.append({
-            "model": "LT",
-            "parameter": "threshold",
-            "value": t,
-            "activated_nodes": len(activated),
-            "steps": len(steps)
-        })
+    if writer is not None:
+        return stream_rows(rows(), writer)
+    if store is None or rng_seed is None:
+        return compute()
 
-    return pd.DataFrame(rows)
+    key = store.key(
+        fingerprint or G, "sensitivity_lt", {"threshold_values": list(threshold_values)}, seeds, rng_seed, runs
+    )
+    return store.cached(key, compute)
 
 
 # ============================================================
@@ -60,6 +83,7 @@ def plot_sensitivity(df, title):
     """
     Courbe de sensibilité
     """
+    import plotly.express as px
     fig = px.line(
         df,
         x="value",
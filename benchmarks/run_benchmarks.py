@@ -0,0 +1,233 @@
+# run_benchmarks.py
+#
+# Suite de benchmarks sur des graphes GitHub synthétiques :
+#
+#   python3 benchmarks/run_benchmarks.py                  # 10³, 10⁴, 10⁵ arcs
+#   python3 benchmarks/run_benchmarks.py --sizes 1e6 1e7  # grandes tailles
+#
+# Chaque mesure est ajoutée à benchmarks/history.jsonl (une ligne JSON par
+# mesure) et comparée à la mesure précédente de même taille.
+
+import argparse
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+ROOT_DIR = os.path.abspath(os.path.join(BENCH_DIR, ".."))
+CODE_DIR = os.path.join(ROOT_DIR, "code")
+
+if CODE_DIR not in sys.path:
+    sys.path.append(CODE_DIR)
+
+import networkx as nx
+import numpy as np
+
+from compiled_graph import compile_graph
+from csr_models import BACKENDS, independent_cascade_csr, linear_threshold_csr
+from data_loader import DATASET_FILES, load_json
+from edge_weights import ic_probabilities, interaction_counts, lt_weights
+from graph_builder import build_github_graph
+from ic_model import independent_cascade
+from lt_model import linear_threshold
+from reachability_sketches import build_sketches
+from synthetic_data import generate_github_data, sizes_for_edges, write_dataset
+
+HISTORY_FILE = os.path.join(BENCH_DIR, "history.jsonl")
+REGRESSION_RATIO = 1.25     # plus lent de 25 % que la mesure précédente…
+REGRESSION_MIN_DELTA = 0.01 # …et d'au moins 10 ms (ignore le bruit)
+
+
+# ============================================================
+# MESURE
+# ============================================================
+
+def timeit(fn, repeat=3):
+    """Meilleur temps (s) sur repeat exécutions, et le résultat de la dernière."""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn()
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def git_revision():
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            cwd=ROOT_DIR, capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+# ============================================================
+# BENCHMARKS
+# ============================================================
+
+def bench_size(n_edges, runs=20, layout_max_nodes=2000, betweenness_k=100, seed=0):
+    """Exécute tous les benchmarks pour un graphe d'environ n_edges arcs."""
+    results = {}
+
+    commits, issues, comments, stars = generate_github_data(**sizes_for_edges(n_edges), seed=seed)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        write_dataset(tmp, commits, issues, comments, stars)
+        results["load_json"], _ = timeit(
+            lambda: [load_json(os.path.join(tmp, f)) for f in DATASET_FILES]
+        )
+
+    results["build_github_graph"], G = timeit(
+        lambda: build_github_graph(commits, issues, comments, stars), repeat=1
+    )
+    results["compile_graph"], cg = timeit(lambda: compile_graph(G))
+
+    # Seeds : auteurs d'issues les plus actifs (ils ont des arcs sortants)
+    out_degree = cg.out_degree()
+    seed_id = int(np.argmax(out_degree))
+    seed_label = cg.nodes[seed_id]
+    rng = np.random.default_rng(seed)
+
+    results["independent_cascade"], _ = timeit(
+        lambda: [independent_cascade(G, seed_label, 0.1) for _ in range(runs)], repeat=1
+    )
+    results["linear_threshold"], _ = timeit(
+        lambda: [linear_threshold(G, [seed_label]) for _ in range(runs)], repeat=1
+    )
+    # moteurs CSR : NumPy (historique) puis noyaux Numba s'ils sont installés
+    for backend in sorted(BACKENDS, key=lambda b: b != "numpy"):
+        suffix = "" if backend == "numpy" else f"_{backend}"
+        independent_cascade_csr(cg, [seed_id], 0.1, rng=rng, backend=backend)   # compilation JIT
+        linear_threshold_csr(cg, [seed_id], rng=rng, backend=backend)
+        results[f"independent_cascade_csr{suffix}"], _ = timeit(
+            lambda: [independent_cascade_csr(cg, [seed_id], 0.1, rng=rng, backend=backend)
+                     for _ in range(runs)]
+        )
+        results[f"linear_threshold_csr{suffix}"], _ = timeit(
+            lambda: [linear_threshold_csr(cg, [seed_id], rng=rng, backend=backend)
+                     for _ in range(runs)]
+        )
+
+    # probabilités / poids hétérogènes (comptes d'interactions), préparés une fois
+    results["edge_weights"], (prob, weights) = timeit(lambda: (
+        ic_probabilities(cg, interaction_counts(G, cg), 0.1),
+        lt_weights(cg, interaction_counts(G, cg))
+    ))
+    results["independent_cascade_csr_weighted"], _ = timeit(
+        lambda: [independent_cascade_csr(cg, [seed_id], prob, rng=rng) for _ in range(runs)]
+    )
+    results["linear_threshold_csr_weighted"], _ = timeit(
+        lambda: [linear_threshold_csr(cg, [seed_id], rng=rng, weights=weights) for _ in range(runs)]
+    )
+
+    # diffusion IC estimée de tous les nœuds (esquisses bottom-k)
+    results["reachability_sketches"], _ = timeit(lambda: build_sketches(cg, 0.1, rng=rng))
+
+    results["degree_centrality"], _ = timeit(lambda: dict(G.degree()))
+    results["betweenness_centrality"], _ = timeit(
+        lambda: nx.betweenness_centrality(G, k=min(betweenness_k, G.number_of_nodes()), seed=seed),
+        repeat=1
+    )
+
+    if G.number_of_nodes() <= layout_max_nodes:
+        results["spring_layout"], _ = timeit(lambda: nx.spring_layout(G, seed=42), repeat=1)
+
+    return G.number_of_nodes(), G.number_of_edges(), results
+
+
+# ============================================================
+# HISTORIQUE
+# ============================================================
+
+def load_history(path=HISTORY_FILE):
+    if not os.path.exists(path):
+        return []
+    with open(path, encoding="utf-8") as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+
+def append_history(records, path=HISTORY_FILE):
+    with open(path, "a", encoding="utf-8") as f:
+        for r in records:
+            f.write(json.dumps(r) + "\n")
+
+
+def previous_timings(history, target_edges):
+    """Dernière mesure connue de chaque benchmark pour une taille donnée."""
+    last = {}
+    for r in history:
+        if r["target_edges"] == target_edges:
+            last[r["benchmark"]] = r["seconds"]
+    return last
+
+
+# ============================================================
+# MAIN
+# ============================================================
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmarks sur graphes GitHub synthétiques")
+    parser.add_argument("--sizes", nargs="+", type=float, default=[1e3, 1e4, 1e5],
+                        help="nombres d'arcs visés (ex : 1e3 1e6)")
+    parser.add_argument("--runs", type=int, default=20, help="simulations par benchmark IC/LT")
+    parser.add_argument("--layout-max-nodes", type=int, default=2000,
+                        help="taille maximale pour le benchmark de layout")
+    parser.add_argument("--history", default=HISTORY_FILE, help="fichier d'historique JSONL")
+    parser.add_argument("--no-save", action="store_true", help="ne pas écrire l'historique")
+    args = parser.parse_args()
+
+    history = load_history(args.history)
+    context = {
+        "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "revision": git_revision(),
+        "python": platform.python_version(),
+        "machine": platform.machine()
+    }
+
+    records = []
+    regressions = 0
+
+    for size in args.sizes:
+        target = int(size)
+        print(f"\n=== Benchmark : ~{target:,} arcs ===")
+
+        n_nodes, n_edges, results = bench_size(target, args.runs, args.layout_max_nodes)
+        print(f"Graphe : {n_nodes} nœuds / {n_edges} arcs")
+
+        before = previous_timings(history, target)
+        for name, seconds in results.items():
+            line = f"  {name:<34} {seconds:10.4f}s"
+            if name in before and before[name] > 0:
+                ratio = seconds / before[name]
+                line += f"   ×{ratio:.2f} vs précédent"
+                if ratio > REGRESSION_RATIO and seconds - before[name] > REGRESSION_MIN_DELTA:
+                    line += "  ⚠ RÉGRESSION"
+                    regressions += 1
+            print(line)
+
+            records.append({
+                **context,
+                "target_edges": target,
+                "n_nodes": n_nodes,
+                "n_edges": n_edges,
+                "runs": args.runs,
+                "benchmark": name,
+                "seconds": seconds
+            })
+
+    if not args.no_save:
+        append_history(records, args.history)
+        print(f"\n✔ {len(records)} mesures ajoutées à {args.history}")
+
+    if regressions:
+        print(f"⚠ {regressions} régression(s) détectée(s)")
+
+
+if __name__ == "__main__":
+    main()
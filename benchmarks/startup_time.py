@@ -0,0 +1,129 @@
+# startup_time.py
+#
+# Temps de démarrage des points d'entrée (import dans un interpréteur neuf) :
+#
+#   python3 benchmarks/startup_time.py
+#   python3 benchmarks/startup_time.py --repeat 10 --no-save
+#
+# Chaque cible est importée dans un sous-processus ; on garde le meilleur
+# temps et la liste des bibliothèques lourdes (matplotlib, plotly, PyGithub)
+# effectivement chargées. Les mesures rejoignent benchmarks/history.jsonl
+# (target_edges = 0) et sont comparées à la mesure précédente.
+
+import argparse
+import json
+import os
+import platform
+import subprocess
+import sys
+import time
+from datetime import datetime, timezone
+
+from run_benchmarks import (
+    CODE_DIR, HISTORY_FILE, REGRESSION_MIN_DELTA, REGRESSION_RATIO, ROOT_DIR,
+    append_history, git_revision, load_history, previous_timings
+)
+
+# points d'entrée mesurés, et bases de comparaison
+TARGETS = {
+    "python": "pass",
+    "numpy+pandas+networkx": "import numpy, pandas, networkx",
+    "main": "import main",
+    "batch_runner": "import batch_runner",
+    "campaign": "import campaign",
+    "service": "import service",
+    "graph_builder": "import graph_builder",
+    "analysis": "import analysis.ic_vs_lt, analysis.sensitivity_analysis, "
+                "analysis.influence_analysis"
+}
+
+HEAVY_MODULES = ["matplotlib", "plotly", "github", "scipy"]
+
+PROBE = (
+    "import sys, time\n"
+    "start = time.perf_counter()\n"
+    "{code}\n"
+    "elapsed = time.perf_counter() - start\n"
+    "import json\n"
+    "print(json.dumps([elapsed, [m for m in {heavy!r} if m in sys.modules]]))\n"
+)
+
+
+def measure(code, repeat=5):
+    """
+    Meilleur temps total (processus complet) et temps d'import seul, en
+    secondes, plus les bibliothèques lourdes chargées par code.
+    """
+    env = {**os.environ, "PYTHONPATH": os.pathsep.join([CODE_DIR, ROOT_DIR])}
+    script = PROBE.format(code=code, heavy=HEAVY_MODULES)
+
+    best_total = best_import = float("inf")
+    heavy = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        out = subprocess.run(
+            [sys.executable, "-c", script], cwd=CODE_DIR, env=env,
+            capture_output=True, text=True, check=True
+        ).stdout
+        total = time.perf_counter() - start
+        elapsed, heavy = json.loads(out.strip().splitlines()[-1])
+        best_total = min(best_total, total)
+        best_import = min(best_import, elapsed)
+
+    return best_total, best_import, heavy
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Temps de démarrage des points d'entrée")
+    parser.add_argument("--repeat", type=int, default=5, help="mesures par cible")
+    parser.add_argument("--targets", nargs="+", choices=list(TARGETS), default=list(TARGETS))
+    parser.add_argument("--history", default=HISTORY_FILE, help="fichier d'historique JSONL")
+    parser.add_argument("--no-save", action="store_true", help="ne pas écrire l'historique")
+    args = parser.parse_args()
+
+    history = load_history(args.history)
+    before = previous_timings(history, 0)
+    context = {
+        "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "revision": git_revision(),
+        "python": platform.python_version(),
+        "machine": platform.machine()
+    }
+
+    print(f"=== Démarrage (meilleur de {args.repeat}) ===")
+    print(f"  {'cible':<24} {'processus':>10} {'import':>10}   bibliothèques lourdes")
+
+    records = []
+    regressions = 0
+    for name in args.targets:
+        total, imported, heavy = measure(TARGETS[name], args.repeat)
+        benchmark = f"startup_{name}"
+
+        line = f"  {name:<24} {total:9.3f}s {imported:9.3f}s   {', '.join(heavy) or '-'}"
+        if before.get(benchmark):
+            ratio = total / before[benchmark]
+            line += f"   ×{ratio:.2f} vs précédent"
+            if ratio > REGRESSION_RATIO and total - before[benchmark] > REGRESSION_MIN_DELTA:
+                line += "  ⚠ RÉGRESSION"
+                regressions += 1
+        print(line)
+
+        records.append({
+            **context,
+            "target_edges": 0,
+            "benchmark": benchmark,
+            "seconds": total,
+            "import_seconds": imported,
+            "heavy_modules": heavy
+        })
+
+    if not args.no_save:
+        append_history(records, args.history)
+        print(f"\n✔ {len(records)} mesures ajoutées à {args.history}")
+
+    if regressions:
+        print(f"⚠ {regressions} régression(s) détectée(s)")
+
+
+if __name__ == "__main__":
+    main()
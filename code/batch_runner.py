@@ -0,0 +1,309 @@
+# batch_runner.py
+#
+# Lancement non interactif d'une grille d'expériences IC / LT décrite
+# dans un fichier JSON :
+#
+#   python3 code/batch_runner.py experiments/example_batch.json
+#
+# Voir experiments/example_batch.json pour le format.
+
+import argparse
+import hashlib
+import itertools
+import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from cascade_traces import CascadeStats
+from compiled_graph import compile_graph
+from csr_models import independent_cascade_csr, linear_threshold_csr
+from data_loader import load_dataset
+from graph_reduction import ic_activations, lt_activations, reduce_for_ic, reduce_for_lt
+from graph_builder import build_github_graph
+from instrumentation import CascadeRecorder, MetricsRegistry
+from mmap_graph import MmapGraph
+from multi_repo import build_merged_graph
+from result_writer import StreamingResultWriter
+
+
+# ============================================================
+# CONFIGURATION
+# ============================================================
+
+DEFAULTS = {
+    "models": ["IC", "LT"],
+    "p_values": [0.1],
+    "thresholds": [None],           # None = seuils aléatoires (mode "auto")
+    "seed_strategies": [{"name": "degree", "k": 5}],
+    "runs": 100,
+    "max_steps": 20,
+    "rng_seed": 42,
+    "workers": os.cpu_count(),
+    "output": "batch_results.csv",
+    "metrics": None,                # fichier .json ou .prom des métriques de simulation
+    "reduce": False                 # simuler sur le graphe réduit (graph_reduction)
+}
+
+
+def load_config(path):
+    """
+    Lit le fichier de configuration et complète les valeurs par défaut.
+    Les chemins relatifs sont résolus par rapport au fichier de config.
+    """
+    path = Path(path)
+    with open(path, encoding="utf-8") as f:
+        config = {**DEFAULTS, **json.load(f)}
+
+    if not config.get("repos"):
+        raise ValueError("La configuration doit lister au moins un repo (clé 'repos').")
+
+    for repo in config["repos"]:
+        resolve_repo(repo, path.parent)
+    config["output"] = str((path.parent / config["output"]).resolve())
+    if config["metrics"]:
+        config["metrics"] = str((path.parent / config["metrics"]).resolve())
+
+    return config
+
+
+def resolve_repo(repo, base):
+    """
+    Résout les chemins d'une entrée de "repos" par rapport à base. Une
+    entrée {"name", "merge": [{"name", "data_dir"}, ...]} désigne le graphe
+    fusionné de plusieurs repos (cf. multi_repo), une entrée {"name", "mmap"}
+    un graphe hors mémoire déjà construit (cf. mmap_graph).
+    """
+    if "mmap" in repo:
+        repo["mmap"] = str((Path(base) / repo["mmap"]).resolve())
+        return repo
+    for entry in repo.get("merge", [repo]):
+        entry["data_dir"] = str((Path(base) / entry["data_dir"]).resolve())
+    return repo
+
+
+def job_seed(*parts):
+    """Graine RNG déterministe dérivée du contenu d'un job."""
+    digest = hashlib.sha256(json.dumps(parts, default=str).encode()).digest()
+    return int.from_bytes(digest[:8], "little")
+
+
+def expand_grid(config):
+    """
+    Développe la grille repos × modèles × paramètres × stratégies de seeds.
+    Le paramètre balayé dépend du modèle : p pour IC, seuil pour LT.
+    """
+    jobs = []
+    for repo, model, strategy in itertools.product(
+        config["repos"], config["models"], config["seed_strategies"]
+    ):
+        values = config["p_values"] if model == "IC" else config["thresholds"]
+        for value in values:
+            jobs.append({
+                "repo": repo["name"],
+                "model": model,
+                "p": value if model == "IC" else None,
+                "threshold": value if model == "LT" else None,
+                "seed_strategy": strategy["name"],
+                "k": strategy["k"],
+                "runs": config["runs"],
+                "max_steps": config["max_steps"]
+            })
+    return jobs
+
+
+# ============================================================
+# PRÉPARATION (une fois par repo)
+# ============================================================
+
+def prepare_graph(data_dir):
+    """Charge le dataset, construit et compile le graphe."""
+    commits, issues, comments, stars = load_dataset(data_dir)
+    G = build_github_graph(commits, issues, comments, stars)
+    return compile_graph(G)
+
+
+def prepare_repo(repo):
+    """Graphe compilé d'une entrée de "repos" : un dataset, plusieurs fusionnés ou sur disque."""
+    if "mmap" in repo:
+        return MmapGraph(repo["mmap"])
+    if "merge" in repo:
+        return build_merged_graph(repo["merge"]).cg
+    return prepare_graph(repo["data_dir"])
+
+
+def select_seeds(cg, strategy, k, rng):
+    """Sélection des seeds : "degree" (degré maximal) ou "random"."""
+    k = min(k, cg.n_nodes)
+    if strategy == "degree":
+        return np.argsort(-cg.degree(), kind="stable")[:k]
+    if strategy == "random":
+        return np.sort(rng.choice(cg.n_nodes, size=k, replace=False))
+    raise ValueError(f"Stratégie de seeds inconnue : {strategy}")
+
+
+def job_seed_sets(jobs, graphs, rng_seed):
+    """Seeds (ids) de chaque job, tirés une fois par (repo, stratégie, k)."""
+    seed_sets = {}
+    for job in jobs:
+        key = (job["repo"], job["seed_strategy"], job["k"])
+        if key not in seed_sets:
+            rng = np.random.default_rng(job_seed(rng_seed, *key))
+            seed_sets[key] = select_seeds(graphs[job["repo"]], job["seed_strategy"], job["k"], rng)
+    return [seed_sets[(job["repo"], job["seed_strategy"], job["k"])] for job in jobs]
+
+
+# ============================================================
+# EXÉCUTION DES JOBS
+# ============================================================
+
+_GRAPHS = {}
+
+
+def _init_worker(graphs):
+    """Chaque worker reçoit les graphes compilés une seule fois."""
+    _GRAPHS.update(graphs)
+
+
+def run_job(job, seeds, rng_seed, instrument=False, reduce=False):
+    """
+    Exécute les runs d'une configuration.
+    Avec reduce, le graphe est réduit une fois pour les seeds du job et
+    chaque run ne touche que la partie atteignable.
+    Renvoie la ligne de résultats et, si instrument, l'instantané des métriques.
+    """
+    cg = _GRAPHS[job["repo"]]
+    rng = np.random.default_rng(rng_seed)
+
+    registry = hook = None
+    if instrument:
+        registry = MetricsRegistry()
+        hook = CascadeRecorder(job["model"], registry, repo=job["repo"])
+
+    start = time.perf_counter()
+    stats = CascadeStats(cg.n_nodes)
+
+    # simulate() → (step, ids) : tableau complet (ids None) ou nœuds activés seuls
+    if reduce and job["model"] == "IC":
+        rg = reduce_for_ic(cg, seeds)
+        simulate = lambda: ic_activations(rg, seeds, job["p"], job["max_steps"], rng, hook)[::-1]
+    elif reduce:
+        rg = reduce_for_lt(cg, seeds, job["threshold"])
+        simulate = lambda: lt_activations(rg, seeds, job["threshold"], rng, hook)[::-1]
+    elif job["model"] == "IC":
+        simulate = lambda: (
+            independent_cascade_csr(cg, seeds, job["p"], job["max_steps"], rng, hook), None
+        )
+    else:
+        simulate = lambda: (linear_threshold_csr(cg, seeds, job["threshold"], rng, hook), None)
+
+    for _ in range(job["runs"]):
+        stats.add(*simulate())
+
+    mean, std = stats.spread_mean_std()
+    row = {
+        **job,
+        "mean_activated": mean,
+        "std_activated": std,
+        "mean_steps": stats.depth_mean(),
+        "elapsed_s": time.perf_counter() - start
+    }
+    return row, registry.to_dict() if instrument else None
+
+
+def write_metrics(registry, path):
+    """Métriques de simulation au format Prometheus (.prom) ou JSON."""
+    if path.endswith(".prom"):
+        Path(path).write_text(registry.to_prometheus(), encoding="utf-8")
+    else:
+        registry.to_json(path)
+    print(f"✔ Métriques de simulation → {path}")
+
+
+def run_batch(config, registry=None, writer=None):
+    """
+    Exécute toute la grille et renvoie le tableau des résultats.
+    Avec un MetricsRegistry, les simulations sont instrumentées et leurs
+    métriques y sont agrégées. Avec un StreamingResultWriter, chaque ligne
+    y est ajoutée dès que sa configuration est terminée.
+    """
+    jobs = expand_grid(config)
+    instrument = registry is not None
+
+    print(f"=== Batch : {len(jobs)} configurations ===")
+
+    graphs = {}
+    for repo in config["repos"]:
+        print(f"→ Préparation du graphe {repo['name']}…")
+        graphs[repo["name"]] = prepare_repo(repo)
+
+    seed_sets = job_seed_sets(jobs, graphs, config["rng_seed"])
+    tasks = [
+        (job, seed_sets[i], job_seed(config["rng_seed"], job), instrument, config["reduce"])
+        for i, job in enumerate(jobs)
+    ]
+
+    rows = []
+
+    def collect(result):
+        row, snapshot = result
+        rows.append(row)
+        if writer is not None:
+            writer.write(row)
+        if snapshot is not None:
+            registry.merge(snapshot)
+
+    if config["workers"] <= 1:
+        _init_worker(graphs)
+        for task in tasks:
+            collect(run_job(*task))
+    else:
+        with ProcessPoolExecutor(
+            max_workers=config["workers"], initializer=_init_worker, initargs=(graphs,)
+        ) as pool:
+            futures = [pool.submit(run_job, *task) for task in tasks]
+            for done, future in enumerate(as_completed(futures), 1):
+                collect(future.result())
+                print(f"  {done}/{len(tasks)} configurations terminées")
+
+    df = pd.DataFrame(rows)
+    sort_cols = ["repo", "model", "seed_strategy", "k", "p", "threshold"]
+    return df.sort_values(sort_cols, na_position="first").reset_index(drop=True)
+
+
+# ============================================================
+# MAIN
+# ============================================================
+
+def main():
+    parser = argparse.ArgumentParser(description="Grille d'expériences IC / LT sans interaction")
+    parser.add_argument("config", help="fichier de configuration JSON")
+    parser.add_argument("--workers", type=int, help="nombre de processus (remplace la config)")
+    args = parser.parse_args()
+
+    config = load_config(args.config)
+    if args.workers is not None:
+        config["workers"] = args.workers
+
+    start = time.perf_counter()
+    registry = MetricsRegistry() if config["metrics"] else None
+
+    # résultats partiels lisibles pendant le batch (ordre d'achèvement),
+    # remplacés à la fin par le tableau trié
+    with StreamingResultWriter(config["output"], append=False, buffer_rows=50) as writer:
+        df = run_batch(config, registry, writer)
+    df.to_csv(config["output"], index=False)
+
+    if registry is not None:
+        write_metrics(registry, config["metrics"])
+
+    print(f"\n✔ {len(df)} configurations en {time.perf_counter() - start:.1f}s "
+          f"→ {config['output']}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,341 @@
+# campaign.py
+#
+# Campagnes Monte Carlo IC / LT longues, avec reprise après interruption :
+#
+#   python3 code/campaign.py experiments/example_campaign.json
+#   (Ctrl-C, crash…)
+#   python3 code/campaign.py experiments/example_campaign.json   → reprend
+#
+# Chaque configuration (repo, modèle, paramètre, seed) est découpée en
+# unités de chunk_runs runs, exécutées dans l'ordre avec le même flux RNG.
+# Après chaque unité, le fichier d'état (JSON, remplacé atomiquement)
+# enregistre les sommes accumulées, le nombre de runs faits et l'état du
+# générateur : la reprise repart de cet état exact, et les résultats sont
+# identiques à ceux d'une campagne sans interruption. L'état est lié aux
+# graphes eux-mêmes (empreintes) : un dataset re-scrapé entre deux sessions
+# n'est pas repris avec les runs de l'ancien graphe.
+
+import argparse
+import hashlib
+import json
+import os
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from batch_runner import (
+    _GRAPHS, _init_worker, job_seed, prepare_repo, resolve_repo, select_seeds
+)
+from cascade_traces import CascadeStats
+from compiled_graph import compiled_fingerprint
+from csr_models import independent_cascade_csr, linear_threshold_csr
+
+
+# ============================================================
+# CONFIGURATION
+# ============================================================
+
+DEFAULTS = {
+    "p_values": [0.1],
+    "thresholds": [None],           # None = seuils aléatoires (mode "auto")
+    "seed_strategy": {"name": "degree", "k": 5},
+    "runs": 1000,
+    "chunk_runs": 100,
+    "max_steps": 20,
+    "rng_seed": 42,
+    "workers": os.cpu_count(),
+    "state": "campaign_state.json",
+    "report": "campaign_report.csv"
+}
+
+# clés qui définissent les résultats, avec l'empreinte de chaque graphe :
+# l'état n'est réutilisable que si elles n'ont pas changé (runs peut
+# augmenter pour prolonger une campagne ; chunk_runs ne change que la
+# fréquence des sauvegardes). Les chemins des datasets n'y figurent pas :
+# déplacer le dossier du projet ne bloque pas la reprise.
+RESULT_KEYS = ["p_values", "thresholds", "seed_strategy", "max_steps", "rng_seed"]
+
+
+def load_config(path):
+    """Lit la configuration ; chemins relatifs résolus par rapport au fichier."""
+    path = Path(path)
+    with open(path, encoding="utf-8") as f:
+        config = {**DEFAULTS, **json.load(f)}
+
+    if not config.get("repos"):
+        raise ValueError("La configuration doit lister au moins un repo (clé 'repos').")
+
+    for repo in config["repos"]:
+        resolve_repo(repo, path.parent)
+    for key in ["state", "report"]:
+        config[key] = str((path.parent / config[key]).resolve())
+
+    return config
+
+
+def config_hash(config, graphs):
+    """Empreinte des paramètres de résultats et des graphes ({nom: graphe compilé})."""
+    payload = json.dumps({
+        **{k: config[k] for k in RESULT_KEYS},
+        "graphs": [[repo["name"], compiled_fingerprint(graphs[repo["name"]])]
+                   for repo in config["repos"]]
+    }, sort_keys=True, default=str)
+    return hashlib.sha256(payload.encode()).hexdigest()[:16]
+
+
+def campaign_jobs(config, seed_sets):
+    """
+    Configurations de la campagne, comme compare_ic_lt :
+    IC seed par seed pour chaque p, LT avec tous les seeds pour chaque seuil.
+    """
+    jobs = []
+    for repo in config["repos"]:
+        seeds = seed_sets[repo["name"]]
+        for p in config["p_values"]:
+            for s in seeds:
+                jobs.append({"repo": repo["name"], "model": "IC", "p": p,
+                             "threshold": None, "seeds": [s]})
+        for t in config["thresholds"]:
+            jobs.append({"repo": repo["name"], "model": "LT", "p": None,
+                         "threshold": t, "seeds": list(seeds)})
+
+    for job in jobs:
+        job["id"] = json.dumps([job["repo"], job["model"], job["p"], job["threshold"],
+                                job["seeds"]], default=str)
+    return jobs
+
+
+# ============================================================
+# UNITÉ DE TRAVAIL
+# ============================================================
+
+def run_unit(job, seed_ids, n_runs, max_steps, rng_state):
+    """
+    Exécute n_runs runs d'une configuration à partir de l'état RNG donné.
+    Renvoie les sommes entières de l'unité et l'état RNG final.
+    """
+    cg = _GRAPHS[job["repo"]]
+    rng = np.random.default_rng()
+    rng.bit_generator.state = rng_state
+
+    stats = CascadeStats(cg.n_nodes)
+    for _ in range(n_runs):
+        if job["model"] == "IC":
+            step = independent_cascade_csr(cg, seed_ids, job["p"], max_steps, rng)
+        else:
+            step = linear_threshold_csr(cg, seed_ids, job["threshold"], rng)
+        stats.add(step)
+
+    spreads = np.arange(stats.spread_hist.size)
+    depths = np.arange(stats.depth_hist.size)
+    sums = {
+        "runs": n_runs,
+        "spread_sum": int((spreads * stats.spread_hist).sum()),
+        "spread_sq_sum": int((spreads ** 2 * stats.spread_hist).sum()),
+        "steps_sum": int((depths * stats.depth_hist).sum())
+    }
+    return job["id"], sums, rng.bit_generator.state
+
+
+# ============================================================
+# CAMPAGNE
+# ============================================================
+
+class Campaign:
+    """
+    État d'une campagne : pour chaque configuration, runs faits, sommes
+    accumulées et état du générateur après la dernière unité terminée.
+    """
+
+    def __init__(self, config):
+        self.config = config
+        self.path = Path(config["state"])
+
+        self.graphs = {}
+        seed_sets = {}
+        for repo in config["repos"]:
+            print(f"→ Préparation du graphe {repo['name']}…")
+            cg = prepare_repo(repo)
+            strategy = config["seed_strategy"]
+            rng = np.random.default_rng(job_seed(config["rng_seed"], repo["name"], strategy))
+            ids = select_seeds(cg, strategy["name"], strategy["k"], rng)
+            self.graphs[repo["name"]] = cg
+            seed_sets[repo["name"]] = cg.labels(ids)
+
+        self.hash = config_hash(config, self.graphs)
+        self.jobs = {job["id"]: job for job in campaign_jobs(config, seed_sets)}
+        self.state = self._load()
+
+    def _initial(self, job):
+        rng = np.random.default_rng(job_seed(self.config["rng_seed"], job["id"]))
+        return {"runs": 0, "spread_sum": 0, "spread_sq_sum": 0, "steps_sum": 0,
+                "rng_state": rng.bit_generator.state}
+
+    def _load(self):
+        state = {"config_hash": self.hash, "jobs": {}}
+        if self.path.exists():
+            with open(self.path, encoding="utf-8") as f:
+                state = json.load(f)
+            if state["config_hash"] != self.hash:
+                raise ValueError(
+                    f"{self.path} correspond à une autre configuration ou à d'autres graphes : "
+                    "supprimer le fichier ou changer la clé 'state'."
+                )
+        for job_id, job in self.jobs.items():
+            state["jobs"].setdefault(job_id, self._initial(job))
+        return state
+
+    def save(self):
+        """Écriture atomique : le fichier d'état est toujours complet."""
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self.path.with_suffix(".tmp")
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(self.state, f)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, self.path)
+
+    # ----------------------------
+    # Unités restantes
+    # ----------------------------
+    def next_unit(self, job_id):
+        """(job, n_runs, rng_state) de la prochaine unité, ou None si terminée."""
+        done = self.state["jobs"][job_id]
+        remaining = self.config["runs"] - done["runs"]
+        if remaining <= 0:
+            return None
+        return self.jobs[job_id], min(self.config["chunk_runs"], remaining), done["rng_state"]
+
+    def record(self, job_id, sums, rng_state):
+        done = self.state["jobs"][job_id]
+        for key, value in sums.items():
+            done[key] += value
+        done["rng_state"] = rng_state
+        self.save()
+
+    def progress(self):
+        total = self.config["runs"] * len(self.jobs)
+        done = sum(min(j["runs"], self.config["runs"]) for j in self.state["jobs"].values())
+        return done, total
+
+    # ----------------------------
+    # Exécution
+    # ----------------------------
+    def run(self, max_units=None):
+        """
+        Exécute les unités restantes (au plus max_units). Les unités d'une
+        même configuration s'enchaînent, les configurations sont réparties
+        sur les workers. L'état est sauvegardé après chaque unité.
+        """
+        done, total = self.progress()
+        print(f"=== Campagne : {len(self.jobs)} configurations, {done}/{total} runs déjà faits ===")
+
+        units = 0
+        workers = self.config["workers"]
+
+        def unit_args(job_id):
+            job, n_runs, rng_state = self.next_unit(job_id)
+            seed_ids = self.graphs[job["repo"]].ids(job["seeds"])
+            return job, seed_ids, n_runs, self.config["max_steps"], rng_state
+
+        if workers <= 1:
+            _init_worker(self.graphs)
+            for job_id in self.jobs:
+                while (max_units is None or units < max_units) and self.next_unit(job_id):
+                    self.record(*run_unit(*unit_args(job_id)))
+                    units += 1
+            return self.report()
+
+        with ProcessPoolExecutor(
+            max_workers=workers, initializer=_init_worker, initargs=(self.graphs,)
+        ) as pool:
+            # une configuration n'a jamais deux unités en cours : son flux RNG
+            # est consommé dans l'ordre
+            queue = [job_id for job_id in self.jobs if self.next_unit(job_id)]
+            pending = set()
+
+            while queue or pending:
+                while queue and len(pending) < 2 * workers and (
+                    max_units is None or units + len(pending) < max_units
+                ):
+                    pending.add(pool.submit(run_unit, *unit_args(queue.pop(0))))
+                if not pending:
+                    break
+
+                finished, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in finished:
+                    job_id, sums, rng_state = future.result()
+                    self.record(job_id, sums, rng_state)
+                    units += 1
+                    if self.next_unit(job_id):
+                        queue.append(job_id)
+
+                done, total = self.progress()
+                print(f"  {done}/{total} runs")
+
+        return self.report()
+
+    # ----------------------------
+    # Rapport
+    # ----------------------------
+    def report(self):
+        """
+        Tableau au format de compare_ic_lt (une ligne par seed et par
+        modèle), calculé sur les runs déjà faits : utilisable en cours de campagne.
+        """
+        rows = []
+        for job_id, job in self.jobs.items():
+            done = self.state["jobs"][job_id]
+            n = done["runs"]
+            mean = done["spread_sum"] / n if n else np.nan
+            var = done["spread_sq_sum"] / n - mean ** 2 if n else np.nan
+            for seed in job["seeds"]:
+                rows.append({
+                    "repo": job["repo"],
+                    "seed": seed,
+                    "model": job["model"],
+                    "activated_nodes": mean,
+                    "std_activated": np.sqrt(max(var, 0.0)) if n else np.nan,
+                    "steps": done["steps_sum"] / n if n else np.nan,
+                    "p": job["p"],
+                    "threshold": job["threshold"],
+                    "threshold_mode": None if job["model"] == "IC" else
+                    ("auto" if job["threshold"] is None else "fixed"),
+                    "runs": n
+                })
+        return pd.DataFrame(rows)
+
+
+# ============================================================
+# MAIN
+# ============================================================
+
+def main():
+    parser = argparse.ArgumentParser(description="Campagne Monte Carlo IC / LT avec reprise")
+    parser.add_argument("config", help="fichier de configuration JSON")
+    parser.add_argument("--workers", type=int, help="nombre de processus (remplace la config)")
+    parser.add_argument("--max-units", type=int, help="s'arrêter après ce nombre d'unités")
+    args = parser.parse_args()
+
+    config = load_config(args.config)
+    if args.workers is not None:
+        config["workers"] = args.workers
+
+    start = time.perf_counter()
+    campaign = Campaign(config)
+    df = campaign.run(args.max_units)
+
+    Path(config["report"]).parent.mkdir(parents=True, exist_ok=True)
+    df.to_csv(config["report"], index=False)
+
+    done, total = campaign.progress()
+    status = "terminée" if done == total else "interrompue (relancer pour reprendre)"
+    print(f"\n✔ Campagne {status} : {done}/{total} runs en "
+          f"{time.perf_counter() - start:.1f}s → {config['report']}")
+
+
+if __name__ == "__main__":
+    main()
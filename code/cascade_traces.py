@@ -0,0 +1,281 @@
+# cascade_traces.py
+
+from dataclasses import dataclass
+
+import numpy as np
+import pandas as pd
+
+
+# =====================================================================
+# Traces de cascade compactes et statistiques agrégées
+#
+# Une trace est le tableau step d'un run (étape d'activation de chaque
+# nœud, -1 si inactif, cf. csr_models), stocké sous l'une des formes :
+#   - "dense"  : int16 par nœud (2 octets × n)
+#   - "bitset" : un bit par nœud + int16 par nœud activé
+#   - "rle"    : plages d'ids activés consécutifs (début, longueur en
+#                int32) + int16 par nœud activé
+# encode_trace choisit par défaut la forme la plus petite. Les
+# accumulateurs de CascadeStats ne gardent aucune trace : mémoire O(n)
+# quel que soit le nombre de runs.
+# =====================================================================
+
+FORMATS = ("dense", "bitset", "rle")
+
+
+@dataclass
+class Trace:
+    """Trace encodée d'un run sur un graphe de n_nodes nœuds."""
+    format: str
+    n_nodes: int
+    data: tuple
+
+    @property
+    def nbytes(self):
+        return sum(a.nbytes for a in self.data)
+
+    @property
+    def spread(self):
+        if self.format == "dense":
+            return int(np.count_nonzero(self.data[0] >= 0))
+        return len(self.data[-1])
+
+    def activations(self):
+        """(ids, step) des nœuds activés, ids croissants."""
+        if self.format == "dense":
+            ids = np.flatnonzero(self.data[0] >= 0)
+            return ids, self.data[0][ids].astype(np.int32)
+        if self.format == "bitset":
+            bits, steps = self.data
+            ids = np.flatnonzero(np.unpackbits(bits, count=self.n_nodes))
+        else:
+            starts, lengths, steps = self.data
+            ids = _expand_runs(starts, lengths)
+        return ids, steps.astype(np.int32)
+
+    def decode(self):
+        """Tableau step complet (int32), comme renvoyé par les moteurs CSR."""
+        step = np.full(self.n_nodes, -1, dtype=np.int32)
+        ids, steps = self.activations()
+        step[ids] = steps
+        return step
+
+
+def _expand_runs(starts, lengths):
+    total = int(lengths.sum())
+    if total == 0:
+        return np.empty(0, dtype=np.int64)
+    offsets = np.repeat(starts.astype(np.int64) - np.cumsum(lengths) + lengths, lengths)
+    return offsets + np.arange(total)
+
+
+def _runs(ids):
+    """Plages d'entiers consécutifs d'un tableau d'ids trié."""
+    if ids.size == 0:
+        return np.empty(0, dtype=np.int32), np.empty(0, dtype=np.int32)
+    breaks = np.flatnonzero(np.diff(ids) != 1) + 1
+    starts = ids[np.concatenate([[0], breaks])]
+    ends = ids[np.concatenate([breaks - 1, [ids.size - 1]])]
+    return starts.astype(np.int32), (ends - starts + 1).astype(np.int32)
+
+
+def _steps16(steps):
+    if steps.size and steps.max() > np.iinfo(np.int16).max:
+        raise ValueError("Étape d'activation trop grande pour une trace int16")
+    return steps.astype(np.int16)
+
+
+def encode_trace(step, format="auto"):
+    """
+    Encode un tableau step (taille n, -1 = inactif).
+    format : "dense", "bitset", "rle" ou "auto" (le plus compact).
+    """
+    step = np.asarray(step)
+    n = step.size
+    active = step >= 0
+    ids = np.flatnonzero(active)
+    steps = _steps16(step[ids])
+
+    if format == "auto":
+        starts, lengths = _runs(ids)
+        sizes = {
+            "dense": 2 * n,
+            "bitset": (n + 7) // 8 + 2 * ids.size,
+            "rle": 8 * starts.size + 2 * ids.size
+        }
+        format = min(sizes, key=sizes.get)
+
+    if format == "dense":
+        return Trace(format, n, (_steps16(step),))
+    if format == "bitset":
+        return Trace(format, n, (np.packbits(active), steps))
+    if format == "rle":
+        return Trace(format, n, (*_runs(ids), steps))
+    raise ValueError(f"Format de trace inconnu : {format}")
+
+
+# ----------------------------
+# Conversion des résultats des modèles Python
+# ----------------------------
+def step_from_ic(cg, steps):
+    """Tableau step depuis les couches renvoyées par ic_model.independent_cascade."""
+    step = np.full(cg.n_nodes, -1, dtype=np.int32)
+    for t, layer in enumerate(steps):
+        if layer:
+            step[cg.ids(layer)] = t
+    return step
+
+
+def step_from_lt(cg, activation_step):
+    """Tableau step depuis le dict activation_step de lt_model.linear_threshold."""
+    step = np.full(cg.n_nodes, -1, dtype=np.int32)
+    if activation_step:
+        step[cg.ids(activation_step.keys())] = list(activation_step.values())
+    return step
+
+
+# =====================================================================
+# 📦 1. COLLECTION DE TRACES
+# =====================================================================
+
+class CascadeTraces:
+    """Traces d'une série de runs, chacune encodée sous sa forme la plus compacte."""
+
+    def __init__(self, n_nodes, format="auto"):
+        self.n_nodes = n_nodes
+        self.format = format
+        self.traces = []
+
+    def append(self, step):
+        self.traces.append(encode_trace(step, self.format))
+
+    def __len__(self):
+        return len(self.traces)
+
+    def __getitem__(self, i):
+        return self.traces[i].decode()
+
+    @property
+    def nbytes(self):
+        return sum(t.nbytes for t in self.traces)
+
+    def save(self, path):
+        """Sauvegarde en un seul .npz compressé (ids et étapes des nœuds activés de chaque run)."""
+        ids, steps, runs = [], [], []
+        for trace in self.traces:
+            a, s = trace.activations()
+            ids.append(a)
+            steps.append(s)
+            runs.append(a.size)
+        np.savez_compressed(
+            path,
+            n_nodes=self.n_nodes,
+            counts=np.array(runs, dtype=np.int64),
+            ids=np.concatenate(ids or [np.empty(0)]).astype(np.int32),
+            steps=_steps16(np.concatenate(steps or [np.empty(0)]))
+        )
+
+    @classmethod
+    def load(cls, path, format="auto"):
+        with np.load(path) as f:
+            n = int(f["n_nodes"])
+            bounds = np.concatenate([[0], np.cumsum(f["counts"])])
+            ids, steps = f["ids"], f["steps"]
+        traces = cls(n, format)
+        for a, b in zip(bounds[:-1], bounds[1:]):
+            step = np.full(n, -1, dtype=np.int32)
+            step[ids[a:b]] = steps[a:b]
+            traces.append(step)
+        return traces
+
+
+# =====================================================================
+# 📊 2. ACCUMULATEURS EN FLUX
+# =====================================================================
+
+class CascadeStats:
+    """
+    Statistiques agrégées sur des runs, sans conserver les traces :
+    probabilité d'activation et étape moyenne par nœud, histogrammes de
+    la portée (nombre de nœuds activés) et de la profondeur (nombre d'étapes).
+    """
+
+    def __init__(self, n_nodes):
+        self.n_nodes = n_nodes
+        self.runs = 0
+        self.active_count = np.zeros(n_nodes, dtype=np.int64)
+        self.step_sum = np.zeros(n_nodes, dtype=np.int64)
+        self.spread_hist = np.zeros(1, dtype=np.int64)
+        self.depth_hist = np.zeros(1, dtype=np.int64)
+
+    @staticmethod
+    def _bump(hist, value):
+        if value >= hist.size:
+            hist = np.concatenate([hist, np.zeros(value + 1 - hist.size, dtype=np.int64)])
+        hist[value] += 1
+        return hist
+
+    def add(self, step, ids=None):
+        """
+        Ajoute un run : tableau step complet, ou (avec ids) étapes des seuls
+        nœuds activés, comme renvoyé par graph_reduction.ic_activations.
+        """
+        step = np.asarray(step)
+        if ids is None:
+            ids = np.flatnonzero(step >= 0)
+            step = step[ids]
+
+        self.runs += 1
+        self.active_count[ids] += 1
+        self.step_sum[ids] += step
+        self.spread_hist = self._bump(self.spread_hist, len(ids))
+        self.depth_hist = self._bump(self.depth_hist, int(step.max()) + 1 if len(ids) else 0)
+
+    def add_trace(self, trace):
+        ids, step = trace.activations()
+        self.add(step, ids)
+
+    def merge(self, other):
+        """Fusionne les statistiques d'un autre accumulateur (ex : autre worker)."""
+        self.runs += other.runs
+        self.active_count += other.active_count
+        self.step_sum += other.step_sum
+        for name in ["spread_hist", "depth_hist"]:
+            a, b = getattr(self, name), getattr(other, name)
+            size = max(a.size, b.size)
+            setattr(self, name, np.pad(a, (0, size - a.size)) + np.pad(b, (0, size - b.size)))
+
+    # ----------------------------
+    # Lecture
+    # ----------------------------
+    def activation_probability(self):
+        return self.active_count / max(self.runs, 1)
+
+    def mean_activation_step(self):
+        """Étape moyenne d'activation, sur les runs où le nœud est activé (NaN sinon)."""
+        with np.errstate(invalid="ignore", divide="ignore"):
+            return np.where(self.active_count > 0, self.step_sum / self.active_count, np.nan)
+
+    def _moments(self, hist):
+        values = np.arange(hist.size)
+        mean = (values * hist).sum() / max(self.runs, 1)
+        var = (values ** 2 * hist).sum() / max(self.runs, 1) - mean ** 2
+        return mean, np.sqrt(max(var, 0.0))
+
+    def spread_mean_std(self):
+        return self._moments(self.spread_hist)
+
+    def depth_mean(self):
+        return self._moments(self.depth_hist)[0]
+
+    def spread_histogram(self):
+        hist = pd.Series(self.spread_hist, name="runs")
+        hist.index.name = "activated_nodes"
+        return hist[hist > 0]
+
+    def to_frame(self, cg):
+        """Tableau par nœud (labels de cg) : probabilité et étape moyenne d'activation."""
+        return pd.DataFrame({
+            "activation_probability": self.activation_probability(),
+            "mean_activation_step": self.mean_activation_step()
+        }, index=pd.Index(cg.nodes, name="node"))
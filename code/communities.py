@@ -0,0 +1,286 @@
+# communities.py
+
+import hashlib
+import json
+
+import numpy as np
+import pandas as pd
+
+from compiled_graph import compiled_fingerprint
+from csr_models import independent_cascade_csr, linear_threshold_csr
+from node_index import USER
+
+
+# =====================================================================
+# Communautés et diffusion à l'échelle des communautés
+#
+# Détection par propagation de labels semi-synchrone (Cordasco & Gargano)
+# sur le CSR, arcs pris dans les deux sens. Les nœuds sont d'abord
+# répartis en classes indépendantes (coloration : aucun arc entre deux
+# nœuds d'une même classe) ; chaque itération met à jour les classes l'une
+# après l'autre. Dans une classe, tous les nœuds changent à la fois, sans
+# dépendre les uns des autres : c'est équivalent à une mise à jour
+# asynchrone, qui converge, y compris sur les parties biparties du graphe
+# (users ↔ issues) où la mise à jour synchrone oscille. Chaque nœud prend
+# le label le plus fréquent parmi ses voisins (tri des paires (nœud, label
+# voisin), aucune boucle Python sur les nœuds) et garde le sien en cas
+# d'égalité.
+#
+# detect_communities vérifie le résultat : sans convergence, ou avec une
+# modularité inférieure à celle de la partition triviale (0), il relance
+# avec une autre graine, puis se rabat sur une seule communauté.
+#
+# Les métriques de diffusion agrègent des runs IC / LT par communauté
+# avec des bincount : aucune boucle Python sur les nœuds.
+# =====================================================================
+
+MAX_ITER = 50
+RETRIES = 3
+
+
+def _undirected(cg):
+    """Paires (nœud, voisin) : chaque arc dans les deux sens."""
+    src = cg.edge_sources().astype(np.int64)
+    dst = np.asarray(cg.indices, dtype=np.int64)
+    return np.concatenate([src, dst]), np.concatenate([dst, src])
+
+
+def _first_of_runs(sorted_keys):
+    if sorted_keys.size == 0:
+        return sorted_keys.astype(bool)
+    return np.concatenate([[True], sorted_keys[1:] != sorted_keys[:-1]])
+
+
+def color_classes(cg, rng=None):
+    """
+    Coloration du graphe non orienté (boucles ignorées) : classe de chaque
+    nœud (int32), deux voisins n'ont jamais la même classe. À chaque tour,
+    les nœuds non colorés de priorité aléatoire maximale parmi leurs voisins
+    non colorés forment une nouvelle classe (ensemble indépendant, Luby).
+    """
+    rng = rng if rng is not None else np.random.default_rng()
+    n = cg.n_nodes
+    node, nbr = _undirected(cg)
+    keep = node != nbr
+    node, nbr = node[keep], nbr[keep]
+
+    priority = rng.permutation(n)
+    color = np.full(n, -1, dtype=np.int32)
+    c = 0
+    while (color < 0).any():
+        live = (color[node] < 0) & (color[nbr] < 0)
+        best = np.full(n, -1, dtype=np.int64)
+        np.maximum.at(best, node[live], priority[nbr[live]])
+        chosen = (color < 0) & (priority > best)
+        color[chosen] = c
+        c += 1
+    return color
+
+
+def label_propagation(cg, max_iter=MAX_ITER, rng=None):
+    """
+    Communauté de chaque nœud (int32, 0 = la plus grande). Les nœuds
+    isolés forment chacun leur propre communauté.
+    Renvoie (communities, itérations effectuées, convergé).
+    """
+    rng = rng if rng is not None else np.random.default_rng()
+    n = cg.n_nodes
+    node, nbr = _undirected(cg)
+    labels = np.arange(n, dtype=np.int64)
+
+    # paires regroupées par classe du nœud mis à jour
+    color = color_classes(cg, rng)
+    order = np.argsort(color[node], kind="stable")
+    node, nbr = node[order], nbr[order]
+    bounds = np.searchsorted(color[node], np.arange(int(color.max(initial=-1)) + 2))
+
+    it, converged = 0, False
+    for it in range(1, max_iter + 1):
+        changed = 0
+        for lo, hi in zip(bounds[:-1], bounds[1:]):
+            if lo == hi:
+                continue
+            # fréquence de chaque label voisin, par nœud (tri au lieu de np.unique)
+            keys = np.sort(node[lo:hi] * n + labels[nbr[lo:hi]])
+            first = np.flatnonzero(_first_of_runs(keys))
+            counts = np.diff(np.append(first, keys.size))
+            owner, label = keys[first] // n, keys[first] % n
+
+            # meilleur label : fréquence, + 0.5 pour le label actuel (garde en
+            # cas d'égalité), + bruit < 0.4 (départage les autres au hasard)
+            score = counts + 0.5 * (label == labels[owner]) + 0.4 * rng.random(counts.size)
+            best = np.lexsort((score, owner))
+            last = np.append(owner[best][1:] != owner[best][:-1], True)
+            best_owner, best_label = owner[best][last], label[best][last]
+
+            moved = best_label != labels[best_owner]
+            labels[best_owner[moved]] = best_label[moved]
+            changed += int(moved.sum())
+
+        if changed == 0:
+            converged = True        # plus aucun nœud ne change : stable
+            break
+
+    # ids denses, par taille décroissante
+    _, inverse, sizes = np.unique(labels, return_inverse=True, return_counts=True)
+    rank = np.empty(sizes.size, dtype=np.int64)
+    rank[np.argsort(-sizes, kind="stable")] = np.arange(sizes.size)
+    return rank[inverse].astype(np.int32), it, converged
+
+
+def modularity(cg, communities):
+    """
+    Modularité de la partition sur le graphe non orienté (chaque arc est
+    une arête) : Σ_c L_c / m - (d_c / 2m)². 0 pour une seule communauté.
+    """
+    m = cg.n_edges
+    if m == 0:
+        return 0.0
+    c = communities.astype(np.int64)
+    src, dst = cg.edge_sources(), cg.indices
+    n_comm = int(c.max()) + 1
+    internal = np.bincount(c[src][c[src] == c[dst]], minlength=n_comm)
+    degree = np.bincount(c, weights=cg.degree(), minlength=n_comm)
+    return float((internal / m - (degree / (2 * m)) ** 2).sum())
+
+
+def detect_communities(cg, max_iter=MAX_ITER, rng_seed=0, store=None, retries=RETRIES):
+    """
+    Communautés de cg, en cache par empreinte du graphe compilé si store
+    (ResultStore) est donné. Renvoie un tableau int32 aligné sur les ids.
+
+    Une propagation qui ne converge pas en max_iter itérations, ou dont la
+    modularité est négative (pire qu'une seule communauté), est relancée
+    avec une autre graine (au plus retries fois) ; à défaut, la meilleure
+    partition trouvée est gardée, ou une communauté unique.
+    """
+    def compute():
+        best, best_q = np.zeros(cg.n_nodes, dtype=np.int32), 0.0
+        for attempt in range(retries + 1):
+            rng = np.random.default_rng([rng_seed, attempt] if attempt else rng_seed)
+            communities, it, converged = label_propagation(cg, max_iter, rng)
+            q = modularity(cg, communities)
+            if converged and q >= 0:
+                best, best_q = communities, q
+                break
+            print(f"⚠ Propagation de labels (essai {attempt + 1}) : "
+                  f"{'non convergée en ' + str(it) + ' itérations' if not converged else 'convergée'}, "
+                  f"modularité {q:.3f}")
+            if q > best_q:
+                best, best_q = communities, q
+        else:
+            print(f"⚠ Partition retenue : modularité {best_q:.3f}")
+        return pd.DataFrame({"community": best})
+
+    if store is None:
+        return compute()["community"].to_numpy()
+
+    payload = json.dumps({"graph": compiled_fingerprint(cg), "model": "label_propagation_semisync",
+                          "max_iter": max_iter, "rng_seed": rng_seed, "retries": retries},
+                         sort_keys=True)
+    key = hashlib.sha256(payload.encode()).hexdigest()
+    return store.cached(key, compute)["community"].to_numpy()
+
+
+def community_table(cg, communities):
+    """Une ligne par communauté : taille, users, arcs internes et arcs frontières."""
+    c = communities.astype(np.int64)
+    n_comm = int(c.max()) + 1 if c.size else 0
+    src, dst = cg.edge_sources(), cg.indices
+    internal = c[src] == c[dst]
+    return pd.DataFrame({
+        "community": np.arange(n_comm),
+        "size": np.bincount(c, minlength=n_comm),
+        "users": np.bincount(c, weights=cg.kind == USER, minlength=n_comm).astype(np.int64),
+        "internal_edges": np.bincount(c[src][internal], minlength=n_comm),
+        "boundary_edges": np.bincount(c[src][~internal], minlength=n_comm)
+                          + np.bincount(c[dst][~internal], minlength=n_comm)
+    })
+
+
+# =====================================================================
+# 📊 Diffusion par communauté
+# =====================================================================
+
+def activation_parents(cg, step, model="IC"):
+    """
+    Arcs (parent, activé, part) d'une cascade : chaque nœud activé après
+    l'étape 0 répartit une unité entre ses activateurs possibles.
+    IC : prédécesseurs activés à l'étape précédente.
+    LT : voisins (dans les deux sens) activés avant lui.
+    """
+    if model == "IC":
+        u, v = cg.edge_sources(), np.asarray(cg.indices)
+        keep = (step[u] >= 0) & (step[v] == step[u] + 1)
+    else:
+        u, v = _undirected(cg)
+        keep = (step[u] >= 0) & (step[v] > step[u])
+    u, v = u[keep], v[keep]
+    n_parents = np.bincount(v, minlength=cg.n_nodes)
+    return u, v, 1.0 / n_parents[v]
+
+
+def community_diffusion(cg, communities, seeds, model="IC", p=0.1, threshold=None,
+                        runs=100, max_steps=20, rng=None):
+    """
+    Métriques de diffusion par communauté sur runs cascades.
+
+    Renvoie (summary, flows) :
+      summary : par communauté, probabilité moyenne d'activation de ses
+                nœuds, probabilité d'être atteinte (≥ 1 nœud activé hors
+                seeds), nombre moyen d'activés, seeds contenus
+      flows   : activations attribuées par run d'une communauté à l'autre
+                (cascade inter-communautés ; la diagonale = flux interne)
+    """
+    rng = rng if rng is not None else np.random.default_rng()
+    seeds = np.asarray(seeds, dtype=np.int64)
+    c = communities.astype(np.int64)
+    n_comm = int(c.max()) + 1
+    sizes = np.bincount(c, minlength=n_comm)
+
+    activated = np.zeros(n_comm)
+    reached = np.zeros(n_comm)
+    flow_keys, flow_weights = [], []
+    is_seed = np.zeros(cg.n_nodes, dtype=bool)
+    is_seed[seeds] = True
+
+    for _ in range(runs):
+        if model == "IC":
+            step = independent_cascade_csr(cg, seeds, p, max_steps, rng)
+        else:
+            step = linear_threshold_csr(cg, seeds, threshold, rng)
+
+        active = np.flatnonzero(step >= 0)
+        per_comm = np.bincount(c[active], minlength=n_comm)
+        activated += per_comm
+        reached += np.bincount(c[active[~is_seed[active]]], minlength=n_comm) > 0
+
+        u, v, share = activation_parents(cg, step, model)
+        flow_keys.append(c[u] * n_comm + c[v])
+        flow_weights.append(share)
+
+    summary = pd.DataFrame({
+        "community": np.arange(n_comm),
+        "size": sizes,
+        "seeds": np.bincount(c[seeds], minlength=n_comm),
+        "activation_probability": activated / (runs * np.maximum(sizes, 1)),
+        "reach_probability": reached / runs,
+        "mean_activated": activated / runs
+    })
+
+    keys = np.concatenate(flow_keys) if flow_keys else np.empty(0, dtype=np.int64)
+    weights = np.concatenate(flow_weights) if flow_weights else np.empty(0)
+    order = np.argsort(keys, kind="stable")
+    keys, weights = keys[order], weights[order]
+    first = np.flatnonzero(_first_of_runs(keys))
+    total = np.add.reduceat(weights, first) if keys.size else weights
+    keys = keys[first]
+
+    flows = pd.DataFrame({
+        "source_community": keys // n_comm,
+        "target_community": keys % n_comm,
+        "flow": total / runs
+    })
+    flows["share"] = flows["flow"] / flows["flow"].sum() if len(flows) else flows["flow"]
+    flows = flows.sort_values("flow", ascending=False).reset_index(drop=True)
+    return summary, flows
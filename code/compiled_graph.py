@@ -0,0 +1,146 @@
+# compiled_graph.py
+
+import hashlib
+from dataclasses import dataclass
+
+import numpy as np
+
+from node_index import NodeIndex
+
+
+# -------------------------------------------------------------
+# 1) Graphe compilé (format CSR)
+# -------------------------------------------------------------
+@dataclass
+class CompiledGraph:
+    """
+    Représentation compacte d'un DiGraph NetworkX sous forme CSR.
+
+    index      : NodeIndex (label ↔ id int32, type de chaque nœud)
+    indptr     : offsets CSR des arcs sortants (taille n + 1)
+    indices    : voisins sortants (int32)
+    in_indptr  : offsets CSR des arcs entrants
+    in_indices : voisins entrants (int32)
+    """
+    index: NodeIndex
+    indptr: np.ndarray
+    indices: np.ndarray
+    in_indptr: np.ndarray
+    in_indices: np.ndarray
+
+    @property
+    def n_nodes(self):
+        return len(self.index)
+
+    @property
+    def nodes(self):
+        """Labels de tous les nœuds, dans l'ordre des ids (matérialisés à la demande)."""
+        return self.index.labels(np.arange(self.n_nodes))
+
+    @property
+    def kind(self):
+        return self.index.kind
+
+    @property
+    def n_edges(self):
+        return len(self.indices)
+
+    def out_degree(self):
+        return np.diff(self.indptr)
+
+    def in_degree(self):
+        return np.diff(self.in_indptr)
+
+    def degree(self):
+        """Degré total (entrant + sortant), comme G.degree() sur un DiGraph."""
+        return self.out_degree() + self.in_degree()
+
+    def edge_sources(self):
+        """Source de chaque arc, aligné sur indices."""
+        return np.repeat(np.arange(self.n_nodes, dtype=np.int32), self.out_degree())
+
+    def subgraph(self, ids):
+        """
+        Sous-graphe induit par ids (triés). Le nœud i du résultat est ids[i] ;
+        les arcs conservent leur ordre relatif.
+        """
+        ids = np.asarray(ids, dtype=np.int64)
+        remap = np.full(self.n_nodes, -1, dtype=np.int64)
+        remap[ids] = np.arange(len(ids))
+        src = remap[self.edge_sources()]
+        dst = remap[self.indices]
+        keep = (src >= 0) & (dst >= 0)
+        return compile_edges(self.index.take(ids), src[keep], dst[keep])
+
+    def ids(self, labels):
+        return self.index.ids(labels)
+
+    def labels(self, ids):
+        return self.index.labels(ids)
+
+
+def _csr(src, dst, n):
+    order = np.argsort(src, kind="stable")
+    indptr = np.zeros(n + 1, dtype=np.int64)
+    np.cumsum(np.bincount(src, minlength=n), out=indptr[1:])
+    return indptr, dst[order].astype(np.int32)
+
+
+def compile_edges(index, src, dst):
+    """Compile des arcs donnés par ids (src[i] → dst[i]) sur un NodeIndex existant."""
+    src = np.asarray(src, dtype=np.int64)
+    dst = np.asarray(dst, dtype=np.int64)
+    n = len(index)
+
+    indptr, indices = _csr(src, dst, n)
+    in_indptr, in_indices = _csr(dst, src, n)
+
+    return CompiledGraph(index, indptr, indices, in_indptr, in_indices)
+
+
+def compile_graph(G):
+    """
+    Compile un DiGraph NetworkX en tableaux CSR (sortants et entrants).
+    Les nœuds sont internés par NodeIndex (ids groupés par type).
+    """
+    index = NodeIndex.from_labels(G.nodes())
+    edges = list(G.edges())
+    return compile_edges(
+        index,
+        index.ids(u for u, _ in edges),
+        index.ids(v for _, v in edges)
+    )
+
+
+# -------------------------------------------------------------
+# 2) Empreinte du graphe
+# -------------------------------------------------------------
+def graph_fingerprint(G):
+    """
+    Empreinte SHA-256 du contenu de G (nœuds et arcs), indépendante de
+    l'ordre d'insertion. Sert de clé de cache entre deux lancements.
+    """
+    h = hashlib.sha256()
+    for v in sorted(repr(v) for v in G.nodes()):
+        h.update(v.encode())
+        h.update(b"\0")
+    h.update(b"\1")
+    for e in sorted(f"{u!r}\0{v!r}" for u, v in G.edges()):
+        h.update(e.encode())
+        h.update(b"\1")
+    return h.hexdigest()[:16]
+
+
+def compiled_fingerprint(cg, chunk_edges=1 << 22):
+    """
+    Empreinte d'un graphe déjà compilé (CompiledGraph ou MmapGraph) :
+    labels et arcs sortants, lus par blocs. Identifie le graphe auprès des
+    workers distants (cf. distributed), sans repasser par NetworkX.
+    """
+    h = hashlib.sha256(cg.index.digest().encode())
+    for name in ["indptr", "indices"]:
+        a = getattr(cg, name)
+        h.update(f"{name}:{np.dtype(a.dtype).str}:{len(a)};".encode())
+        for start in range(0, len(a), chunk_edges):
+            h.update(np.ascontiguousarray(a[start:start + chunk_edges]).tobytes())
+    return h.hexdigest()[:16]
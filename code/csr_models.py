@@ -0,0 +1,201 @@
+# csr_models.py
+
+import numpy as np
+
+from kernels import HAVE_NUMBA, ic_step, lt_round
+
+
+# =====================================================================
+# Moteurs IC / LT vectorisés sur un CompiledGraph
+#
+# Même sémantique que ic_model.independent_cascade et
+# lt_model.linear_threshold, mais sur des tableaux CSR et un générateur
+# numpy. Les nœuds sont des ids entiers (cg.ids(labels) pour convertir).
+#
+# Retour commun : tableau step (int32) de taille n, où step[v] est l'étape
+# d'activation de v (0 pour les seeds) et -1 si v n'est pas activé.
+#
+# backend : "numba" (noyaux compilés de kernels.py) ou "numpy". Par
+# défaut BACKEND, "numba" si Numba est installé. Les deux chemins font
+# les mêmes tirages : même graine → même résultat.
+# =====================================================================
+
+BACKEND = "numba" if HAVE_NUMBA else "numpy"
+BACKENDS = ("numba", "numpy") if HAVE_NUMBA else ("numpy",)
+LT_TOLERANCE = 1e-9          # marge sur les seuils LT pondérés (sommes de poids flottants)
+
+
+def _backend(backend):
+    backend = backend or BACKEND
+    if backend not in BACKENDS:
+        raise ValueError(f"Backend indisponible : {backend} (disponibles : {', '.join(BACKENDS)})")
+    return backend
+
+def expand(indptr, nodes):
+    """Positions CSR de tous les arcs des nœuds donnés (concaténation d'aranges)."""
+    starts = indptr[nodes]
+    counts = indptr[nodes + 1] - starts
+    total = counts.sum()
+    if total == 0:
+        return np.empty(0, dtype=np.int64)
+    offsets = np.repeat(starts - np.cumsum(counts) + counts, counts)
+    return offsets + np.arange(total)
+
+
+# =====================================================================
+# 🧠 1. INDEPENDENT CASCADE
+# =====================================================================
+
+def independent_cascade_csr(cg, seeds, p=0.1, max_steps=20, rng=None, hook=None, backend=None):
+    """
+    Modèle IC sur CSR.
+    seeds : ids des nœuds initiaux
+    p : probabilité d'influence (scalaire ou tableau aligné sur cg.indices,
+        cf. edge_weights.ic_probabilities)
+    hook : instrumentation optionnelle (instrumentation.CascadeRecorder)
+    """
+    jit = _backend(backend) == "numba"
+    rng = rng if rng is not None else np.random.default_rng()
+    seeds = np.unique(np.asarray(seeds, dtype=np.int64))
+    if jit:
+        indptr, indices = np.asarray(cg.indptr), np.asarray(cg.indices)
+        prob = np.array([p], dtype=np.float64) if np.isscalar(p) else np.asarray(p)
+
+    step = np.full(cg.n_nodes, -1, dtype=np.int32)
+    step[seeds] = 0
+    frontier = seeds
+
+    if hook is not None:
+        hook.start()
+
+    for t in range(1, max_steps + 1):
+        if jit:
+            n_edges = int((indptr[frontier + 1] - indptr[frontier]).sum())
+            if n_edges == 0:
+                break
+            hit = ic_step(indptr, indices, frontier, rng.random(n_edges), prob, step, t)
+        else:
+            pos = expand(cg.indptr, frontier)
+            n_edges = pos.size
+            if n_edges == 0:
+                break
+
+            prob = p if np.isscalar(p) else p[pos]
+            hit = cg.indices[pos][rng.random(n_edges) < prob]
+            hit = np.unique(hit[step[hit] < 0])
+
+        if hook is not None:
+            hook.step(frontier.size, n_edges, n_edges)
+
+        if hit.size == 0:
+            break
+
+        step[hit] = t
+        frontier = hit
+
+    if hook is not None:
+        hook.finish(spread(step))
+
+    return step
+
+
+# =====================================================================
+# 🧠 2. LINEAR THRESHOLD
+# =====================================================================
+
+def linear_threshold_csr(cg, seeds, fixed_threshold=None, rng=None, hook=None, backend=None,
+                         weights=None):
+    """
+    Modèle LT sur CSR : voisins = prédécesseurs + successeurs, poids 1 / degré.
+    Les seuils sont tirés uniformément dans [0, 1] si fixed_threshold est None.
+    hook : instrumentation optionnelle (instrumentation.CascadeRecorder)
+    weights : poids normalisés (out_w, in_w) de edge_weights.lt_weights, à
+              la place de 1 / degré
+    """
+    jit = _backend(backend) == "numba"
+    rng = rng if rng is not None else np.random.default_rng()
+    seeds = np.unique(np.asarray(seeds, dtype=np.int64))
+    n = cg.n_nodes
+
+    if fixed_threshold is None:
+        thresholds = rng.random(n)
+    else:
+        thresholds = np.full(n, fixed_threshold)
+
+    degree = cg.degree()
+    active_neighbors = np.zeros(n, dtype=np.float64)
+    if weights is None:
+        out_w = in_w = np.empty(0, dtype=np.float64)
+        norm = degree
+        reached = thresholds
+    else:
+        out_w, in_w = (np.asarray(w, dtype=np.float64) for w in weights)
+        norm = np.ones(n)
+        # sommes de poids flottants : un nœud dont tous les voisins sont
+        # actifs doit atteindre un seuil de 1 malgré les arrondis
+        reached = thresholds - LT_TOLERANCE
+
+    step = np.full(n, -1, dtype=np.int32)
+    step[seeds] = 0
+    newly_active = seeds
+    t = 0
+
+    if hook is not None:
+        hook.start(random_draws=n if fixed_threshold is None else 0)
+
+    if jit:
+        csr = [np.asarray(a) for a in (cg.indptr, cg.indices, cg.in_indptr, cg.in_indices)]
+        mark = np.full(n, -1, dtype=np.int64)
+        zero = np.flatnonzero((thresholds <= 0) & (degree > 0))
+
+    while newly_active.size:
+        t += 1
+        frontier = newly_active.size
+
+        if jit:
+            newly_active, touched = lt_round(
+                *csr, out_w, in_w, norm, reached, active_neighbors, step, mark,
+                newly_active, zero if t == 1 else zero[:0], t
+            )
+        else:
+            pos_out = expand(cg.indptr, newly_active)
+            pos_in = expand(cg.in_indptr, newly_active)
+            neighbors = np.concatenate([cg.indices[pos_out], cg.in_indices[pos_in]])
+            if weights is None:
+                active_neighbors += np.bincount(neighbors, minlength=n)
+            else:
+                w = np.concatenate([out_w[pos_out], in_w[pos_in]])
+                active_neighbors += np.bincount(neighbors, weights=w, minlength=n)
+            touched = neighbors.size
+
+            candidates = np.unique(neighbors)
+            if t == 1:
+                # un seuil nul est atteint sans aucun voisin actif
+                zero = np.flatnonzero((thresholds <= 0) & (degree > 0))
+                candidates = np.union1d(candidates, zero)
+            candidates = candidates[step[candidates] < 0]
+            influence = active_neighbors[candidates] / norm[candidates]
+            newly_active = candidates[influence >= reached[candidates]]
+            step[newly_active] = t
+
+        if hook is not None:
+            hook.step(frontier, touched, 0)
+
+    if hook is not None:
+        hook.finish(spread(step))
+
+    return step
+
+
+# =====================================================================
+# 📊 3. OUTILS
+# =====================================================================
+
+def spread(step):
+    """Nombre de nœuds activés."""
+    return int(np.count_nonzero(step >= 0))
+
+
+def n_steps(step):
+    """Nombre d'étapes (couches), seeds comprises, comme len(steps) en IC/LT."""
+    return int(step.max()) + 1
@@ -1,9 +1,30 @@
+import os
+
 import pandas as pd
 from pathlib import Path
 
+DATASET_FILES = ["commits.json", "issues.json", "comments.json", "stars.json"]
+
+
 def load_json(path):
     p = Path(path)
     if not p.exists():
         print(f"⚠ Le fichier {p} n'existe pas → un DataFrame vide sera retourné.")
         return pd.DataFrame()
     return pd.read_json(p, orient="records")
+
+
+def load_dataset(data_dir):
+    """
+    Charge les 4 fichiers du dataset (commits, issues, comments, stars)
+    et renomme la colonne "user" en "author".
+    """
+    commits, issues, comments, stars = (
+        load_json(os.path.join(data_dir, f)) for f in DATASET_FILES
+    )
+
+    for df in [issues, comments, stars]:
+        if "user" in df.columns:
+            df.rename(columns={"user": "author"}, inplace=True)
+
+    return commits, issues, comments, stars
@@ -0,0 +1,512 @@
+# distributed.py
+#
+# Monte Carlo IC / LT réparti sur plusieurs machines. Un coordinateur
+# découpe la grille de batch_runner en tâches de shard_runs runs et les
+# distribue par TCP (multiprocessing.connection, authentifié) aux workers
+# qui se connectent :
+#
+#   export DIFFUSION_AUTHKEY=<clé secrète partagée>
+#   python3 code/distributed.py coordinator experiments/example_batch.json --bind 0.0.0.0:6000
+#   python3 code/distributed.py worker coordinateur:6000 --cache /tmp/diffusion_cache   (chaque machine)
+#
+#   python3 code/distributed.py local experiments/example_batch.json --workers 4   (tout en local)
+#
+# Une tâche = (empreinte du graphe, paramètres, numéro de sous-flux RNG).
+# Le graphe compilé n'est envoyé qu'une fois par worker, qui le garde en
+# cache (en mémoire et, avec --cache, sur disque d'un lancement à
+# l'autre). Un worker perdu (connexion coupée, délai dépassé) voit sa
+# tâche remise en file et rejouée ailleurs, au plus max_retries fois.
+#
+# Le sous-flux RNG de chaque tâche ne dépend que du job et du numéro de
+# tâche (SeedSequence(job_seed, spawn_key=(shard,))) et les statistiques
+# sont fusionnées dans l'ordre des tâches : les résultats sont identiques
+# quels que soient le nombre de workers, l'ordre d'exécution et les pannes.
+# (Ils diffèrent de ceux de batch_runner, qui tire tous les runs d'un job
+# dans un seul flux.)
+#
+# Les messages sont des pickles : quiconque connaît la clé peut faire
+# exécuter du code au coordinateur comme aux workers. coordinator et
+# worker refusent donc de démarrer sans DIFFUSION_AUTHKEY (aucune clé par
+# défaut) et le coordinateur n'écoute que localhost sauf --bind explicite.
+# Le mode local tire une clé aléatoire.
+#
+# Un MmapGraph est transmis par son chemin : le dossier doit être visible
+# des workers (système de fichiers partagé).
+
+import argparse
+import os
+import pickle
+import queue
+import socket
+import threading
+import time
+import traceback
+from multiprocessing import Process
+from multiprocessing.connection import Client, Listener
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from batch_runner import (expand_grid, job_seed, job_seed_sets, load_config, prepare_repo,
+                          write_metrics)
+from cascade_traces import CascadeStats
+from compiled_graph import compiled_fingerprint
+from csr_models import independent_cascade_csr, linear_threshold_csr
+from instrumentation import CascadeRecorder, MetricsRegistry
+
+
+DEFAULT_PORT = 6000
+AUTHKEY_ENV = "DIFFUSION_AUTHKEY"
+SHARD_RUNS = 100
+MAX_RETRIES = 3
+TASK_TIMEOUT = 600          # secondes sans réponse avant de déclarer le worker perdu
+CONNECT_TIMEOUT = 30
+
+
+def authkey_from_env():
+    """Clé d'authentification partagée (DIFFUSION_AUTHKEY) ; None si absente."""
+    key = os.environ.get(AUTHKEY_ENV)
+    return key.encode() if key else None
+
+
+def _require_authkey(authkey):
+    if not authkey:
+        raise ValueError(f"Clé d'authentification requise (variable {AUTHKEY_ENV})")
+    return authkey
+
+
+def parse_address(text):
+    """"hôte:port" → (hôte, port)."""
+    host, _, port = text.rpartition(":")
+    return host or "localhost", int(port)
+
+
+# ============================================================
+# TÂCHES
+# ============================================================
+
+def make_tasks(config, graphs, shard_runs=SHARD_RUNS):
+    """
+    Découpe la grille de batch_runner en tâches d'au plus shard_runs runs
+    (instrumentées si la config demande des métriques).
+    Renvoie (jobs, tâches, {empreinte: graphe}).
+    """
+    jobs = expand_grid(config)
+    seed_sets = job_seed_sets(jobs, graphs, config["rng_seed"])
+    fingerprints = {name: compiled_fingerprint(cg) for name, cg in graphs.items()}
+
+    tasks = []
+    for j, (job, seeds) in enumerate(zip(jobs, seed_sets)):
+        entropy = job_seed(config["rng_seed"], job)
+        for shard, start in enumerate(range(0, job["runs"], shard_runs)):
+            tasks.append({
+                "id": (j, shard),
+                "repo": job["repo"],
+                "graph": fingerprints[job["repo"]],
+                "model": job["model"],
+                "p": job["p"],
+                "threshold": job["threshold"],
+                "max_steps": job["max_steps"],
+                "seeds": np.asarray(seeds),
+                "runs": min(shard_runs, job["runs"] - start),
+                "entropy": entropy,
+                "shard": shard,
+                "instrument": bool(config["metrics"])
+            })
+
+    by_fingerprint = {fingerprints[name]: cg for name, cg in graphs.items()}
+    return jobs, tasks, by_fingerprint
+
+
+def run_task(task, cg):
+    """
+    Exécute les runs d'une tâche dans son sous-flux RNG.
+    Renvoie (CascadeStats, instantané des métriques ou None).
+    """
+    seq = np.random.SeedSequence(task["entropy"], spawn_key=(task["shard"],))
+    rng = np.random.default_rng(seq)
+
+    registry = hook = None
+    if task.get("instrument"):
+        registry = MetricsRegistry()
+        hook = CascadeRecorder(task["model"], registry, repo=task["repo"])
+
+    stats = CascadeStats(cg.n_nodes)
+    for _ in range(task["runs"]):
+        if task["model"] == "IC":
+            step = independent_cascade_csr(cg, task["seeds"], task["p"], task["max_steps"], rng, hook)
+        else:
+            step = linear_threshold_csr(cg, task["seeds"], task["threshold"], rng, hook)
+        stats.add(step)
+    return stats, registry.to_dict() if registry is not None else None
+
+
+# ============================================================
+# CÔTÉ WORKER
+# ============================================================
+
+class GraphCache:
+    """Graphes compilés reçus, par empreinte (mémoire, et disque si directory)."""
+
+    def __init__(self, directory=None):
+        self.directory = Path(directory) if directory else None
+        self.graphs = {}
+        if self.directory:
+            self.directory.mkdir(parents=True, exist_ok=True)
+
+    def fingerprints(self):
+        on_disk = {p.stem for p in self.directory.glob("*.pkl")} if self.directory else set()
+        return sorted(set(self.graphs) | on_disk)
+
+    def get(self, fingerprint):
+        if fingerprint not in self.graphs:
+            with open(self.directory / f"{fingerprint}.pkl", "rb") as f:
+                self.graphs[fingerprint] = pickle.load(f)
+        return self.graphs[fingerprint]
+
+    def put(self, fingerprint, cg):
+        self.graphs[fingerprint] = cg
+        if self.directory:
+            path = self.directory / f"{fingerprint}.pkl"
+            tmp = path.with_suffix(f".{os.getpid()}.tmp")
+            with open(tmp, "wb") as f:
+                pickle.dump(cg, f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp, path)
+
+
+def _connect(address, authkey, timeout):
+    """Connexion au coordinateur, en réessayant tant qu'il n'écoute pas encore."""
+    deadline = time.monotonic() + timeout
+    while True:
+        try:
+            return Client(address, authkey=authkey)
+        except (ConnectionRefusedError, FileNotFoundError):
+            if time.monotonic() > deadline:
+                raise
+            time.sleep(0.2)
+
+
+def run_worker(address, authkey, cache_dir=None, fail_after=None,
+               connect_timeout=CONNECT_TIMEOUT):
+    """
+    Boucle d'un worker : reçoit graphes et tâches jusqu'au message "stop".
+    fail_after : s'arrête brutalement (sans répondre) à la tâche suivante
+                 après ce nombre de tâches, pour tester les reprises.
+    Renvoie le nombre de tâches exécutées.
+    """
+    cache = GraphCache(cache_dir)
+    conn = _connect(tuple(address), _require_authkey(authkey), connect_timeout)
+    conn.send(("hello", f"{socket.gethostname()}:{os.getpid()}", cache.fingerprints()))
+
+    done = 0
+    with conn:
+        while True:
+            try:
+                message = conn.recv()
+            except EOFError:
+                break
+
+            if message[0] == "stop":
+                break
+            if message[0] == "graph":
+                cache.put(message[1], message[2])
+                continue
+
+            task = message[1]
+            if fail_after is not None and done >= fail_after:
+                os._exit(1)         # panne simulée : la tâche en cours est perdue
+            try:
+                conn.send(("result", task["id"], run_task(task, cache.get(task["graph"]))))
+            except Exception:
+                conn.send(("error", task["id"], traceback.format_exc()))
+            done += 1
+
+    return done
+
+
+# ============================================================
+# CÔTÉ COORDINATEUR
+# ============================================================
+
+class Coordinator:
+    """
+    File de tâches servie aux workers connectés (un thread par worker).
+    Les résultats sont gardés par identifiant de tâche jusqu'à la fusion.
+    """
+
+    def __init__(self, tasks, graphs, address=("localhost", DEFAULT_PORT), authkey=None,
+                 max_retries=MAX_RETRIES, task_timeout=TASK_TIMEOUT):
+        self.tasks = {task["id"]: task for task in tasks}
+        self.graphs = graphs
+        self.max_retries = max_retries
+        self.task_timeout = task_timeout
+
+        self.pending = queue.Queue()
+        for task_id in self.tasks:
+            self.pending.put(task_id)
+        self.results = {}
+        self.attempts = {task_id: 0 for task_id in self.tasks}
+        self.workers = {}
+        self.error = None
+
+        self._lock = threading.Lock()
+        self._print_lock = threading.Lock()
+        self._finished = threading.Event()
+        if not self.tasks:
+            self._finished.set()
+        self._listener = Listener(tuple(address), authkey=_require_authkey(authkey))
+        self.address = self._listener.address
+
+    def _log(self, message):
+        # un seul appel à print par ligne, même depuis plusieurs threads
+        with self._print_lock:
+            print(message, flush=True)
+
+    # ----------------------------
+    # Suivi des tâches
+    # ----------------------------
+    def _done(self, task_id, result, worker):
+        with self._lock:
+            if task_id in self.results:
+                return
+            self.results[task_id] = result
+            self.workers[worker] = self.workers.get(worker, 0) + 1
+            n_done = len(self.results)
+        self._log(f"  {n_done}/{len(self.tasks)} tâches terminées")
+        if n_done == len(self.tasks):
+            self._finished.set()
+
+    def _retry(self, task_id, reason):
+        with self._lock:
+            self.attempts[task_id] += 1
+            if self.attempts[task_id] > self.max_retries:
+                self.error = RuntimeError(
+                    f"Tâche {task_id} abandonnée après {self.max_retries} reprises : {reason}"
+                )
+                self._finished.set()
+                return
+        self.pending.put(task_id)
+
+    # ----------------------------
+    # Connexions
+    # ----------------------------
+    def _accept(self):
+        while not self._finished.is_set():
+            try:
+                conn = self._listener.accept()
+            except OSError:
+                break           # listener fermé
+            except Exception as e:        # authentification refusée…
+                self._log(f"⚠ Connexion refusée : {e}")
+                continue
+            threading.Thread(target=self._serve, args=(conn,), daemon=True).start()
+
+    def _serve(self, conn):
+        task_id = None
+        try:
+            _, worker, cached = conn.recv()
+            sent = set(cached)
+            self._log(f"→ Worker connecté : {worker} ({len(sent)} graphe(s) en cache)")
+
+            while not self._finished.is_set():
+                try:
+                    task_id = self.pending.get(timeout=0.2)
+                except queue.Empty:
+                    continue
+                if task_id in self.results:         # doublon d'une reprise
+                    task_id = None
+                    continue
+
+                task = self.tasks[task_id]
+                if task["graph"] not in sent:
+                    conn.send(("graph", task["graph"], self.graphs[task["graph"]]))
+                    sent.add(task["graph"])
+                conn.send(("task", task))
+
+                if not conn.poll(self.task_timeout):
+                    raise TimeoutError(f"pas de réponse en {self.task_timeout}s")
+                status, _, payload = conn.recv()
+                if status == "error":
+                    self._log(f"⚠ Erreur sur {worker} (tâche {task_id}) :\n{payload}")
+                    self._retry(task_id, payload.strip().splitlines()[-1])
+                else:
+                    self._done(task_id, payload, worker)
+                task_id = None
+
+            conn.send(("stop",))
+        except (EOFError, OSError, TimeoutError) as e:
+            self._log(f"⚠ Worker perdu ({type(e).__name__}: {e})")
+            if task_id is not None:
+                self._retry(task_id, f"worker perdu ({type(e).__name__})")
+        finally:
+            conn.close()
+
+    def run(self, alive=None):
+        """
+        Sert les workers jusqu'à la fin de toutes les tâches (ou un abandon).
+        alive : fonction renvoyant False quand plus aucun worker ne peut
+                venir (workers locaux tous arrêtés) → RuntimeError.
+        Renvoie {identifiant de tâche: (CascadeStats, métriques ou None)}.
+        """
+        self._log(f"=== Coordinateur : {len(self.tasks)} tâches, "
+              f"écoute sur {self.address[0]}:{self.address[1]} ===")
+        threading.Thread(target=self._accept, daemon=True).start()
+
+        while not self._finished.wait(0.5):
+            if alive is not None and not alive():
+                self.error = RuntimeError("Tous les workers se sont arrêtés avant la fin")
+                self._finished.set()
+
+        self._listener.close()
+        if self.error is not None:
+            raise self.error
+        for worker, n in sorted(self.workers.items()):
+            self._log(f"  {worker:<32} {n:>6} tâches")
+        return self.results
+
+
+def merge_results(jobs, results, registry=None):
+    """
+    Une ligne par job, comme batch_runner : statistiques des tâches
+    fusionnées dans l'ordre de leurs sous-flux. Les métriques des tâches
+    instrumentées sont agrégées dans registry (MetricsRegistry).
+    """
+    rows = []
+    for j, job in enumerate(jobs):
+        shards = sorted(shard for (k, shard) in results if k == j)
+        if not shards:             # job sans runs : pas de statistiques
+            rows.append({**job, "mean_activated": np.nan, "std_activated": np.nan,
+                         "mean_steps": np.nan, "shards": 0})
+            continue
+
+        stats = CascadeStats(results[(j, shards[0])][0].n_nodes)
+        for shard in shards:
+            shard_stats, snapshot = results[(j, shard)]
+            stats.merge(shard_stats)
+            if registry is not None and snapshot is not None:
+                registry.merge(snapshot)
+
+        mean, std = stats.spread_mean_std()
+        rows.append({
+            **job,
+            "mean_activated": mean,
+            "std_activated": std,
+            "mean_steps": stats.depth_mean(),
+            "shards": len(shards)
+        })
+
+    df = pd.DataFrame(rows)
+    sort_cols = ["repo", "model", "seed_strategy", "k", "p", "threshold"]
+    return df.sort_values(sort_cols, na_position="first").reset_index(drop=True)
+
+
+def prepare(config, shard_runs=SHARD_RUNS):
+    # la réduction de graphe n'est pas faite par les workers : refusée plutôt qu'ignorée
+    if config.get("reduce"):
+        raise ValueError("Option reduce non prise en charge en mode réparti (utiliser batch_runner.py)")
+
+    graphs = {}
+    for repo in config["repos"]:
+        print(f"→ Préparation du graphe {repo['name']}…")
+        graphs[repo["name"]] = prepare_repo(repo)
+    return make_tasks(config, graphs, shard_runs)
+
+
+def run_coordinator(config, address=("localhost", DEFAULT_PORT), authkey=None,
+                    shard_runs=SHARD_RUNS, max_retries=MAX_RETRIES, task_timeout=TASK_TIMEOUT,
+                    registry=None):
+    """Prépare les graphes, sert les tâches aux workers distants et fusionne."""
+    _require_authkey(authkey)
+    jobs, tasks, graphs = prepare(config, shard_runs)
+    coordinator = Coordinator(tasks, graphs, address, authkey, max_retries, task_timeout)
+    return merge_results(jobs, coordinator.run(), registry)
+
+
+def run_local(config, n_workers=2, shard_runs=SHARD_RUNS, cache_dir=None, fail_after=None,
+              max_retries=MAX_RETRIES, task_timeout=TASK_TIMEOUT, registry=None):
+    """
+    Coordinateur et n_workers processus workers sur cette machine (port
+    libre sur localhost). fail_after est appliqué au premier worker, pour
+    tester les reprises.
+    """
+    jobs, tasks, graphs = prepare(config, shard_runs)
+    authkey = os.urandom(16)
+    coordinator = Coordinator(tasks, graphs, ("localhost", 0), authkey, max_retries, task_timeout)
+
+    processes = [
+        Process(target=run_worker,
+                args=(coordinator.address, authkey, cache_dir, fail_after if i == 0 else None),
+                daemon=True)
+        for i in range(n_workers)
+    ]
+    for p in processes:
+        p.start()
+    try:
+        results = coordinator.run(alive=lambda: any(p.is_alive() for p in processes))
+    finally:
+        for p in processes:
+            p.join(timeout=5)
+            if p.is_alive():
+                p.terminate()
+
+    return merge_results(jobs, results, registry)
+
+
+# ============================================================
+# MAIN
+# ============================================================
+
+def main():
+    parser = argparse.ArgumentParser(description="Monte Carlo IC / LT réparti (coordinateur / workers)")
+    sub = parser.add_subparsers(dest="role", required=True)
+
+    coord = sub.add_parser("coordinator", help="distribue la grille d'un fichier de config")
+    coord.add_argument("config", help="fichier de configuration JSON (format de batch_runner)")
+    coord.add_argument("--bind", default=f"localhost:{DEFAULT_PORT}",
+                       help="adresse d'écoute hôte:port (0.0.0.0:port pour le réseau)")
+
+    worker = sub.add_parser("worker", help="exécute les tâches d'un coordinateur")
+    worker.add_argument("address", help="adresse du coordinateur hôte:port")
+    worker.add_argument("--cache", help="dossier de cache des graphes compilés")
+
+    local = sub.add_parser("local", help="coordinateur et workers sur cette machine")
+    local.add_argument("config", help="fichier de configuration JSON (format de batch_runner)")
+    local.add_argument("--workers", type=int, default=os.cpu_count(), help="nombre de workers")
+    local.add_argument("--cache", help="dossier de cache des graphes compilés")
+
+    for p in (coord, local):
+        p.add_argument("--shard-runs", type=int, default=SHARD_RUNS, help="runs par tâche")
+        p.add_argument("--retries", type=int, default=MAX_RETRIES, help="reprises par tâche")
+        p.add_argument("--timeout", type=float, default=TASK_TIMEOUT,
+                       help="secondes sans réponse avant de déclarer un worker perdu")
+    args = parser.parse_args()
+
+    authkey = authkey_from_env()
+    if args.role in ("coordinator", "worker") and authkey is None:
+        parser.error(f"définir {AUTHKEY_ENV} (clé secrète partagée par le coordinateur et les workers)")
+
+    if args.role == "worker":
+        n = run_worker(parse_address(args.address), authkey, cache_dir=args.cache)
+        print(f"✔ Worker arrêté : {n} tâches exécutées")
+        return
+
+    config = load_config(args.config)
+    start = time.perf_counter()
+    registry = MetricsRegistry() if config["metrics"] else None
+    if args.role == "coordinator":
+        df = run_coordinator(config, parse_address(args.bind), authkey, shard_runs=args.shard_runs,
+                             max_retries=args.retries, task_timeout=args.timeout, registry=registry)
+    else:
+        df = run_local(config, args.workers, args.shard_runs, args.cache,
+                       max_retries=args.retries, task_timeout=args.timeout, registry=registry)
+
+    df.to_csv(config["output"], index=False)
+    if registry is not None:
+        write_metrics(registry, config["metrics"])
+    print(f"\n✔ {len(df)} configurations en {time.perf_counter() - start:.1f}s "
+          f"→ {config['output']}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,128 @@
+# edge_weights.py
+
+import numpy as np
+
+from node_index import USER
+
+
+# =====================================================================
+# Probabilités et poids hétérogènes par arc
+#
+# build_github_graph compte les interactions de chaque arc (attribut
+# "interactions" : co-activité commits/issues, commentaires répétés sur
+# une même issue). Ces comptes sont convertis une seule fois en tableaux
+# alignés sur le CSR (probabilités IC en float32, poids LT en float64),
+# que les moteurs de csr_models consomment directement (tirages et sommes
+# vectorisés) :
+#
+#   counts = interaction_counts(G, cg)
+#   prob = ic_probabilities(cg, counts, p=0.1)
+#   step = independent_cascade_csr(cg, seeds, prob)
+#   step = linear_threshold_csr(cg, seeds, weights=lt_weights(cg, counts))
+#
+# Sans comptes (counts=None), chaque arc compte pour une interaction :
+# on retrouve le p uniforme en IC et le poids 1 / degré en LT.
+#
+# Les arcs user → user (auteur d'issue → auteur de commit) viennent du
+# produit cartésien issues × commits de build_github_graph : leur compte
+# vaut (issues de u) × (commits de v), pas un nombre d'échanges réels
+# (jusqu'à 70 sur data_github, soit p ≈ 1 avec le schéma "interactions").
+# interaction_counts les ramène donc à 1 par défaut (user_pairs=False).
+# =====================================================================
+
+INTERACTIONS = "interactions"
+IC_SCHEMES = ("uniform", "interactions", "weighted_cascade")
+
+
+def interaction_counts(G, cg, attr=INTERACTIONS, user_pairs=False):
+    """
+    Nombre d'interactions de chaque arc de G, aligné sur cg.indices
+    (float32 ; 1 pour un arc sans attribut). cg = compile_graph(G).
+    user_pairs : garder les comptes des arcs user → user (produit
+                 cartésien issues × commits) au lieu de les ramener à 1
+    """
+    edges = list(G.edges(data=attr, default=1))
+    src = cg.ids(u for u, _, _ in edges)
+    dst = cg.ids(v for _, v, _ in edges)
+    counts = np.ones(cg.n_edges, dtype=np.float32)
+    counts[edge_positions(cg, src, dst)] = [c for _, _, c in edges]
+    if not user_pairs:
+        counts[(cg.kind[cg.edge_sources()] == USER) & (cg.kind[cg.indices] == USER)] = 1
+    return counts
+
+
+def edge_positions(cg, src, dst):
+    """Position dans cg.indices de chaque arc src[i] → dst[i] (KeyError si absent)."""
+    n = cg.n_nodes
+    keys = cg.edge_sources().astype(np.int64) * n + cg.indices
+    order = np.argsort(keys, kind="stable")
+    keys = keys[order]
+    wanted = np.asarray(src, dtype=np.int64) * n + np.asarray(dst, dtype=np.int64)
+    if wanted.size == 0:
+        return np.empty(0, dtype=np.int64)
+
+    pos = np.searchsorted(keys, wanted)
+    if (pos >= keys.size).any() or (keys[pos] != wanted).any():
+        raise KeyError("Arc absent du graphe compilé")
+    return order[pos]
+
+
+def _in_to_out(cg):
+    """Pour chaque entrée de cg.in_indices, position du même arc dans cg.indices."""
+    owner = np.repeat(np.arange(cg.n_nodes, dtype=np.int64), cg.in_degree())
+    return edge_positions(cg, cg.in_indices, owner)
+
+
+# =====================================================================
+# 🧠 1. INDEPENDENT CASCADE
+# =====================================================================
+
+def ic_probabilities(cg, counts=None, p=0.1, scheme="interactions"):
+    """
+    Probabilité d'activation de chaque arc (float32, alignée sur cg.indices).
+
+    "uniform"          : p pour tous les arcs
+    "interactions"     : 1 - (1 - p)^c, chaque interaction est une chance
+                         indépendante d'activer la cible (c = 1 → p)
+    "weighted_cascade" : 1 / degré entrant de la cible (pondéré par c si donné)
+    """
+    if scheme not in IC_SCHEMES:
+        raise ValueError(f"Schéma inconnu : {scheme} (disponibles : {', '.join(IC_SCHEMES)})")
+    counts = np.ones(cg.n_edges) if counts is None else np.asarray(counts, dtype=np.float64)
+
+    if scheme == "uniform":
+        prob = np.full(cg.n_edges, p)
+    elif scheme == "interactions":
+        prob = -np.expm1(counts * np.log1p(-p))
+    else:
+        total = np.bincount(cg.indices, weights=counts, minlength=cg.n_nodes)
+        prob = counts / total[cg.indices]
+    return prob.astype(np.float32)
+
+
+# =====================================================================
+# 🧠 2. LINEAR THRESHOLD
+# =====================================================================
+
+def lt_weights(cg, counts=None):
+    """
+    Poids LT normalisés, pour chaque sens de parcours des arcs.
+
+    Les voisins de v sont ses prédécesseurs et ses successeurs ; u pèse
+    c(u, v) / Σ c sur les arcs incidents à v (poids de v sommant à 1).
+    Renvoie (out_w, in_w) en float64 (en float32, les poids d'un nœud ne
+    somment plus exactement à 1 et un seuil de 1 devient inatteignable) :
+      out_w[e] : poids de la source sur la cible de l'arc cg.indices[e]
+      in_w[e]  : poids du nœud propriétaire sur cg.in_indices[e]
+    """
+    counts = np.ones(cg.n_edges) if counts is None else np.asarray(counts, dtype=np.float64)
+    src = cg.edge_sources()
+    total = (np.bincount(cg.indices, weights=counts, minlength=cg.n_nodes)
+             + np.bincount(src, weights=counts, minlength=cg.n_nodes))
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        out_w = np.where(total[cg.indices] > 0, counts / total[cg.indices], 0.0)
+        in_counts = counts[_in_to_out(cg)]
+        in_w = np.where(total[cg.in_indices] > 0, in_counts / total[cg.in_indices], 0.0)
+
+    return out_w, in_w
@@ -1,5 +1,4 @@
 import json
-from github import Github
 from pathlib import Path
 from time import sleep
 
@@ -45,6 +44,7 @@ def scrape_github(repo_name: str, output_folder):
     """
     Scrape commits, issues, comments et stargazers d’un repo GitHub.
     """
+    from github import Github
 
     print(f"=== Scraping du repo {repo_name} ===")
 
@@ -1,14 +1,29 @@
 # graph_builder.py
 
 import networkx as nx
-import matplotlib.pyplot as plt
-import plotly.graph_objects as go
+import pandas as pd
+
+from compiled_graph import compile_graph
+from graph_export import node_attributes, write_gexf
 
 
 # -------------------------------------------------------------
 # 1) Construction du graphe GitHub
 # -------------------------------------------------------------
+def _add_interaction(G, u, v):
+    """Ajoute l'arc u → v ou incrémente son nombre d'interactions."""
+    if G.has_edge(u, v):
+        G[u][v]["interactions"] += 1
+    else:
+        G.add_edge(u, v, interactions=1)
+
+
 def build_github_graph(commits, issues, comments, stars):
+    """
+    Graphe GitHub : chaque arc porte son nombre d'interactions (paires
+    auteur d'issue / auteur de commit, commentaires répétés, star), source
+    des poids hétérogènes de edge_weights.
+    """
     G = nx.DiGraph()
 
     # Fusion de toutes les sources d'auteurs
@@ -29,23 +44,26 @@ def build_github_graph(commits, issues, comments, stars):
     for i, row in issues.iterrows():
         issue_author = row["author"]
         for _, c in commits.iterrows():
-            if issue_author and c["author"] and issue_author != c["author"]:
+            if pd.notna(issue_author) and pd.notna(c["author"]) and issue_author != c["author"]:
                 issue_pairs.append((issue_author, c["author"]))
 
     for a, b in issue_pairs:
-        G.add_edge(a, b)
+        _add_interaction(G, a, b)
 
     # ------------------------
     # Liens Issues → Comments
     # ------------------------
+    # numéro d'issue en int : pandas le lit en float dès qu'une ligne est NaN
     for _, row in comments.iterrows():
-        G.add_edge(row["author"], row["issue_number"])
+        if pd.notna(row["author"]) and pd.notna(row["issue_number"]):
+            _add_interaction(G, row["author"], int(row["issue_number"]))
 
     # ------------------------
     # Liens Stars (utilisateur → repo)
     # ------------------------
     for _, row in stars.iterrows():
-        G.add_edge(row["author"], "repo_starred")
+        if pd.notna(row["author"]):
+            _add_interaction(G, row["author"], "repo_starred")
 
     return G
 
@@ -54,6 +72,7 @@ def build_github_graph(commits, issues, comments, stars):
 # 2) Visualisation simple (matplotlib)
 # -------------------------------------------------------------
 def show_graph_simple(G):
+    import matplotlib.pyplot as plt
     plt.figure(figsize=(10, 8))
     pos = nx.spring_layout(G, seed=42)
 
@@ -66,6 +85,7 @@ def show_graph_simple(G):
 # 3) Visualisation interactive Plotly (compatible Python 3.13)
 # -------------------------------------------------------------
 def show_graph_plotly(G):
+    import plotly.graph_objects as go
     pos = nx.spring_layout(G, seed=42)
 
     # Edges
@@ -118,6 +138,12 @@ def show_graph_plotly(G):
 # -------------------------------------------------------------
 # 4) Export Gephi (GEXF)
 # -------------------------------------------------------------
-def export_graph_gephi(G):
-    nx.write_gexf(G, "graph_export.gexf")
-    print("✔ Fichier GEXF exporté : graph_export.gexf")
+def export_graph_gephi(G, path="graph_export.gexf", node_attrs=None):
+    """
+    Export GEXF en flux (graph_export.write_gexf).
+    node_attrs : résultats de simulation à joindre aux nœuds, ex :
+                 {"activation_step": {nœud: étape}, "activation_probability": Series}
+    """
+    cg = compile_graph(G)
+    write_gexf(cg, path, node_attributes(cg, **(node_attrs or {})))
+    print(f"✔ Fichier GEXF exporté : {path}")
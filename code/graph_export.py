@@ -0,0 +1,238 @@
+# graph_export.py
+
+import json
+from pathlib import Path
+from xml.sax.saxutils import escape, quoteattr
+
+import numpy as np
+import pandas as pd
+
+from node_index import KIND_NAMES
+
+
+# =====================================================================
+# Exports en flux depuis un CompiledGraph
+#
+# Les fichiers sont écrits par blocs de CHUNK nœuds / arcs : la mémoire
+# utilisée ne dépend pas de la taille du graphe (hors tableaux CSR déjà
+# compilés), contrairement à nx.write_gexf qui construit l'arbre XML complet.
+# =====================================================================
+
+CHUNK = 65536
+
+
+def node_attributes(cg, **attrs):
+    """
+    Normalise des attributs de nœuds (ex : résultats de simulation) en
+    tableaux alignés sur les ids de cg. Chaque valeur peut être :
+    - un tableau de taille n (ex : step renvoyé par independent_cascade_csr)
+    - une pd.Series ou un dict indexés par labels (ex : ic_activation_probabilities,
+      activation_step de linear_threshold) ; les nœuds absents valent -1
+      (attribut entier) ou NaN (attribut réel, non écrit)
+    """
+    out = {}
+    for name, values in attrs.items():
+        if isinstance(values, dict):
+            values = pd.Series(values)
+        if isinstance(values, pd.Series):
+            if pd.api.types.is_integer_dtype(values.dtype):
+                array = np.full(cg.n_nodes, -1, dtype=np.int64)
+            else:
+                array = np.full(cg.n_nodes, np.nan)
+            array[cg.ids(values.index)] = values.to_numpy()
+            values = array
+        values = np.asarray(values)
+        if len(values) != cg.n_nodes:
+            raise ValueError(f"L'attribut {name} doit avoir {cg.n_nodes} valeurs")
+        out[name] = values
+    return out
+
+
+def _chunks(n):
+    for start in range(0, n, CHUNK):
+        yield start, min(start + CHUNK, n)
+
+
+def _kind(values, integer, real):
+    return integer if np.issubdtype(values.dtype, np.integer) else real
+
+
+def _present(value):
+    return not (isinstance(value, float) and np.isnan(value))
+
+
+# =====================================================================
+# 📤 1. GEXF (Gephi)
+# =====================================================================
+
+def write_gexf(cg, path, node_attrs=None):
+    """Écrit cg au format GEXF 1.2 (attributs : type de nœud + node_attrs)."""
+    attrs = {"kind": None, **(node_attrs or {})}
+    names = list(attrs)
+    src = cg.edge_sources()
+
+    with open(path, "w", encoding="utf-8") as f:
+        f.write('<?xml version="1.0" encoding="UTF-8"?>\n'
+                '<gexf xmlns="http://www.gexf.net/1.2draft" version="1.2">\n'
+                '  <graph mode="static" defaultedgetype="directed">\n'
+                '    <attributes class="node">\n')
+        for i, name in enumerate(names):
+            kind = "string" if attrs[name] is None else _kind(attrs[name], "integer", "double")
+            f.write(f'      <attribute id="{i}" title={quoteattr(name)} type="{kind}"/>\n')
+        f.write('    </attributes>\n    <nodes>\n')
+
+        for start, stop in _chunks(cg.n_nodes):
+            labels = cg.labels(np.arange(start, stop))
+            columns = [
+                [KIND_NAMES[k] for k in cg.kind[start:stop]] if attrs[name] is None
+                else attrs[name][start:stop].tolist()
+                for name in names
+            ]
+            lines = []
+            for j, label in enumerate(labels):
+                values = "".join(
+                    f'<attvalue for="{i}" value={quoteattr(str(col[j]))}/>'
+                    for i, col in enumerate(columns) if _present(col[j])
+                )
+                lines.append(
+                    f'      <node id="{start + j}" label={quoteattr(str(label))}>'
+                    f'<attvalues>{values}</attvalues></node>\n'
+                )
+            f.write("".join(lines))
+
+        f.write('    </nodes>\n    <edges>\n')
+        for start, stop in _chunks(cg.n_edges):
+            f.write("".join(
+                f'      <edge id="{e}" source="{u}" target="{v}"/>\n'
+                for e, u, v in zip(range(start, stop), src[start:stop].tolist(),
+                                   cg.indices[start:stop].tolist())
+            ))
+        f.write('    </edges>\n  </graph>\n</gexf>\n')
+
+
+# =====================================================================
+# 📤 2. GRAPHML
+# =====================================================================
+
+def write_graphml(cg, path, node_attrs=None):
+    """Écrit cg au format GraphML (clés : label, kind + node_attrs)."""
+    attrs = node_attrs or {}
+    src = cg.edge_sources()
+
+    with open(path, "w", encoding="utf-8") as f:
+        f.write('<?xml version="1.0" encoding="UTF-8"?>\n'
+                '<graphml xmlns="http://graphml.graphdrawing.org/xmlns">\n'
+                '  <key id="label" for="node" attr.name="label" attr.type="string"/>\n'
+                '  <key id="kind" for="node" attr.name="kind" attr.type="string"/>\n')
+        for name, values in attrs.items():
+            kind = _kind(values, "long", "double")
+            f.write(f'  <key id={quoteattr(name)} for="node" attr.name={quoteattr(name)} '
+                    f'attr.type="{kind}"/>\n')
+        f.write('  <graph edgedefault="directed">\n')
+
+        for start, stop in _chunks(cg.n_nodes):
+            labels = cg.labels(np.arange(start, stop))
+            columns = {name: values[start:stop].tolist() for name, values in attrs.items()}
+            lines = []
+            for j, label in enumerate(labels):
+                data = "".join(
+                    f'<data key={quoteattr(name)}>{col[j]}</data>'
+                    for name, col in columns.items() if _present(col[j])
+                )
+                lines.append(
+                    f'    <node id="n{start + j}"><data key="label">{escape(str(label))}</data>'
+                    f'<data key="kind">{KIND_NAMES[cg.kind[start + j]]}</data>{data}</node>\n'
+                )
+            f.write("".join(lines))
+
+        for start, stop in _chunks(cg.n_edges):
+            f.write("".join(
+                f'    <edge source="n{u}" target="n{v}"/>\n'
+                for u, v in zip(src[start:stop].tolist(), cg.indices[start:stop].tolist())
+            ))
+        f.write('  </graph>\n</graphml>\n')
+
+
+# =====================================================================
+# 📤 3. LISTE D'ARCS (TSV)
+# =====================================================================
+
+def write_edge_list(cg, path):
+    """Une ligne « source<TAB>cible » par arc, avec les labels."""
+    src = cg.edge_sources()
+    with open(path, "w", encoding="utf-8") as f:
+        for start, stop in _chunks(cg.n_edges):
+            sources = cg.labels(src[start:stop])
+            targets = cg.labels(cg.indices[start:stop])
+            f.write("".join(f"{u}\t{v}\n" for u, v in zip(sources, targets)))
+
+
+# =====================================================================
+# 📤 4. CSR BINAIRE
+# =====================================================================
+
+def write_csr_binary(cg, folder, node_attrs=None):
+    """
+    Dossier binaire relisible par memory-map :
+      indptr.npy, indices.npy, kind.npy, labels.txt, attr_<nom>.npy, meta.json
+    """
+    folder = Path(folder)
+    folder.mkdir(parents=True, exist_ok=True)
+
+    np.save(folder / "indptr.npy", cg.indptr)
+    np.save(folder / "indices.npy", cg.indices)
+    np.save(folder / "kind.npy", cg.kind)
+
+    with open(folder / "labels.txt", "w", encoding="utf-8") as f:
+        for start, stop in _chunks(cg.n_nodes):
+            f.write("".join(f"{label}\n" for label in cg.labels(np.arange(start, stop))))
+
+    for name, values in (node_attrs or {}).items():
+        np.save(folder / f"attr_{name}.npy", values)
+
+    with open(folder / "meta.json", "w", encoding="utf-8") as f:
+        json.dump({
+            "n_nodes": cg.n_nodes,
+            "n_edges": cg.n_edges,
+            "kinds": list(KIND_NAMES),
+            "attributes": list(node_attrs or {})
+        }, f, indent=2)
+
+
+def read_csr_binary(folder):
+    """Relit un export CSR binaire (tableaux en memory-map, sans copie)."""
+    folder = Path(folder)
+    with open(folder / "meta.json", encoding="utf-8") as f:
+        meta = json.load(f)
+
+    arrays = {
+        name: np.load(folder / f"{name}.npy", mmap_mode="r")
+        for name in ["indptr", "indices", "kind"]
+    }
+    arrays["attributes"] = {
+        name: np.load(folder / f"attr_{name}.npy", mmap_mode="r")
+        for name in meta["attributes"]
+    }
+    return meta, arrays
+
+
+# =====================================================================
+# Dispatch par extension
+# =====================================================================
+
+WRITERS = {
+    ".gexf": write_gexf,
+    ".graphml": write_graphml,
+    ".tsv": lambda cg, path, node_attrs=None: write_edge_list(cg, path)
+}
+
+
+def export_graph(cg, path, node_attrs=None):
+    """Exporte selon l'extension (.gexf, .graphml, .tsv ; dossier → CSR binaire)."""
+    suffix = Path(path).suffix
+    if suffix == "":
+        write_csr_binary(cg, path, node_attrs)
+    elif suffix in WRITERS:
+        WRITERS[suffix](cg, path, node_attrs=node_attrs)
+    else:
+        raise ValueError(f"Format d'export inconnu : {suffix}")
@@ -0,0 +1,245 @@
+# graph_reduction.py
+
+from dataclasses import dataclass
+
+import numpy as np
+
+from csr_models import expand, independent_cascade_csr, linear_threshold_csr
+
+
+# =====================================================================
+# Réduction du graphe avant simulation
+#
+# Une grande partie du graphe de build_github_graph n'influence pas la
+# diffusion depuis des seeds utilisateurs : numéros d'issue (puits),
+# "repo_starred" (puits), auteurs isolés ou inatteignables.
+#
+# IC :
+#   1. élagage : on ne garde que les nœuds atteignables depuis les seeds
+#      candidats (les autres ne sont jamais activés) ;
+#   2. épluchage de la queue : on retire itérativement les nœuds sans
+#      successeur restant (puits, puis chaînes et arbres pendants qui n'y
+#      mènent qu'à eux). Ce sont exactement les nœuds dont tous les
+#      descendants, dans le DAG des composantes fortement connexes, sont
+#      des composantes réduites à un nœud. Ils ne rétroagissent pas sur
+#      le reste : leur activation est tirée après coup, couche par couche,
+#      à partir des étapes d'activation du cœur.
+# LT : les voisins sont non orientés et les poids dépendent du degré ;
+#   seules les composantes faiblement connexes sans seed sont retirées.
+#
+# Les composantes fortement connexes ne sont pas fusionnées en un seul
+# nœud : en IC comme en LT, une CFC n'est pas activée en bloc.
+# Les résultats sont équivalents en loi (exacts pour p = 1 ou un seuil
+# fixe), mais le flux aléatoire diffère de la simulation sur le graphe complet.
+# =====================================================================
+
+@dataclass
+class ReducedGraph:
+    """
+    cg          : CompiledGraph du cœur (le nœud i du cœur est nodes[i])
+    nodes       : ids d'origine des nœuds du cœur (triés)
+    n_nodes     : nombre de nœuds du graphe d'origine
+    edges       : positions d'origine (dans cg.indices complet) des arcs du cœur
+    tail        : couches de la queue, dans l'ordre de traitement ; chaque
+                  couche est un tuple (indptr, dst, pos) : arcs entrant dans
+                  la couche, en CSR sur les ids d'origine de leurs sources,
+                  avec leurs positions d'origine
+    """
+    cg: object
+    nodes: np.ndarray
+    n_nodes: int
+    edges: np.ndarray
+    tail: list
+
+    def to_core(self, ids):
+        """ids d'origine → ids du cœur (ValueError si un nœud a été retiré)."""
+        ids = np.asarray(ids, dtype=np.int64)
+        pos = np.searchsorted(self.nodes, ids)
+        pos = np.minimum(pos, len(self.nodes) - 1)
+        if len(self.nodes) == 0 or not np.array_equal(self.nodes[pos], ids):
+            raise ValueError("Seed absent du graphe réduit : réduire avec ces seeds candidats.")
+        return pos
+
+    def summary(self):
+        return {
+            "nodes": self.n_nodes,
+            "core_nodes": len(self.nodes),
+            "tail_nodes": sum(len(np.unique(dst)) for _, dst, _ in self.tail),
+            "core_edges": self.cg.n_edges,
+            "tail_edges": sum(len(dst) for _, dst, _ in self.tail),
+            "tail_layers": len(self.tail)
+        }
+
+
+# =====================================================================
+# 🔍 1. ATTEIGNABILITÉ ET ÉPLUCHAGE
+# =====================================================================
+
+def reachable(cg, seeds, undirected=False):
+    """Masque des nœuds atteignables depuis seeds (parcours en largeur vectorisé)."""
+    seen = np.zeros(cg.n_nodes, dtype=bool)
+    frontier = np.unique(np.asarray(seeds, dtype=np.int64))
+    seen[frontier] = True
+
+    while frontier.size:
+        nxt = cg.indices[expand(cg.indptr, frontier)]
+        if undirected:
+            nxt = np.concatenate([nxt, cg.in_indices[expand(cg.in_indptr, frontier)]])
+        nxt = np.unique(nxt[~seen[nxt]])
+        seen[nxt] = True
+        frontier = nxt.astype(np.int64)
+
+    return seen
+
+
+def peel_tail(cg, keep, protected):
+    """
+    Épluche les nœuds de keep sans successeur restant (hors protected).
+    Renvoie layer : 0 pour le cœur, r ≥ 1 pour les nœuds retirés au tour r
+    (tous les successeurs d'un nœud du tour r sont dans des tours < r).
+    """
+    src = cg.edge_sources()
+    out_left = np.bincount(src[keep[src] & keep[cg.indices]], minlength=cg.n_nodes)
+
+    layer = np.zeros(cg.n_nodes, dtype=np.int64)
+    candidate = keep & ~protected
+    frontier = np.flatnonzero(candidate & (out_left == 0))
+    r = 0
+
+    while frontier.size:
+        r += 1
+        layer[frontier] = r
+        candidate[frontier] = False
+        preds = cg.in_indices[expand(cg.in_indptr, frontier)]
+        preds = preds[keep[preds]]
+        out_left -= np.bincount(preds, minlength=cg.n_nodes)
+        touched = np.unique(preds)
+        frontier = touched[candidate[touched] & (out_left[touched] == 0)].astype(np.int64)
+
+    return layer
+
+
+# =====================================================================
+# ✂️ 2. RÉDUCTION
+# =====================================================================
+
+def reduce_for_ic(cg, candidates):
+    """Graphe réduit pour des simulations IC dont les seeds sont parmi candidates."""
+    candidates = np.asarray(candidates, dtype=np.int64)
+    keep = reachable(cg, candidates)
+    protected = np.zeros(cg.n_nodes, dtype=bool)
+    protected[candidates] = True
+    layer = peel_tail(cg, keep, protected)
+
+    core = keep & (layer == 0)
+    nodes = np.flatnonzero(core)
+    src = cg.edge_sources()
+    dst = cg.indices
+
+    edges = np.flatnonzero(core[src] & core[dst])
+
+    # arcs vers la queue, couche la plus haute d'abord (ses prédécesseurs
+    # sont dans le cœur ou dans des couches déjà traitées)
+    tail = []
+    into_tail = keep[src] & (layer[dst] > 0)
+    for r in range(int(layer.max()), 0, -1):
+        pos = np.flatnonzero(into_tail & (layer[dst] == r))
+        indptr = np.zeros(cg.n_nodes + 1, dtype=np.int64)
+        np.cumsum(np.bincount(src[pos], minlength=cg.n_nodes), out=indptr[1:])
+        tail.append((indptr, dst[pos].astype(np.int64), pos))
+
+    return ReducedGraph(cg.subgraph(nodes), nodes, cg.n_nodes, edges, tail)
+
+
+def reduce_for_lt(cg, candidates, fixed_threshold=None):
+    """
+    Graphe réduit pour des simulations LT : composantes faiblement connexes
+    contenant un seed candidat. Avec un seuil fixe ≤ 0, tout nœud non isolé
+    s'active seul : rien n'est retiré.
+    """
+    if fixed_threshold is not None and fixed_threshold <= 0:
+        keep = np.ones(cg.n_nodes, dtype=bool)
+    else:
+        keep = reachable(cg, candidates, undirected=True)
+
+    nodes = np.flatnonzero(keep)
+    src = cg.edge_sources()
+    edges = np.flatnonzero(keep[src] & keep[cg.indices])
+    return ReducedGraph(cg.subgraph(nodes), nodes, cg.n_nodes, edges, [])
+
+
+# =====================================================================
+# 🧠 3. SIMULATION SUR LE GRAPHE RÉDUIT
+#
+# Les fonctions *_activations renvoient (ids, step) des seuls nœuds
+# activés, en ids d'origine : coût proportionnel au cœur et à la
+# cascade, pas au graphe complet. spread(step) et n_steps(step) de
+# csr_models s'appliquent directement à ce step compact.
+# =====================================================================
+
+def _full_step(rg, ids, step):
+    out = np.full(rg.n_nodes, -1, dtype=np.int32)
+    out[ids] = step
+    return out
+
+
+def tail_activations(rg, core_step, p=0.1, max_steps=20, rng=None):
+    """
+    Complète les activations du cœur par celles de la queue, couche par
+    couche : chaque nœud actif avant max_steps tente une fois sa chance
+    sur chacun de ses arcs vers la queue.
+    """
+    active = np.flatnonzero(core_step >= 0)
+    ids, steps = [rg.nodes[active]], [core_step[active]]
+
+    for indptr, tail_dst, tail_pos in rg.tail:
+        all_ids, all_steps = np.concatenate(ids), np.concatenate(steps)
+        live = all_steps < max_steps
+        sources, s = all_ids[live], all_steps[live]
+        pos = expand(indptr, sources)
+        if pos.size == 0:
+            continue
+        prob = p if np.isscalar(p) else p[tail_pos[pos]]
+        hit = rng.random(pos.size) < prob
+        if not hit.any():
+            continue
+
+        # étape d'activation : la plus précoce des tentatives réussies
+        t = np.repeat(s + 1, indptr[sources + 1] - indptr[sources])[hit]
+        dst = tail_dst[pos[hit]]
+        order = np.lexsort((t, dst))
+        dst, t = dst[order], t[order]
+        first = np.concatenate([[True], dst[1:] != dst[:-1]])
+        ids.append(dst[first])
+        steps.append(t[first].astype(np.int32))
+
+    return np.concatenate(ids), np.concatenate(steps)
+
+
+def ic_activations(rg, seeds, p=0.1, max_steps=20, rng=None, hook=None):
+    """
+    independent_cascade_csr sur le graphe réduit. seeds et p (scalaire ou
+    tableau aligné sur les arcs d'origine) sont exprimés sur le graphe
+    d'origine ; hook n'instrumente que le cœur.
+    """
+    rng = rng if rng is not None else np.random.default_rng()
+    core_p = p if np.isscalar(p) else np.asarray(p)[rg.edges]
+    core_step = independent_cascade_csr(rg.cg, rg.to_core(seeds), core_p, max_steps, rng, hook)
+    return tail_activations(rg, core_step, p, max_steps, rng)
+
+
+def lt_activations(rg, seeds, fixed_threshold=None, rng=None, hook=None):
+    """linear_threshold_csr sur le graphe réduit."""
+    core_step = linear_threshold_csr(rg.cg, rg.to_core(seeds), fixed_threshold, rng, hook)
+    active = np.flatnonzero(core_step >= 0)
+    return rg.nodes[active], core_step[active]
+
+
+def independent_cascade_reduced(rg, seeds, p=0.1, max_steps=20, rng=None, hook=None):
+    """Comme independent_cascade_csr : tableau step sur le graphe d'origine."""
+    return _full_step(rg, *ic_activations(rg, seeds, p, max_steps, rng, hook))
+
+
+def linear_threshold_reduced(rg, seeds, fixed_threshold=None, rng=None, hook=None):
+    """Comme linear_threshold_csr : tableau step sur le graphe d'origine."""
+    return _full_step(rg, *lt_activations(rg, seeds, fixed_threshold, rng, hook))
@@ -1,36 +1,46 @@
 import random
 import networkx as nx
-import matplotlib.pyplot as plt
-import plotly.graph_objects as go
 
 
 # =====================================================================
 # 🧠 1. SIMULATION INDEPENDENT CASCADE (IC)
 # =====================================================================
 
-def independent_cascade(G, seed, p=0.1, max_steps=20):
+def independent_cascade(G, seed, p=0.1, max_steps=20, rng=None, hook=None):
     """
     Modèle IC classique.
     G : graphe NetworkX
     seed : nœud initial
     p : probabilité d’influence
+    rng : générateur random.Random (module random par défaut)
+    hook : instrumentation optionnelle (instrumentation.CascadeRecorder)
     Retour :
       activated_nodes : set() de tous les nœuds activés
       steps : liste des couches (activation par étape)
     """
+    rng = rng or random
     active = {seed}
     newly_active = {seed}
     all_steps = [list(newly_active)]
 
+    if hook is not None:
+        hook.start()
+
     for step in range(max_steps):
         next_active = set()
 
         for node in newly_active:
             for neighbor in G.neighbors(node):
                 if neighbor not in active:
-                    if random.random() < p:
+                    if rng.random() < p:
                         next_active.add(neighbor)
 
+        if hook is not None:
+            hook.tick()
+            probed = [nb for node in newly_active for nb in G.neighbors(node)]
+            draws = sum(1 for nb in probed if nb not in active)
+            hook.step(len(newly_active), len(probed), draws)
+
         if not next_active:
             break
 
@@ -38,6 +48,9 @@ def independent_cascade(G, seed, p=0.1, max_steps=20):
         newly_active = next_active
         all_steps.append(list(next_active))
 
+    if hook is not None:
+        hook.finish(len(active))
+
     return active, all_steps
 
 
@@ -47,6 +60,7 @@ def independent_cascade(G, seed, p=0.1, max_steps=20):
 # =====================================================================
 
 def visualize_ic_matplotlib(G, activated, seed):
+    import matplotlib.pyplot as plt
     pos = nx.spring_layout(G, seed=42)
 
     colors = []
@@ -70,6 +84,7 @@ def visualize_ic_matplotlib(G, activated, seed):
 # =====================================================================
 
 def visualize_ic_plotly(G, activated, seed):
+    import plotly.graph_objects as go
     pos = nx.spring_layout(G, seed=42)
 
     x_nodes = [pos[n][0] for n in G.nodes()]
@@ -130,6 +145,7 @@ def animate_ic_plotly(G, steps, seed):
     """
     steps : liste [étape1, étape2, ...] contenant les noeuds activés par step.
     """
+    import plotly.graph_objects as go
 
     pos = nx.spring_layout(G, seed=42)
 
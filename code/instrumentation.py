@@ -0,0 +1,233 @@
+# instrumentation.py
+
+import json
+import math
+import numbers
+import time
+import tracemalloc
+from collections import defaultdict
+
+
+# =====================================================================
+# 📈 1. REGISTRE DE MÉTRIQUES
+# =====================================================================
+
+DEFAULT_BUCKETS = (0.0001, 0.001, 0.01, 0.1, 1.0, 10.0)
+SIZE_BUCKETS = (1, 10, 100, 1000, 10000, 100000, 1000000)
+
+
+class MetricsRegistry:
+    """
+    Registre de métriques en mémoire (compteurs et histogrammes étiquetés),
+    exportable en JSON ou au format texte Prometheus.
+    """
+
+    def __init__(self):
+        self.meta = {}                                      # nom → (type, aide, buckets)
+        self.counters = defaultdict(float)                  # (nom, labels) → valeur
+        self.histograms = {}                                # (nom, labels) → [compte, somme, buckets]
+
+    def describe(self, name, kind, help_text, buckets=DEFAULT_BUCKETS):
+        self.meta[name] = (kind, help_text, tuple(buckets))
+
+    @staticmethod
+    def _labels(labels):
+        return tuple(sorted(labels.items()))
+
+    def inc(self, name, value=1, **labels):
+        self.counters[(name, self._labels(labels))] += value
+
+    def observe(self, name, value, **labels):
+        buckets = self.meta[name][2]
+        key = (name, self._labels(labels))
+        if key not in self.histograms:
+            self.histograms[key] = [0, 0.0, [0] * len(buckets)]
+        h = self.histograms[key]
+        h[0] += 1
+        h[1] += value
+        for i, bound in enumerate(buckets):
+            if value <= bound:
+                h[2][i] += 1
+
+    def merge(self, snapshot):
+        """Ajoute un instantané to_dict() (ex : renvoyé par un autre processus)."""
+        for name, meta in snapshot["meta"].items():
+            self.meta.setdefault(name, (meta[0], meta[1], tuple(meta[2])))
+        for c in snapshot["counters"]:
+            self.counters[(c["name"], self._labels(c["labels"]))] += c["value"]
+        for h in snapshot["histograms"]:
+            key = (h["name"], self._labels(h["labels"]))
+            if key not in self.histograms:
+                self.histograms[key] = [0, 0.0, [0] * len(h["buckets"])]
+            mine = self.histograms[key]
+            mine[0] += h["count"]
+            mine[1] += h["sum"]
+            mine[2] = [a + b for a, b in zip(mine[2], h["buckets"])]
+
+    def reset(self):
+        self.counters.clear()
+        self.histograms.clear()
+
+    # ----------------------------
+    # Exports
+    # ----------------------------
+    def to_dict(self):
+        return {
+            "meta": {k: [v[0], v[1], list(v[2])] for k, v in self.meta.items()},
+            "counters": [
+                {"name": name, "labels": dict(labels), "value": value}
+                for (name, labels), value in self.counters.items()
+            ],
+            "histograms": [
+                {"name": name, "labels": dict(labels), "count": h[0], "sum": h[1], "buckets": h[2]}
+                for (name, labels), h in self.histograms.items()
+            ]
+        }
+
+    def to_json(self, path=None):
+        text = json.dumps(self.to_dict(), indent=2, ensure_ascii=False)
+        if path is not None:
+            with open(path, "w", encoding="utf-8") as f:
+                f.write(text)
+        return text
+
+    def to_prometheus(self):
+        def fmt(labels, extra=()):
+            items = list(labels) + list(extra)
+            if not items:
+                return ""
+            return "{" + ",".join(f'{k}="{_escape(v)}"' for k, v in items) + "}"
+
+        lines = []
+        for name in sorted(self.meta):
+            kind, help_text, buckets = self.meta[name]
+            lines.append(f"# HELP {name} {_escape(help_text, quotes=False)}")
+            lines.append(f"# TYPE {name} {kind}")
+
+            if kind == "counter":
+                for (n, labels), value in sorted(self.counters.items()):
+                    if n == name:
+                        lines.append(f"{name}{fmt(labels)} {_number(value)}")
+            else:
+                for (n, labels), (count, total, counts) in sorted(self.histograms.items()):
+                    if n != name:
+                        continue
+                    for bound, c in zip(buckets, counts):
+                        lines.append(f"{name}_bucket{fmt(labels, [('le', _number(bound))])} {c}")
+                    lines.append(f"{name}_bucket{fmt(labels, [('le', '+Inf')])} {count}")
+                    lines.append(f"{name}_sum{fmt(labels)} {_number(total)}")
+                    lines.append(f"{name}_count{fmt(labels)} {count}")
+
+        return "\n".join(lines) + "\n"
+
+
+def _number(value):
+    """Valeur exacte au format texte Prometheus (pas de {:g} : 12345678 ≠ 1.23457e+07)."""
+    if isinstance(value, float) and (math.isinf(value) or math.isnan(value)):
+        return "NaN" if math.isnan(value) else ("+Inf" if value > 0 else "-Inf")
+    if isinstance(value, numbers.Integral) or (isinstance(value, float) and value.is_integer()
+                                               and abs(value) < 2 ** 53):
+        return str(int(value))
+    return repr(float(value))
+
+
+def _escape(value, quotes=True):
+    """Échappe \\, les retours à la ligne (et " dans les labels), comme l'exige le format texte."""
+    text = str(value).replace("\\", "\\\\").replace("\n", "\\n")
+    return text.replace('"', '\\"') if quotes else text
+
+
+REGISTRY = MetricsRegistry()
+
+
+def _describe_diffusion_metrics(registry):
+    registry.describe("diffusion_runs_total", "counter", "Simulations terminées")
+    registry.describe("diffusion_steps_total", "counter", "Étapes de propagation")
+    registry.describe("diffusion_edges_probed_total", "counter", "Arcs examinés")
+    registry.describe("diffusion_random_draws_total", "counter", "Tirages aléatoires consommés")
+    registry.describe("diffusion_activated_total", "counter", "Nœuds activés (seeds comprises)")
+    registry.describe("diffusion_step_seconds", "histogram", "Durée d'une étape (s)")
+    registry.describe("diffusion_frontier_size", "histogram", "Taille de la frontière", SIZE_BUCKETS)
+    registry.describe("diffusion_step_alloc_bytes", "histogram",
+                      "Pic d'allocation pendant une étape (octets)", (1e3, 1e4, 1e5, 1e6, 1e7, 1e8))
+
+
+_describe_diffusion_metrics(REGISTRY)
+
+
+# =====================================================================
+# 🪝 2. HOOK DE SIMULATION
+# =====================================================================
+
+class CascadeRecorder:
+    """
+    Hook passé aux simulateurs (paramètre hook=) : enregistre chaque étape
+    et alimente le registre. Sans hook, les simulateurs ne paient qu'un
+    test « hook is not None » par étape.
+
+    steps : liste de dicts {step, frontier, edges_probed, random_draws,
+            seconds, alloc_bytes}
+    """
+
+    def __init__(self, model, registry=REGISTRY, track_allocations=False, **labels):
+        self.registry = registry
+        self.labels = {"model": model, **labels}
+        self.track_allocations = track_allocations
+        self.steps = []
+        if "diffusion_runs_total" not in registry.meta:
+            _describe_diffusion_metrics(registry)
+
+    def start(self, random_draws=0):
+        """Début de simulation (random_draws : tirages d'initialisation, ex : seuils LT)."""
+        self.steps = []
+        if random_draws:
+            self.registry.inc("diffusion_random_draws_total", random_draws, **self.labels)
+        if self.track_allocations:
+            if not tracemalloc.is_tracing():
+                tracemalloc.start()
+            tracemalloc.reset_peak()
+            self._mem = tracemalloc.get_traced_memory()[0]
+        self._tick = None
+        self._t = time.perf_counter()
+
+    def tick(self):
+        """Fin du travail de l'étape : exclut de la mesure le comptage fait par le simulateur."""
+        self._tick = self._measure()
+
+    def _measure(self):
+        end = time.perf_counter()
+        alloc = None
+        if self.track_allocations:
+            alloc = tracemalloc.get_traced_memory()[1] - self._mem
+        return end - self._t, alloc
+
+    def step(self, frontier, edges_probed, random_draws):
+        seconds, alloc = self._tick if self._tick is not None else self._measure()
+        self._tick = None
+
+        self.steps.append({
+            "step": len(self.steps) + 1,
+            "frontier": frontier,
+            "edges_probed": edges_probed,
+            "random_draws": random_draws,
+            "seconds": seconds,
+            "alloc_bytes": alloc
+        })
+
+        r, labels = self.registry, self.labels
+        r.inc("diffusion_steps_total", **labels)
+        r.inc("diffusion_edges_probed_total", edges_probed, **labels)
+        r.inc("diffusion_random_draws_total", random_draws, **labels)
+        r.observe("diffusion_step_seconds", seconds, **labels)
+        r.observe("diffusion_frontier_size", frontier, **labels)
+        if alloc is not None:
+            r.observe("diffusion_step_alloc_bytes", alloc, **labels)
+
+        if self.track_allocations:
+            tracemalloc.reset_peak()
+            self._mem = tracemalloc.get_traced_memory()[0]
+        self._t = time.perf_counter()
+
+    def finish(self, activated):
+        self.registry.inc("diffusion_runs_total", **self.labels)
+        self.registry.inc("diffusion_activated_total", activated, **self.labels)
@@ -0,0 +1,161 @@
+# kernels.py
+
+import functools
+import importlib.util
+
+import numpy as np
+
+HAVE_NUMBA = importlib.util.find_spec("numba") is not None
+
+
+def njit(fn):
+    """
+    Compile fn avec Numba au premier appel : l'import de Numba (lent)
+    n'est payé que par les runs qui utilisent les noyaux. Sans Numba, fn
+    est appelée telle quelle. fn reste accessible par .py_func.
+    """
+    compiled = None
+
+    @functools.wraps(fn)
+    def wrapper(*args):
+        nonlocal compiled
+        if compiled is None:
+            if HAVE_NUMBA:
+                import numba
+                compiled = numba.njit(cache=True)(fn)
+            else:
+                compiled = fn
+        return compiled(*args)
+
+    wrapper.py_func = fn
+    return wrapper
+
+
+# =====================================================================
+# Noyaux compilés (Numba) des boucles internes de csr_models
+#
+# Ils parcourent les arcs un à un, avec sortie anticipée : pas de tableau
+# intermédiaire de positions ni de np.unique. Les tirages aléatoires
+# restent faits par le générateur numpy de l'appelant, dans le même ordre
+# et en même nombre que le chemin NumPy : pour une même graine, les deux
+# chemins renvoient exactement le même tableau step.
+#
+# Sans Numba, les noyaux restent appelables en Python pur (lents), ce
+# qui permet de vérifier leur équivalence.
+# =====================================================================
+
+@njit
+def ic_step(indptr, indices, frontier, draws, prob, step, t):
+    """
+    Une étape IC : l'arc numéro k (dans l'ordre frontier puis CSR) est
+    actif si draws[k] < prob (prob : un seul élément, ou un par arc).
+    Marque step = t et renvoie les nouveaux activés, triés.
+    """
+    per_edge = prob.size == indices.size and prob.size != 1
+    hit = np.empty(draws.size, dtype=np.int64)
+    n_hit = 0
+    k = 0
+    for u in frontier:
+        for e in range(indptr[u], indptr[u + 1]):
+            v = indices[e]
+            if draws[k] < (prob[e] if per_edge else prob[0]) and step[v] < 0:
+                step[v] = t
+                hit[n_hit] = v
+                n_hit += 1
+            k += 1
+    return np.sort(hit[:n_hit])
+
+
+@njit
+def lt_round(indptr, indices, in_indptr, in_indices, out_w, in_w, norm, thresholds,
+             active_neighbors, step, mark, newly_active, extra, t):
+    """
+    Un tour LT : ajoute les voisins (sortants et entrants) des nouveaux
+    activés aux compteurs, puis active les candidats dont l'influence
+    (compteur / norm) atteint le seuil. Chaque voisin compte pour 1, ou
+    pour son poids out_w / in_w s'ils sont non vides. extra : candidats
+    supplémentaires (seuils nuls au premier tour). Renvoie (activés triés,
+    arcs parcourus).
+    """
+    weighted = out_w.size > 0
+    candidates = np.empty(active_neighbors.size, dtype=np.int64)
+    n_candidates = 0
+    touched = 0
+
+    for u in newly_active:
+        for e in range(indptr[u], indptr[u + 1]):
+            v = indices[e]
+            active_neighbors[v] += out_w[e] if weighted else 1.0
+            if mark[v] != t:
+                mark[v] = t
+                candidates[n_candidates] = v
+                n_candidates += 1
+        for e in range(in_indptr[u], in_indptr[u + 1]):
+            v = in_indices[e]
+            active_neighbors[v] += in_w[e] if weighted else 1.0
+            if mark[v] != t:
+                mark[v] = t
+                candidates[n_candidates] = v
+                n_candidates += 1
+        touched += indptr[u + 1] - indptr[u] + in_indptr[u + 1] - in_indptr[u]
+
+    for v in extra:
+        if mark[v] != t:
+            mark[v] = t
+            candidates[n_candidates] = v
+            n_candidates += 1
+
+    activated = np.empty(n_candidates, dtype=np.int64)
+    n_activated = 0
+    for i in range(n_candidates):
+        v = candidates[i]
+        if step[v] < 0 and active_neighbors[v] / norm[v] >= thresholds[v]:
+            activated[n_activated] = v
+            n_activated += 1
+
+    activated = np.sort(activated[:n_activated])
+    for v in activated:
+        step[v] = t
+    return activated, touched
+
+
+@njit
+def sketch_sweep(in_indptr, in_indices, in_live, order, k, sketch, size, count, mark, stack):
+    """
+    Esquisses bottom-k combinées (cf. reachability_sketches). Les paires
+    (nœud v, instance i), numérotées i * n + v, sont traitées dans l'ordre
+    de order (rang j = position dans order) : parcours arrière depuis v sur
+    les arcs vivants de l'instance i (bit i de in_live), en ajoutant j à
+    l'esquisse de chaque nœud atteint. Une paire qui a déjà reçu k rangs
+    arrête le parcours (tous ses prédécesseurs ont alors k rangs plus petits).
+
+    sketch (n, k) et size : esquisses par nœud, rangs croissants
+    count, mark           : rangs reçus et dernier parcours par paire
+    """
+    n = size.size
+    one = np.uint64(1)
+    for j in range(order.size):
+        pair = order[j]
+        i = pair // n
+        bit = one << np.uint64(i)
+        base = i * n
+
+        stack[0] = pair - base
+        top = 1
+        mark[pair] = j
+        while top > 0:
+            top -= 1
+            y = stack[top]
+            if count[base + y] >= k:
+                continue
+            count[base + y] += 1
+            if size[y] < k:
+                sketch[y, size[y]] = j
+                size[y] += 1
+
+            for e in range(in_indptr[y], in_indptr[y + 1]):
+                x = in_indices[e]
+                if in_live[e] & bit and mark[base + x] != j:
+                    mark[base + x] = j
+                    stack[top] = x
+                    top += 1
@@ -1,18 +1,18 @@
 import random
 import pandas as pd
 import networkx as nx
-import matplotlib.pyplot as plt
-import plotly.graph_objects as go
 
 
 # =========================================================
 # LINEAR THRESHOLD MODEL
 # =========================================================
 
-def linear_threshold(G, seeds, fixed_threshold=None):
+def linear_threshold(G, seeds, fixed_threshold=None, rng=None, hook=None):
 
     """
     Simulation du modèle Linear Threshold (LT)
+    rng : générateur random.Random (module random par défaut)
+    hook : instrumentation optionnelle (instrumentation.CascadeRecorder)
 
     Returns:
     - activated: set des noeuds activés
@@ -24,8 +24,9 @@ def linear_threshold(G, seeds, fixed_threshold=None):
     # ----------------------------
     # Initialisation
     # ----------------------------
+    rng = rng or random
     if fixed_threshold is None:
-        thresholds = {v: random.uniform(0, 1) for v in G.nodes()}
+        thresholds = {v: rng.uniform(0, 1) for v in G.nodes()}
     else:
         thresholds = {v: fixed_threshold for v in G.nodes()}
     activated = set(seeds)
@@ -35,6 +36,9 @@ def linear_threshold(G, seeds, fixed_threshold=None):
     step = 0
     newly_active = set(seeds)
 
+    if hook is not None:
+        hook.start(random_draws=len(thresholds) if fixed_threshold is None else 0)
+
     # ----------------------------
     # Propagation
     # ----------------------------
@@ -57,12 +61,20 @@ def linear_threshold(G, seeds, fixed_threshold=None):
                 next_active.add(v)
                 activation_step[v] = step
 
+        if hook is not None:
+            hook.tick()
+            probed = sum(G.degree(v) for v in G.nodes() if v not in activated)
+            hook.step(len(newly_active), probed, 0)
+
         newly_active = next_active - activated
         activated |= newly_active
 
         if newly_active:
             steps.append(newly_active)
 
+    if hook is not None:
+        hook.finish(len(activated))
+
     return activated, steps, thresholds, activation_step
 
 
@@ -92,6 +104,7 @@ def print_lt_summary(G, thresholds, activated, activation_step):
 # =========================================================
 
 def visualize_lt_matplotlib(G, activated, seeds):
+    import matplotlib.pyplot as plt
     pos = nx.spring_layout(G, seed=42)
 
     plt.figure(figsize=(10, 8))
@@ -115,6 +128,7 @@ def visualize_lt_matplotlib(G, activated, seeds):
 # =========================================================
 
 def visualize_lt_plotly(G, activated, seeds):
+    import plotly.graph_objects as go
     pos = nx.spring_layout(G, seed=42)
 
     edge_x, edge_y = [], []
@@ -2,6 +2,9 @@ import os
 import random
 import sys
 
+import networkx as nx
+import pandas as pd
+
 
 # ============================================================
 # AJOUT DU DOSSIER RACINE AU PYTHONPATH
@@ -14,47 +17,21 @@ if ROOT_DIR not in sys.path:
     sys.path.append(ROOT_DIR)
 
 
-from github_scraper import scrape_github
-from data_loader import load_json
-from graph_builder import (
-    build_github_graph,
-    show_graph_simple,
-    show_graph_plotly,
-    export_graph_gephi
-    )
+# Le scraper, les visualisations et les analyses sont chargés à la demande
+# (cf. plugins.py) : le premier menu s'affiche sans importer PyGithub,
+# matplotlib ni Plotly.
+from data_loader import load_dataset
+from graph_builder import build_github_graph
+from ic_model import independent_cascade
+from lt_model import linear_threshold, print_lt_summary
+from multi_repo import build_merged_graph, scrape_repos
+from pipeline import Pipeline
+from plugins import plugin
 
-from ic_model import (
-    independent_cascade,
-    visualize_ic_plotly
-)
-
-from lt_model import (
-    linear_threshold,
-    print_lt_summary,
-    visualize_lt_plotly
-)
-
-# ================= ANALYSES =================
-from analysis.ic_vs_lt import (
-    compare_ic_lt,
-    plot_ic_lt_comparison
-)
-
-from analysis.influence_analysis import (
-    top_influencers,
-    structure_vs_diffusion,
-    plot_structure_vs_diffusion
-)
-
-from analysis.sensitivity_analysis import (
-    sensitivity_ic,
-    sensitivity_lt,
-    plot_sensitivity
-)
-
-from analysis.config_menu import configure_experiment
+from result_store import ResultStore
 
 DATA_DIR = "../data_github"
+RNG_SEED = 42       # graine des analyses : rend les résultats cachables
 
 
 # ============================================================
@@ -75,8 +52,14 @@ def choose_repo():
     print("\n=== Choix du repository ===")
     for k, v in repos.items():
         print(f"{k}. {v}")
+    print("8. Plusieurs repos (graphe fusionné)")
 
-    return repos.get(input("Choix : "), "pallets/flask")
+    choice = input("Choix : ")
+    if choice == "8":
+        picks = [k.strip() for k in input("Repos (numéros séparés par des virgules) : ").split(",")]
+        return [repos[k] for k in picks if k in repos] or ["pallets/flask"]
+
+    return repos.get(choice, "pallets/flask")
 
 
 def ask_regenerate():
@@ -92,18 +75,22 @@ def choose_visualization(G):
     choice = input("Votre choix (1-4) : ").strip()
 
     if choice == "1":
-        show_graph_simple(G)
+        plugin("show_graph_simple")(G)
 
     elif choice == "2":
-        show_graph_plotly(G)
+        plugin("show_graph_plotly")(G)
 
     elif choice == "3":
-        export_graph_gephi(G)
+        plugin("export_graph_gephi")(G)
 
     else:
         print("➡ Aucune visualisation sélectionnée.")
 
 
+def ask_export_cascade():
+    return input("\nExporter la cascade pour Gephi (GEXF) ? (o/n) : ").lower() == "o"
+
+
 def choose_model():
     print("\n=== Choix du mode ===")
     print("1. Simulation IC")
@@ -112,6 +99,63 @@ def choose_model():
     return input("Choix : ")
 
 
+# ============================================================
+# PIPELINE D'ANALYSES (mode 3)
+# ============================================================
+
+SENSITIVITY_P = [0.05, 0.1, 0.2, 0.3, 0.5]
+SENSITIVITY_THRESHOLDS = [0.1, 0.2, 0.3, 0.4, 0.5]
+COMMUNITY_RUNS = 200
+
+
+def analysis_pipeline(G, config, store, workers=None):
+    """
+    Analyses du mode 3 sous forme de DAG : l'empreinte du graphe (clé du
+    cache), les degrés et la centralité d'intermédiarité sont calculés une
+    seule fois ; l'empreinte est passée telle quelle aux analyses, qui ne la
+    recalculent pas pour leurs clés. Comparaison, top influenceurs,
+    sensibilités et communautés sont lancés dès que leurs entrées sont
+    prêtes ; sur le pool de threads, seules leurs E/S de cache et les parties
+    NumPy se recouvrent (les simulations NetworkX restent sérialisées par le
+    GIL). L'intermédiarité (O(V·E)) est elle-même gardée dans le cache : une
+    relance ne la recalcule pas.
+    """
+    pipeline = Pipeline(workers)
+
+    pipeline.add("fingerprint", lambda: store.fingerprint(G))
+    pipeline.add("degree", lambda: dict(G.degree()))
+    pipeline.add("betweenness", lambda fingerprint: store.cached(
+        store.key(fingerprint, "betweenness"), lambda: pd.Series(nx.betweenness_centrality(G))
+    ).to_dict(), deps=["fingerprint"])
+
+    pipeline.add("comparison", lambda fingerprint: plugin("compare_ic_lt")(
+        G, seeds=config["IC"]["seeds"], p=config["IC"]["p"], rng_seed=RNG_SEED, store=store,
+        fingerprint=fingerprint
+    ), deps=["fingerprint"])
+
+    pipeline.add("top_influencers", lambda fingerprint, degree, betweenness: plugin("top_influencers")(
+        G, k=5, store=store, degree=degree, betweenness=betweenness, verbose=False,
+        fingerprint=fingerprint
+    ), deps=["fingerprint", "degree", "betweenness"])
+
+    pipeline.add("sensitivity_ic", lambda fingerprint: plugin("sensitivity_ic")(
+        G, config["IC"]["seeds"][0], SENSITIVITY_P, rng_seed=RNG_SEED, store=store,
+        fingerprint=fingerprint
+    ), deps=["fingerprint"])
+
+    pipeline.add("sensitivity_lt", lambda fingerprint: plugin("sensitivity_lt")(
+        G, config["LT"]["seeds"], SENSITIVITY_THRESHOLDS, rng_seed=RNG_SEED, store=store,
+        fingerprint=fingerprint
+    ), deps=["fingerprint"])
+
+    pipeline.add("communities", lambda fingerprint: plugin("community_analysis")(
+        G, config["IC"]["seeds"], "IC", p=config["IC"]["p"], runs=COMMUNITY_RUNS,
+        rng_seed=RNG_SEED, store=store, fingerprint=fingerprint
+    ), deps=["fingerprint"])
+
+    return pipeline
+
+
 # ============================================================
 # MAIN
 # ============================================================
@@ -121,23 +165,22 @@ def main():
     print("\n=== TP Diffusion de l'information – GitHub ===")
 
     repo = choose_repo()
+    multi = isinstance(repo, list)     # un dossier par repo : data_github/<owner>__<repo>/
 
     if ask_regenerate():
         from pathlib import Path
-        scrape_github(repo, Path(DATA_DIR))
+        if multi:
+            scrape_repos(repo, DATA_DIR)
+        else:
+            plugin("scraper")(repo, Path(DATA_DIR))
     else:
         print("✔ Dataset existant utilisé.")
 
-    commits, issues, comments, stars = (
-        load_json(os.path.join(DATA_DIR, f))
-        for f in ["commits.json", "issues.json", "comments.json", "stars.json"]
-    )
-
-    for df in [issues, comments, stars]:
-        if "user" in df.columns:
-            df.rename(columns={"user": "author"}, inplace=True)
-
-    G = build_github_graph(commits, issues, comments, stars)
+    if multi:
+        G = build_merged_graph(repo, DATA_DIR).to_networkx()
+    else:
+        commits, issues, comments, stars = load_dataset(DATA_DIR)
+        G = build_github_graph(commits, issues, comments, stars)
     print(f"\nGraphe : {G.number_of_nodes()} nœuds / {G.number_of_edges()} arcs")
 
     choose_visualization(G)
@@ -151,9 +194,13 @@ def main():
         seed = random.choice(list(G.nodes()))
         p = float(input("Probabilité p : "))
 
-        activated, _ = independent_cascade(G, seed, p)
+        activated, steps = independent_cascade(G, seed, p)
         print(f"\nIC → {len(activated)} nœuds activés")
-        visualize_ic_plotly(G, activated, seed)
+        plugin("visualize_ic_plotly")(G, activated, seed)
+
+        if ask_export_cascade():
+            activation_step = {n: t for t, layer in enumerate(steps) for n in layer}
+            plugin("export_graph_gephi")(G, "cascade_ic.gexf", {"activation_step": activation_step})
 
     # ========================================================
     # LT
@@ -164,7 +211,10 @@ def main():
 
         activated, steps, thresholds, activation_step = linear_threshold(G, seeds)
         print_lt_summary(G, thresholds, activated, activation_step)
-        visualize_lt_plotly(G, activated, seeds)
+        plugin("visualize_lt_plotly")(G, activated, seeds)
+
+        if ask_export_cascade():
+            plugin("export_graph_gephi")(G, "cascade_lt.gexf", {"activation_step": activation_step})
 
     # ========================================================
     # ANALYSES
@@ -174,19 +224,23 @@ def main():
     # ==============================
     # Configuration interactive
     # ==============================
-        config = configure_experiment(G)
+        config = plugin("configure_experiment")(G)
 
         print("\nConfiguration utilisée :")
         print(config)
 
+        store = ResultStore()
+
+    # ==============================
+    # Analyses en parallèle (DAG d'artefacts)
+    # ==============================
+        pipeline = analysis_pipeline(G, config, store)
+        results = pipeline.run()
+
     # ==============================
     # Comparaison IC vs LT
     # ==============================
-        df_comp = compare_ic_lt(
-            G,
-            seeds=config["IC"]["seeds"],
-            p=config["IC"]["p"]
-    )
+        df_comp = results["comparison"]
 
     # Ajout des labels de config
         df_comp["config"] = df_comp["model"].apply(
@@ -196,33 +250,41 @@ def main():
         print("\n=== Comparaison IC vs LT ===")
         print(df_comp)
 
-        plot_ic_lt_comparison(df_comp)
+        plugin("plot_ic_lt_comparison")(df_comp)
 
     # ==============================
     # Top influenceurs structurels
     # ==============================
-        top_influencers(G, k=5)
+        print("\n=== Top influenceurs structurels du réseau ===")
+        print(results["top_influencers"].to_string(index=False))
 
     # ==============================
     # Analyse de sensibilité IC
     # ==============================
-        seed_ic = config["IC"]["seeds"][0]
-        p_values = [0.05, 0.1, 0.2, 0.3, 0.5]
-
-        df_ic = sensitivity_ic(G, seed_ic, p_values)
+        df_ic = results["sensitivity_ic"]
         print("\n=== Sensibilité IC (p) ===")
         print(df_ic)
-        plot_sensitivity(df_ic, "Effet de p sur IC")
+        plugin("plot_sensitivity")(df_ic, "Effet de p sur IC")
 
     # ==============================
     # Analyse de sensibilité LT
     # ==============================
-        thresholds = [0.1, 0.2, 0.3, 0.4, 0.5]
-
-        df_lt = sensitivity_lt(G, config["LT"]["seeds"], thresholds)
+        df_lt = results["sensitivity_lt"]
         print("\n=== Sensibilité LT (seuils) ===")
         print(df_lt)
-        plot_sensitivity(df_lt, "Effet des seuils sur LT")
+        plugin("plot_sensitivity")(df_lt, "Effet des seuils sur LT")
+
+    # ==============================
+    # Diffusion par communauté
+    # ==============================
+        summary, flows = results["communities"]
+        print("\n=== Communautés (diffusion IC depuis les seeds) ===")
+        print(summary.nlargest(10, "mean_activated").to_string(index=False))
+        print("\n=== Flux de cascade entre communautés ===")
+        print(flows.head(10).to_string(index=False))
+        plugin("plot_community_flows")(summary, flows)
+
+        pipeline.print_report()
 
     else:
         print("Choix invalide.")
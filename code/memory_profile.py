@@ -0,0 +1,403 @@
+# memory_profile.py
+#
+# Profil mémoire des étapes du pipeline : chargement JSON, construction
+# du graphe (paires issue → commit en O(I·C)), compilation, layout et
+# simulation avec traces.
+#
+#   python3 code/memory_profile.py --data ../data_github
+#   python3 code/memory_profile.py --scaling 1e3 1e4 1e5 --target 1e7
+#   python3 code/memory_profile.py --data gros_scrape/ --budget 4GB
+#
+# Pour chaque étape : pic et mémoire conservée (tracemalloc, allocations
+# Python et NumPy) et RSS du processus (échantillonné pendant l'étape).
+# --scaling profile des datasets synthétiques de tailles croissantes et
+# ajuste, par étape, un modèle pic = a · taille^b (enregistré dans
+# --model) ; --target projette la mémoire de chaque étape pour un graphe
+# de cette taille (le layout, gardé par --layout-max-nodes, est marqué
+# comme non exécuté au-delà). Avec --budget et un modèle, chaque étape est projetée
+# avant d'être lancée : si RSS actuel + pic projeté dépasse le budget, le
+# profil s'arrête (MemoryBudgetExceeded) avant l'étape fautive.
+
+import argparse
+import json
+import os
+import tempfile
+import threading
+import time
+import tracemalloc
+from contextlib import contextmanager
+from pathlib import Path
+
+import networkx as nx
+import numpy as np
+import pandas as pd
+
+from cascade_traces import CascadeTraces
+from compiled_graph import compile_graph
+from csr_models import independent_cascade_csr, linear_threshold_csr
+from data_loader import DATASET_FILES, load_dataset
+from graph_builder import build_github_graph
+from synthetic_data import count_edges, generate_github_data, sizes_for_edges, write_dataset
+
+# local à la machine : sous .cache/ (ignoré par git), pas dans le dossier courant
+MODEL_FILE = str(Path(__file__).resolve().parent.parent / ".cache" / "memory_model.json")
+LAYOUT_MAX_NODES = 5000
+SAMPLE_INTERVAL = 0.01      # secondes entre deux relevés RSS
+UNITS = {"": 1, "B": 1, "KB": 1 << 10, "MB": 1 << 20, "GB": 1 << 30, "TB": 1 << 40}
+
+
+class MemoryBudgetExceeded(MemoryError):
+    """Une étape dépasserait le budget mémoire (levée avant de la lancer)."""
+
+
+def parse_bytes(text):
+    """"512MB", "4GB", "1.5 GB" ou un nombre d'octets → octets."""
+    text = str(text).strip().upper().replace(" ", "").replace("O", "B")
+    number = text.rstrip("KMGTB")
+    unit = text[len(number):]
+    if unit not in UNITS:
+        raise ValueError(f"Unité de taille inconnue : {text}")
+    return int(float(number) * UNITS[unit])
+
+
+def format_bytes(n):
+    return f"{n / (1 << 20):,.1f} Mo"
+
+
+# ============================================================
+# MESURE
+# ============================================================
+
+def rss():
+    """RSS actuel du processus en octets (Linux : /proc ; sinon None)."""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError):
+        return None
+
+
+class _RssSampler(threading.Thread):
+    """Relève le RSS toutes les interval secondes et garde le maximum."""
+
+    def __init__(self, interval):
+        super().__init__(daemon=True)
+        self.interval = interval
+        self.peak = rss()
+        self._done = threading.Event()
+
+    def run(self):
+        while not self._done.wait(self.interval):
+            value = rss()
+            if value is not None:
+                self.peak = max(self.peak or 0, value)
+
+    def stop(self):
+        self._done.set()
+        self.join()
+        value = rss()
+        if value is not None:
+            self.peak = max(self.peak or 0, value)
+        return self.peak
+
+
+class MemoryProfiler:
+    """
+    Mesure mémoire par étape (context manager stage) :
+
+        profiler = MemoryProfiler(budget=parse_bytes("4GB"), model=ScalingModel.load(path))
+        with profiler.stage("build_github_graph", size=n_edges):
+            G = build_github_graph(...)
+        profiler.report()
+
+    size : taille qui pilote l'étape (unité de son modèle), pour la
+           projection avant lancement et l'ajustement des modèles.
+    """
+
+    def __init__(self, budget=None, model=None, interval=SAMPLE_INTERVAL):
+        self.budget = budget
+        self.model = model
+        self.interval = interval
+        self.rows = []
+
+    def check(self, name, size, nodes=None):
+        """
+        Lève MemoryBudgetExceeded si l'étape projetée dépasse le budget.
+        Une étape dont la garde ne passerait pas (layout au-delà de
+        max_nodes) n'est pas vérifiée ; nodes : nombre réel de nœuds, sinon
+        estimé depuis size par le modèle.
+        """
+        if self.budget is None or self.model is None or size is None or name not in self.model:
+            return None
+        if not self.model.runs(name, size, nodes):
+            return None
+        now = rss() if rss() is not None else tracemalloc.get_traced_memory()[0]
+        projected = now + self.model.predict(name, size)
+        if projected > self.budget:
+            raise MemoryBudgetExceeded(
+                f"Étape {name} (taille {size:,.0f}) : projection {format_bytes(projected)} "
+                f"> budget {format_bytes(self.budget)}"
+            )
+        return projected
+
+    @contextmanager
+    def stage(self, name, size=None, driver="edges", nodes=None):
+        projected = self.check(name, size, nodes)
+
+        started = tracemalloc.is_tracing()
+        if not started:
+            tracemalloc.start()
+        tracemalloc.reset_peak()
+        before, _ = tracemalloc.get_traced_memory()
+        rss_before = rss()
+        sampler = _RssSampler(self.interval)
+        sampler.start()
+        start = time.perf_counter()
+
+        try:
+            yield
+        finally:
+            seconds = time.perf_counter() - start
+            rss_peak = sampler.stop()
+            current, peak = tracemalloc.get_traced_memory()
+            if not started:
+                tracemalloc.stop()
+
+            self.rows.append({
+                "stage": name,
+                "driver": driver,
+                "size": size,
+                "seconds": seconds,
+                "peak_bytes": peak - before,
+                "retained_bytes": current - before,
+                "rss_before": rss_before,
+                "rss_peak": rss_peak,
+                "rss_after": rss(),
+                "projected_bytes": projected
+            })
+
+    def report(self):
+        return pd.DataFrame(self.rows)
+
+
+def print_report(df):
+    cols = ["peak_bytes", "retained_bytes", "rss_peak", "projected_bytes"]
+    out = df[["stage", "size", "seconds"] + cols].copy()
+    for col in cols:
+        out[col] = out[col].map(lambda v: "" if v is None or pd.isna(v) else format_bytes(v))
+    out["seconds"] = out["seconds"].round(3)
+    print(out.to_string(index=False))
+
+
+# ============================================================
+# ÉTAPES DU PIPELINE
+# ============================================================
+
+def profile_pipeline(data_dir, profiler, runs=100, layout_max_nodes=LAYOUT_MAX_NODES):
+    """
+    Exécute et mesure les étapes sur un dataset. La taille des étapes de
+    graphe est le nombre d'arcs, estimé depuis les tables (count_edges)
+    avant la construction ; celle du chargement, la taille des JSON.
+    Renvoie (arcs, nœuds) du graphe.
+    """
+    json_bytes = sum(
+        (Path(data_dir) / f).stat().st_size for f in DATASET_FILES if (Path(data_dir) / f).exists()
+    )
+    with profiler.stage("load_json", json_bytes, driver="json_bytes"):
+        commits, issues, comments, stars = load_dataset(data_dir)
+
+    edges = count_edges(commits, issues, comments, stars)
+    with profiler.stage("build_github_graph", edges):
+        G = build_github_graph(commits, issues, comments, stars)
+    with profiler.stage("compile_graph", edges):
+        cg = compile_graph(G)
+
+    if G.number_of_nodes() <= layout_max_nodes:
+        with profiler.stage("spring_layout", edges, nodes=G.number_of_nodes()):
+            nx.spring_layout(G, seed=42)
+
+    seed = [int(np.argmax(cg.out_degree()))]
+    rng = np.random.default_rng(0)
+    # compilation JIT des noyaux hors mesure (sinon comptée au premier profil)
+    independent_cascade_csr(cg, seed, 0.1, rng=rng)
+    linear_threshold_csr(cg, seed, rng=rng)
+    with profiler.stage("simulate_traces", edges):
+        traces = CascadeTraces(cg.n_nodes)
+        for _ in range(runs):
+            traces.append(independent_cascade_csr(cg, seed, 0.1, rng=rng))
+            traces.append(linear_threshold_csr(cg, seed, rng=rng))
+
+    return edges, G.number_of_nodes()
+
+
+# ============================================================
+# MODÈLE D'ÉCHELLE
+# ============================================================
+
+class ScalingModel:
+    """
+    Pic mémoire de chaque étape en fonction de sa taille : pic = a · taille^b,
+    ajusté en log-log sur des profils synthétiques. json_fit relie les deux
+    unités de taille (projection du chargement pour un nombre d'arcs) et
+    nodes_fit estime le nombre de nœuds, pour les étapes gardées par un
+    maximum de nœuds (max_nodes : le layout n'est pas lancé au-delà).
+    """
+
+    def __init__(self, stages, json_fit=None, nodes_fit=None):
+        self.stages = stages        # {étape: {"driver", "a", "b"[, "max_nodes"]}}
+        self.json_fit = json_fit    # {"a", "b"} : octets JSON en fonction des arcs
+        self.nodes_fit = nodes_fit  # {"a", "b"} : nœuds en fonction des arcs
+
+    def __contains__(self, name):
+        return name in self.stages
+
+    @staticmethod
+    def _fit(x, y):
+        x, y = np.asarray(x, dtype=np.float64), np.maximum(np.asarray(y, dtype=np.float64), 1.0)
+        if np.unique(x).size < 2:
+            return {"a": float(y.mean() / x.mean()), "b": 1.0}
+        b, log_a = np.polyfit(np.log(x), np.log(y), 1)
+        return {"a": float(np.exp(log_a)), "b": float(b)}
+
+    @classmethod
+    def fit(cls, df, max_nodes=None):
+        """
+        df : profils (report()) de plusieurs tailles, avec les colonnes edges
+        et nodes. max_nodes : {étape: nœuds maximum} des étapes gardées.
+        """
+        stages = {}
+        for name, rows in df.groupby("stage", sort=False):
+            stages[name] = {"driver": rows["driver"].iloc[0], **cls._fit(rows["size"], rows["peak_bytes"])}
+            if max_nodes and name in max_nodes:
+                stages[name]["max_nodes"] = int(max_nodes[name])
+        load = df[df["stage"] == "load_json"]
+        json_fit = cls._fit(load["edges"], load["size"]) if len(load) else None
+        graphs = df.drop_duplicates("edges")
+        nodes_fit = cls._fit(graphs["edges"], graphs["nodes"]) if "nodes" in df and len(graphs) else None
+        return cls(stages, json_fit, nodes_fit)
+
+    def predict(self, name, size):
+        s = self.stages[name]
+        return s["a"] * float(size) ** s["b"]
+
+    def nodes(self, edges):
+        """Nombre de nœuds estimé pour edges arcs (None sans nodes_fit)."""
+        if self.nodes_fit is None:
+            return None
+        return self.nodes_fit["a"] * float(edges) ** self.nodes_fit["b"]
+
+    def runs(self, name, edges, nodes=None):
+        """
+        False si la garde de l'étape ne la lancerait pas pour ce graphe
+        (nodes réel, ou estimé depuis edges). Sans garde ou sans estimation
+        possible, l'étape est supposée lancée.
+        """
+        limit = self.stages[name].get("max_nodes")
+        if limit is None:
+            return True
+        if nodes is None:
+            nodes = self.nodes(edges)
+        return nodes is None or nodes <= limit
+
+    def project(self, edges):
+        """
+        Pic projeté de chaque étape pour un graphe d'environ edges arcs.
+        Une étape que sa garde ne lancerait pas a runs=False et pas de
+        projection (elle ne pèse rien à cette taille).
+        """
+        rows = []
+        for name, s in self.stages.items():
+            size = edges
+            if s["driver"] == "json_bytes":
+                if self.json_fit is None:
+                    continue
+                size = self.json_fit["a"] * edges ** self.json_fit["b"]
+            runs = self.runs(name, edges)
+            rows.append({"stage": name, "size": size, "exponent": s["b"], "runs": runs,
+                         "projected_bytes": self.predict(name, size) if runs else None})
+        return pd.DataFrame(rows)
+
+    def save(self, path):
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump({"stages": self.stages, "json_fit": self.json_fit,
+                       "nodes_fit": self.nodes_fit}, f, indent=2)
+
+    @classmethod
+    def load(cls, path):
+        with open(path, encoding="utf-8") as f:
+            data = json.load(f)
+        return cls(data["stages"], data.get("json_fit"), data.get("nodes_fit"))
+
+
+def scaling_profile(sizes, runs=20, layout_max_nodes=LAYOUT_MAX_NODES, seed=0):
+    """Profils des étapes sur des datasets synthétiques d'environ sizes arcs."""
+    frames = []
+    for n_edges in sizes:
+        commits, issues, comments, stars = generate_github_data(**sizes_for_edges(int(n_edges)), seed=seed)
+        with tempfile.TemporaryDirectory() as tmp:
+            write_dataset(tmp, commits, issues, comments, stars)
+            del commits, issues, comments, stars
+            profiler = MemoryProfiler()
+            edges, nodes = profile_pipeline(tmp, profiler, runs, layout_max_nodes)
+        df = profiler.report()
+        df["edges"] = edges
+        df["nodes"] = nodes
+        frames.append(df)
+        print(f"  {edges:>10,} arcs : pic max {format_bytes(df['peak_bytes'].max())}")
+    return pd.concat(frames, ignore_index=True)
+
+
+# ============================================================
+# MAIN
+# ============================================================
+
+def main():
+    parser = argparse.ArgumentParser(description="Profil mémoire des étapes du pipeline")
+    parser.add_argument("--data", help="dataset à profiler")
+    parser.add_argument("--scaling", nargs="+", type=float, help="tailles synthétiques (arcs) à profiler")
+    parser.add_argument("--target", type=float, help="projection pour ce nombre d'arcs")
+    parser.add_argument("--budget", help="budget mémoire (ex : 4GB) : arrêt avant l'étape qui le dépasserait")
+    parser.add_argument("--model", default=MODEL_FILE, help="modèle d'échelle (JSON) lu ou écrit")
+    parser.add_argument("--runs", type=int, default=100, help="runs IC + LT de l'étape de simulation")
+    parser.add_argument("--layout-max-nodes", type=int, default=LAYOUT_MAX_NODES)
+    args = parser.parse_args()
+
+    model = None
+    if args.scaling:
+        print(f"=== Profils synthétiques : {len(args.scaling)} tailles ===")
+        model = ScalingModel.fit(scaling_profile(args.scaling, args.runs, args.layout_max_nodes),
+                                 max_nodes={"spring_layout": args.layout_max_nodes})
+        model.save(args.model)
+        print(f"✔ Modèle d'échelle → {args.model}")
+    elif os.path.exists(args.model):
+        model = ScalingModel.load(args.model)
+
+    if args.target:
+        if model is None:
+            parser.error("--target demande un modèle (--scaling ou --model existant)")
+        df = model.project(args.target)
+        print(f"\n=== Projection pour {args.target:,.0f} arcs ===")
+        print(df.assign(
+            size=df["size"].map("{:,.0f}".format),
+            exponent=df["exponent"].round(2),
+            projected_bytes=[format_bytes(v) if runs else "— (garde : non lancée)"
+                             for v, runs in zip(df["projected_bytes"], df["runs"])]
+        ).drop(columns="runs").to_string(index=False))
+
+    if args.data:
+        budget = parse_bytes(args.budget) if args.budget else None
+        if budget is not None and model is None:
+            print("⚠ Pas de modèle d'échelle : le budget ne peut pas être vérifié avant les étapes.")
+        profiler = MemoryProfiler(budget, model)
+        print(f"\n=== Profil de {args.data} ===")
+        try:
+            profile_pipeline(args.data, profiler, args.runs, args.layout_max_nodes)
+        except MemoryBudgetExceeded as e:
+            print_report(profiler.report())
+            raise SystemExit(f"✖ Budget mémoire dépassé — {e}")
+        print_report(profiler.report())
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,431 @@
+# mmap_graph.py
+#
+# Graphe hors mémoire pour les réseaux plus gros que la RAM :
+#
+#   python3 code/mmap_graph.py ../data_github ../graph_mmap --pagerank
+#
+# Les tableaux CSR (offsets, voisins sortants et entrants) et les
+# attributs sont des fichiers binaires bruts ouverts en np.memmap ; seuls
+# les tableaux de taille n (index des labels, degrés, état des
+# simulations) sont chargés en mémoire. Le graphe est construit sans
+# NetworkX, par un tri externe des arcs :
+#   passe 1 : les arcs, produits par blocs depuis le dataset, sont répartis
+#             dans des fichiers de seau selon leur source
+#   passe 2 : chaque seau est trié et dédoublonné en mémoire, puis écrit à
+#             la suite du fichier des voisins (écriture séquentielle)
+# Les arcs entrants sont obtenus de la même façon, en relisant les arcs
+# sortants dans l'ordre.
+#
+# Contenu du dossier : meta.json, index.npz (labels), indptr.bin,
+# indices.bin, in_indptr.bin, in_indices.bin, attr_<nom>.bin.
+
+import argparse
+import json
+import shutil
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from compiled_graph import compile_edges
+from data_loader import load_dataset
+from node_index import NodeIndex
+
+ARRAYS = {"indptr": "int64", "indices": "int32", "in_indptr": "int64", "in_indices": "int32"}
+CHUNK_EDGES = 1 << 22       # arcs par bloc (32 Mo de clés int64)
+MAX_BUCKETS = 512           # fichiers de seau ouverts simultanément
+
+
+# ============================================================
+# GRAPHE SUR DISQUE
+# ============================================================
+
+class MmapGraph:
+    """
+    Graphe CSR en lecture seule dont les arcs restent sur disque.
+
+    Mêmes attributs que CompiledGraph (index, indptr, indices, in_indptr,
+    in_indices, degree(), ids(), labels()…) : les moteurs de csr_models
+    l'acceptent tel quel. Ils développent des frontières triées, donc
+    lisent les voisins par positions croissantes.
+    """
+
+    def __init__(self, path):
+        self.path = Path(path)
+        with open(self.path / "meta.json", encoding="utf-8") as f:
+            self.meta = json.load(f)
+        self.index = NodeIndex.load(self.path / "index.npz")
+        for name, dtype in ARRAYS.items():
+            setattr(self, name, self._open(name, dtype))
+        self._out_degree = self._in_degree = None
+
+    # un worker reçoit le chemin et rouvre les fichiers (pas de copie des arcs)
+    def __getstate__(self):
+        return {"path": str(self.path)}
+
+    def __setstate__(self, state):
+        self.__init__(state["path"])
+
+    def _open(self, name, dtype):
+        path = self.path / f"{name}.bin"
+        if path.stat().st_size == 0:
+            return np.empty(0, dtype=dtype)
+        return np.memmap(path, dtype=dtype, mode="r")
+
+    @property
+    def n_nodes(self):
+        return len(self.index)
+
+    @property
+    def n_edges(self):
+        return len(self.indices)
+
+    @property
+    def nodes(self):
+        return self.index.labels(np.arange(self.n_nodes))
+
+    @property
+    def kind(self):
+        return self.index.kind
+
+    # degrés calculés une fois (taille n) : LT les relit à chaque run
+    def out_degree(self):
+        if self._out_degree is None:
+            self._out_degree = np.diff(self.indptr)
+        return self._out_degree
+
+    def in_degree(self):
+        if self._in_degree is None:
+            self._in_degree = np.diff(self.in_indptr)
+        return self._in_degree
+
+    def degree(self):
+        return self.out_degree() + self.in_degree()
+
+    def edge_sources(self):
+        """Source de chaque arc (tableau complet en mémoire : préférer iter_edges)."""
+        return np.repeat(np.arange(self.n_nodes, dtype=np.int32), self.out_degree())
+
+    def node_ranges(self, chunk_edges=CHUNK_EDGES, incoming=False):
+        """Plages de nœuds [lo, hi) portant chacune environ chunk_edges arcs."""
+        return _node_ranges(self.in_indptr if incoming else self.indptr, chunk_edges)
+
+    def iter_edges(self, chunk_edges=CHUNK_EDGES, incoming=False):
+        """
+        Arcs (src, dst) par blocs, lus séquentiellement. Avec incoming, les
+        blocs suivent les arcs entrants (triés par destination).
+        """
+        if incoming:
+            for dst, src in _iter_csr(self.in_indptr, self.in_indices, chunk_edges):
+                yield src, dst
+        else:
+            yield from _iter_csr(self.indptr, self.indices, chunk_edges)
+
+    def subgraph(self, ids, chunk_edges=CHUNK_EDGES):
+        """
+        Sous-graphe induit par ids (triés), chargé en mémoire (CompiledGraph) :
+        ex. la partie atteignable depuis les seeds (graph_reduction).
+        """
+        ids = np.asarray(ids, dtype=np.int64)
+        remap = np.full(self.n_nodes, -1, dtype=np.int64)
+        remap[ids] = np.arange(len(ids))
+        src, dst = [], []
+        for s, d in self.iter_edges(chunk_edges):
+            s, d = remap[s], remap[d]
+            keep = (s >= 0) & (d >= 0)
+            src.append(s[keep])
+            dst.append(d[keep])
+        return compile_edges(
+            self.index.take(ids),
+            np.concatenate(src or [np.empty(0, np.int64)]),
+            np.concatenate(dst or [np.empty(0, np.int64)])
+        )
+
+    def ids(self, labels):
+        return self.index.ids(labels)
+
+    def labels(self, ids):
+        return self.index.labels(ids)
+
+    # ----------------------------
+    # Attributs (nœuds ou arcs)
+    # ----------------------------
+    def write_attribute(self, name, values, dtype=None):
+        """
+        Enregistre un attribut aligné sur les ids (taille n) ou sur indices
+        (taille m) : tableau complet ou itérable de blocs écrits à la suite.
+        """
+        blocks = [values] if isinstance(values, np.ndarray) else values
+        length = 0
+        with open(self.path / f"attr_{name}.bin", "wb") as f:
+            for block in blocks:
+                block = np.asarray(block, dtype=dtype)
+                dtype = block.dtype
+                block.tofile(f)
+                length += block.size
+        if length not in (self.n_nodes, self.n_edges):
+            raise ValueError(f"L'attribut {name} doit avoir {self.n_nodes} ou {self.n_edges} valeurs")
+
+        self.meta.setdefault("attributes", {})[name] = {"dtype": np.dtype(dtype).str, "length": length}
+        _write_meta(self.path, self.meta)
+
+    def attribute(self, name):
+        spec = self.meta.get("attributes", {}).get(name)
+        if spec is None:
+            raise KeyError(name)
+        if spec["length"] == 0:
+            return np.empty(0, dtype=spec["dtype"])
+        return np.memmap(self.path / f"attr_{name}.bin", dtype=spec["dtype"], mode="r")
+
+
+def _node_ranges(indptr, chunk_edges):
+    n = len(indptr) - 1
+    lo = 0
+    while lo < n:
+        hi = int(np.searchsorted(indptr, indptr[lo] + chunk_edges, side="right")) - 1
+        hi = min(max(hi, lo + 1), n)
+        yield lo, hi
+        lo = hi
+
+
+def _iter_csr(indptr, indices, chunk_edges):
+    """Blocs (propriétaire, voisin) d'un CSR, dans l'ordre du fichier."""
+    for lo, hi in _node_ranges(indptr, chunk_edges):
+        counts = np.diff(indptr[lo:hi + 1])
+        owner = np.repeat(np.arange(lo, hi, dtype=np.int32), counts)
+        yield owner, np.asarray(indices[indptr[lo]:indptr[hi]])
+
+
+def _write_meta(path, meta):
+    tmp = Path(path) / "meta.json.tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(meta, f, indent=2)
+    tmp.replace(Path(path) / "meta.json")
+
+
+# ============================================================
+# CONSTRUCTION PAR TRI EXTERNE
+# ============================================================
+
+def _bucket_sort(edge_chunks, n, path, name, n_buckets):
+    """
+    Écrit <name>indptr.bin et <name>indices.bin depuis des blocs d'arcs
+    (src, dst) quelconques : tri par source puis destination, doublons
+    supprimés. La mémoire utilisée est celle d'un bloc ou d'un seau.
+    Renvoie le nombre d'arcs écrits.
+    """
+    width = max(-(-n // n_buckets), 1)             # nœuds par seau
+    n_buckets = max(-(-n // width), 1)
+    tmp = path / f"_{name}buckets"
+    tmp.mkdir(exist_ok=True)
+
+    # passe 1 : répartition des clés src * n + dst dans les seaux
+    files = [open(tmp / f"{b}.bin", "wb") for b in range(n_buckets)]
+    try:
+        for src, dst in edge_chunks:
+            src = np.asarray(src, dtype=np.int64)
+            keys = src * n + np.asarray(dst, dtype=np.int64)
+            bucket = src // width
+            order = np.argsort(bucket, kind="stable")
+            keys = keys[order]
+            bounds = np.searchsorted(bucket[order], np.arange(n_buckets + 1))
+            for b in np.flatnonzero(np.diff(bounds)):
+                keys[bounds[b]:bounds[b + 1]].tofile(files[b])
+    finally:
+        for f in files:
+            f.close()
+
+    # passe 2 : tri et dédoublonnage de chaque seau, écriture séquentielle
+    indptr = np.memmap(path / f"{name}indptr.bin", dtype=np.int64, mode="w+", shape=(n + 1,))
+    indptr[0] = 0
+    m = 0
+    with open(path / f"{name}indices.bin", "wb") as out:
+        for b in range(n_buckets):
+            keys = np.fromfile(tmp / f"{b}.bin", dtype=np.int64)
+            keys.sort()                         # tri + comparaison voisine : plus rapide que np.unique
+            if keys.size:
+                keys = keys[np.concatenate([[True], keys[1:] != keys[:-1]])]
+            lo, hi = b * width, min((b + 1) * width, n)
+            counts = np.bincount(keys // n - lo, minlength=hi - lo)
+            indptr[lo + 1:hi + 1] = m + np.cumsum(counts)
+            (keys % n).astype(np.int32).tofile(out)
+            m += keys.size
+    indptr.flush()
+    del indptr
+
+    shutil.rmtree(tmp)
+    return m
+
+
+def write_mmap_graph(index, edge_chunks, path, n_buckets=64):
+    """
+    Construit un MmapGraph dans path à partir d'un NodeIndex et d'un
+    itérable de blocs d'arcs (src, dst) en ids.
+    """
+    path = Path(path)
+    path.mkdir(parents=True, exist_ok=True)
+    (path / "meta.json").unlink(missing_ok=True)    # graphe incomplet tant que meta.json manque
+
+    n = len(index)
+    n_buckets = min(max(n_buckets, 1), MAX_BUCKETS)
+    index.save(path / "index.npz")
+
+    m = _bucket_sort(edge_chunks, n, path, "", n_buckets)
+
+    # arcs entrants : relecture séquentielle des arcs sortants, inversés
+    indptr = np.memmap(path / "indptr.bin", dtype=np.int64, mode="r")
+    indices = np.memmap(path / "indices.bin", dtype=np.int32, mode="r") if m else np.empty(0, np.int32)
+    _bucket_sort(((dst, src) for src, dst in _iter_csr(indptr, indices, CHUNK_EDGES)),
+                 n, path, "in_", n_buckets)
+    del indptr, indices
+
+    _write_meta(path, {"n_nodes": n, "n_edges": m, "arrays": ARRAYS, "attributes": {}})
+    return MmapGraph(path)
+
+
+def save_compiled(cg, path, n_buckets=64):
+    """Copie sur disque d'un CompiledGraph déjà en mémoire."""
+    return write_mmap_graph(cg.index, [(cg.edge_sources(), cg.indices)], path, n_buckets)
+
+
+# ----------------------------
+# Arcs du graphe GitHub, sans NetworkX
+# ----------------------------
+def _authors(df):
+    if "author" not in df.columns:
+        return []
+    return pd.unique(df["author"].dropna()).tolist()
+
+
+def github_node_labels(commits, issues, comments, stars):
+    """Nœuds de build_github_graph : auteurs, issues commentées, repo_starred."""
+    labels = set(_authors(commits)) | set(_authors(issues)) | set(_authors(comments)) | set(_authors(stars))
+    if len(comments) and "author" in comments.columns:
+        commented = comments.dropna(subset=["author", "issue_number"])
+        labels |= set(int(v) for v in pd.unique(commented["issue_number"]))
+    if _authors(stars):
+        labels.add("repo_starred")
+    return labels
+
+
+def github_edge_chunks(index, commits, issues, comments, stars, chunk_edges=CHUNK_EDGES):
+    """
+    Arcs de build_github_graph par blocs d'environ chunk_edges, en ids :
+    auteur d'issue → auteur de commit (tous les couples distincts),
+    commentateur → issue, stargazer → repo_starred.
+    Les doublons sont laissés au tri externe.
+    """
+    issue_authors = index.ids(_authors(issues))
+    commit_authors = index.ids(_authors(commits))
+    if issue_authors.size and commit_authors.size:
+        per = max(chunk_edges // commit_authors.size, 1)
+        for i in range(0, issue_authors.size, per):
+            block = issue_authors[i:i + per]
+            src = np.repeat(block, commit_authors.size)
+            dst = np.tile(commit_authors, block.size)
+            keep = src != dst
+            yield src[keep], dst[keep]
+
+    if len(comments) and "author" in comments.columns:
+        commented = comments.dropna(subset=["author", "issue_number"])
+        for i in range(0, len(commented), chunk_edges):
+            part = commented.iloc[i:i + chunk_edges]
+            yield index.ids(part["author"]), index.ids(int(v) for v in part["issue_number"])
+
+    stargazers = stars["author"].dropna().tolist() if "author" in stars.columns else []
+    if stargazers:
+        repo = index.id_of("repo_starred")
+        for i in range(0, len(stargazers), chunk_edges):
+            src = index.ids(stargazers[i:i + chunk_edges])
+            yield src, np.full(src.size, repo, dtype=np.int32)
+
+
+def build_mmap_graph(data_dir, path, n_buckets=None, chunk_edges=CHUNK_EDGES):
+    """
+    Graphe hors mémoire d'un dataset scrapé, avec les mêmes nœuds et arcs
+    que build_github_graph. Par défaut, un seau par bloc d'arcs estimé.
+    """
+    commits, issues, comments, stars = load_dataset(data_dir)
+    index = NodeIndex.from_labels(github_node_labels(commits, issues, comments, stars))
+
+    if n_buckets is None:
+        estimate = len(_authors(issues)) * len(_authors(commits)) + len(comments) + len(stars)
+        n_buckets = -(-estimate // chunk_edges)
+
+    chunks = github_edge_chunks(index, commits, issues, comments, stars, chunk_edges)
+    return write_mmap_graph(index, chunks, path, n_buckets)
+
+
+# ============================================================
+# CENTRALITÉS PAR BLOCS
+# ============================================================
+
+def degree_centrality(g):
+    """Comme nx.degree_centrality : degré total / (n - 1), aligné sur les ids."""
+    return g.degree() / max(g.n_nodes - 1, 1)
+
+
+def pagerank(g, alpha=0.85, max_iter=100, tol=1e-6, chunk_edges=CHUNK_EDGES):
+    """
+    PageRank (mêmes conventions que nx.pagerank : nœuds sans successeur
+    redistribués uniformément). Chaque itération lit les arcs entrants une
+    fois, dans l'ordre ; mémoire O(n).
+    """
+    n = g.n_nodes
+    if n == 0:
+        return np.empty(0)
+
+    out_degree = g.out_degree()
+    dangling = out_degree == 0
+    inv_degree = np.where(dangling, 0.0, 1.0 / np.maximum(out_degree, 1))
+    ranges = list(g.node_ranges(chunk_edges, incoming=True))
+
+    x = np.full(n, 1.0 / n)
+    for _ in range(max_iter):
+        share = x * inv_degree
+        new = np.empty(n)
+        for lo, hi in ranges:
+            a, b = g.in_indptr[lo], g.in_indptr[hi]
+            counts = np.diff(g.in_indptr[lo:hi + 1])
+            target = np.repeat(np.arange(hi - lo), counts)
+            new[lo:hi] = np.bincount(target, weights=share[g.in_indices[a:b]], minlength=hi - lo)
+
+        new = alpha * (new + x[dangling].sum() / n) + (1 - alpha) / n
+        err = np.abs(new - x).sum()
+        x = new
+        if err < n * tol:
+            return x
+
+    raise RuntimeError(f"PageRank n'a pas convergé en {max_iter} itérations")
+
+
+# ============================================================
+# MAIN
+# ============================================================
+
+def main():
+    parser = argparse.ArgumentParser(description="Construction d'un graphe hors mémoire (np.memmap)")
+    parser.add_argument("data_dir", help="dossier du dataset scrapé")
+    parser.add_argument("output", help="dossier du graphe sur disque")
+    parser.add_argument("--buckets", type=int, help="nombre de seaux du tri externe")
+    parser.add_argument("--pagerank", action="store_true", help="calculer le PageRank par blocs")
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    g = build_mmap_graph(args.data_dir, args.output, args.buckets)
+    print(f"✔ Graphe hors mémoire : {g.n_nodes} nœuds / {g.n_edges} arcs "
+          f"en {time.perf_counter() - start:.1f}s → {args.output}")
+
+    if args.pagerank:
+        start = time.perf_counter()
+        pr = pagerank(g)
+        g.write_attribute("pagerank", pr)
+        top = np.argsort(-pr, kind="stable")[:10]
+        print(f"\n=== PageRank ({time.perf_counter() - start:.1f}s) ===")
+        for node, score in zip(g.labels(top), pr[top]):
+            print(f"  {node!s:<30} {score:.5f}")
+
+
+if __name__ == "__main__":
+    main()
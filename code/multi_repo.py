@@ -0,0 +1,250 @@
+# multi_repo.py
+#
+# Mode multi-repos : chaque repo a son propre dossier de données
+# (data_github/<owner>__<repo>/), les graphes sont chargés et construits
+# en parallèle (un processus par repo) puis fusionnés en un seul graphe :
+#
+#   python3 code/multi_repo.py pallets/flask django/django --workers 2
+#
+# Les développeurs communs à plusieurs repos sont un seul nœud (table
+# d'ids partagée) ; issues et repos sont préfixés par le nom du repo
+# ("owner/repo#123", "owner/repo"). Chaque arc porte le masque des repos
+# où il apparaît, ce qui permet de simuler sur le réseau combiné et de
+# retrouver l'origine des activations.
+
+import argparse
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+
+import networkx as nx
+import numpy as np
+import pandas as pd
+
+from compiled_graph import compile_edges, compile_graph
+from data_loader import DATASET_FILES, load_dataset
+from graph_builder import build_github_graph
+from node_index import ISSUE, USER, NodeIndex
+
+DATA_ROOT = "../data_github"
+
+
+# ============================================================
+# DONNÉES PAR REPO
+# ============================================================
+
+def repo_data_dir(repo_name, root=DATA_ROOT):
+    """Dossier des données d'un repo : <root>/<owner>__<repo>."""
+    return Path(root) / repo_name.replace("/", "__")
+
+
+def scrape_repos(repo_names, root=DATA_ROOT):
+    """Scrape chaque repo dans son propre dossier (séquentiel : quota de l'API GitHub)."""
+    from plugins import plugin
+
+    for name in repo_names:
+        plugin("scraper")(name, repo_data_dir(name, root))
+
+
+def namespace_labels(G, repo_name):
+    """Préfixe les issues ("owner/repo#123") et le nœud "repo_starred" ("owner/repo")."""
+    mapping = {}
+    for v in G.nodes():
+        if isinstance(v, (int, np.integer)):
+            mapping[v] = f"{repo_name}#{v}"
+        elif v == "repo_starred":
+            mapping[v] = repo_name
+    return nx.relabel_nodes(G, mapping)
+
+
+def build_repo_graph(repo_name, data_dir):
+    """Charge, construit et compile le graphe d'un repo (exécuté dans un worker)."""
+    data_dir = Path(data_dir)
+    if not any((data_dir / f).exists() for f in DATASET_FILES):
+        raise FileNotFoundError(f"Aucune donnée pour {repo_name} dans {data_dir}")
+
+    start = time.perf_counter()
+    commits, issues, comments, stars = load_dataset(data_dir)
+    G = namespace_labels(build_github_graph(commits, issues, comments, stars), repo_name)
+    return repo_name, compile_graph(G), time.perf_counter() - start
+
+
+# ============================================================
+# GRAPHE FUSIONNÉ
+# ============================================================
+
+def _tag_dtype(n_repos):
+    for dtype in (np.uint8, np.uint16, np.uint32, np.uint64):
+        if n_repos <= np.iinfo(dtype).bits:
+            return dtype
+    raise ValueError(f"Au plus 64 repos par graphe fusionné ({n_repos} demandés)")
+
+
+@dataclass
+class MergedGraph:
+    """
+    Graphe combiné de plusieurs repos.
+
+    cg         : CompiledGraph fusionné (ids partagés entre repos)
+    repos      : noms des repos ; le repo r correspond au bit 1 << r
+    edge_repos : masque des repos de chaque arc, aligné sur cg.indices
+    node_repos : masque des repos où chaque nœud apparaît
+    """
+    cg: object
+    repos: list
+    edge_repos: np.ndarray
+    node_repos: np.ndarray
+
+    def repo_bit(self, repo_name):
+        return self.edge_repos.dtype.type(1 << self.repos.index(repo_name))
+
+    def edge_mask(self, repo_name):
+        """Arcs présents dans le repo donné (booléens alignés sur cg.indices)."""
+        return (self.edge_repos & self.repo_bit(repo_name)) != 0
+
+    def repo_subgraph(self, repo_name):
+        """Arcs d'un seul repo, sur les ids du graphe fusionné (résultats comparables)."""
+        keep = self.edge_mask(repo_name)
+        return compile_edges(self.cg.index, self.cg.edge_sources()[keep], self.cg.indices[keep])
+
+    def repo_counts(self, masks):
+        """Nombre de repos de chaque masque."""
+        return sum(((masks >> r) & 1).astype(np.int64) for r in range(len(self.repos)))
+
+    def developers(self):
+        """Table des développeurs : id partagé, login et repos où ils apparaissent."""
+        ids = np.flatnonzero(self.cg.kind == USER)
+        masks = self.node_repos[ids]
+        return pd.DataFrame({
+            "id": ids,
+            "login": self.cg.labels(ids),
+            "n_repos": self.repo_counts(masks),
+            "repos": [
+                ";".join(name for r, name in enumerate(self.repos) if int(m) >> r & 1)
+                for m in masks
+            ]
+        })
+
+    def summary(self):
+        """Une ligne par repo : nœuds, arcs, arcs exclusifs, développeurs partagés."""
+        shared_users = (self.cg.kind == USER) & (self.repo_counts(self.node_repos) > 1)
+        rows = []
+        for name in self.repos:
+            bit = self.repo_bit(name)
+            in_repo = (self.node_repos & bit) != 0
+            edges = self.edge_mask(name)
+            rows.append({
+                "repo": name,
+                "users": int((in_repo & (self.cg.kind == USER)).sum()),
+                "issues": int((in_repo & (self.cg.kind == ISSUE)).sum()),
+                "edges": int(edges.sum()),
+                "exclusive_edges": int((self.edge_repos == bit).sum()),
+                "shared_users": int((in_repo & shared_users).sum())
+            })
+        return pd.DataFrame(rows)
+
+    def to_networkx(self):
+        """DiGraph NetworkX (modèles Python, visualisations) ; attribut d'arc "repos"."""
+        G = nx.DiGraph()
+        labels = self.cg.nodes
+        G.add_nodes_from(labels)
+        names = np.array(self.repos, dtype=object)
+        for u, v, m in zip(self.cg.edge_sources(), self.cg.indices, self.edge_repos):
+            bits = [(int(m) >> r) & 1 for r in range(len(self.repos))]
+            G.add_edge(labels[u], labels[v], repos=tuple(names[np.flatnonzero(bits)]))
+        return G
+
+
+def merge_graphs(graphs):
+    """
+    Fusionne des graphes compilés {nom du repo: CompiledGraph} (labels
+    déjà préfixés). Un arc présent dans plusieurs repos n'est gardé qu'une
+    fois, avec l'union de leurs bits.
+    """
+    names = list(graphs)
+    dtype = _tag_dtype(len(names))
+    index, remaps = NodeIndex.merge([cg.index for cg in graphs.values()])
+    n = len(index)
+
+    keys, tags = [], []
+    node_repos = np.zeros(n, dtype=dtype)
+    for r, (cg, remap) in enumerate(zip(graphs.values(), remaps)):
+        bit = dtype(1 << r)
+        node_repos[remap] |= bit
+        keys.append(remap[cg.edge_sources()] * n + remap[cg.indices])
+        tags.append(np.full(cg.n_edges, bit, dtype=dtype))
+
+    keys = np.concatenate(keys) if keys else np.empty(0, dtype=np.int64)
+    tags = np.concatenate(tags) if tags else np.empty(0, dtype=dtype)
+    order = np.argsort(keys, kind="stable")
+    keys, tags = keys[order], tags[order]
+
+    # arcs triés par (source, destination) : compile_edges garde cet ordre,
+    # edge_repos reste donc aligné sur cg.indices
+    first = np.flatnonzero(np.concatenate([[True], keys[1:] != keys[:-1]])) if keys.size else keys
+    edge_repos = np.bitwise_or.reduceat(tags, first) if keys.size else tags
+    keys = keys[first]
+
+    cg = compile_edges(index, keys // max(n, 1), keys % max(n, 1))
+    return MergedGraph(cg, names, edge_repos, node_repos)
+
+
+def build_merged_graph(repos, root=DATA_ROOT, workers=None):
+    """
+    Construit le graphe fusionné de plusieurs repos, un processus par repo.
+
+    repos : noms "owner/repo" (données dans repo_data_dir) ou dicts
+            {"name", "data_dir"} comme dans les configurations de batch_runner
+    """
+    repos = [
+        r if isinstance(r, dict) else {"name": r, "data_dir": str(repo_data_dir(r, root))}
+        for r in repos
+    ]
+    workers = min(workers or os.cpu_count(), len(repos))
+    args = ([r["name"] for r in repos], [r["data_dir"] for r in repos])
+
+    start = time.perf_counter()
+    if workers <= 1:
+        results = list(map(build_repo_graph, *args))
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            results = list(pool.map(build_repo_graph, *args))
+
+    for name, cg, seconds in results:
+        print(f"  {name:<32} {cg.n_nodes:>8} nœuds {cg.n_edges:>9} arcs  ({seconds:.1f}s)")
+
+    merged = merge_graphs({name: cg for name, cg, _ in results})
+    print(f"→ Graphe fusionné : {merged.cg.n_nodes} nœuds / {merged.cg.n_edges} arcs "
+          f"({time.perf_counter() - start:.1f}s, {workers} worker(s))")
+    return merged
+
+
+# ============================================================
+# MAIN
+# ============================================================
+
+def main():
+    parser = argparse.ArgumentParser(description="Graphe fusionné de plusieurs repos GitHub")
+    parser.add_argument("repos", nargs="+", help="repos owner/repo")
+    parser.add_argument("--data", default=DATA_ROOT, help="dossier racine des données")
+    parser.add_argument("--workers", type=int, help="nombre de processus")
+    parser.add_argument("--scrape", action="store_true", help="scraper les repos avant la construction")
+    parser.add_argument("--developers", help="fichier CSV de la table des développeurs")
+    args = parser.parse_args()
+
+    if args.scrape:
+        scrape_repos(args.repos, args.data)
+
+    merged = build_merged_graph(args.repos, args.data, args.workers)
+    print()
+    print(merged.summary().to_string(index=False))
+
+    if args.developers:
+        merged.developers().to_csv(args.developers, index=False)
+        print(f"\n✔ Table des développeurs → {args.developers}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,193 @@
+# node_index.py
+
+import hashlib
+import numbers
+
+import numpy as np
+
+
+# -------------------------------------------------------------
+# Types de nœuds du graphe GitHub
+# -------------------------------------------------------------
+USER, ISSUE, REPO = 0, 1, 2
+KIND_NAMES = ("user", "issue", "repo")
+
+
+def node_kind(label):
+    """
+    Type d'un nœud de build_github_graph :
+    login (str) → USER, numéro d'issue (int) → ISSUE, "repo_starred" → REPO.
+    Un numéro d'issue lu en float par pandas (1.0, colonne avec des NaN)
+    est accepté s'il est entier.
+
+    Dans un graphe multi-repos (cf. multi_repo), issues et repos sont
+    préfixés par le nom du repo : "owner/repo#123" → ISSUE, "owner/repo" → REPO
+    (un login GitHub ne contient ni "/" ni "#").
+    """
+    if isinstance(label, numbers.Integral):
+        return ISSUE
+    if isinstance(label, numbers.Real) and float(label).is_integer():
+        return ISSUE
+    if isinstance(label, str):
+        if "#" in label:
+            return ISSUE
+        return REPO if label == "repo_starred" or "/" in label else USER
+    raise TypeError(f"Label de nœud non supporté : {label!r}")
+
+
+# -------------------------------------------------------------
+# Index compact label ↔ id
+# -------------------------------------------------------------
+class NodeIndex:
+    """
+    Internement des nœuds en ids denses int32.
+
+    Les ids sont attribués par blocs de type [users | issues | repos],
+    triés dans chaque bloc. Les labels sont stockés dans des tableaux
+    compacts (octets UTF-8 pour les labels texte, int64 pour les numéros
+    d'issue) et retrouvés par recherche dichotomique : aucun dict Python.
+
+    kind : type de chaque id (uint8, USER / ISSUE / REPO)
+    """
+
+    def __init__(self, keys):
+        # keys[k] : tableau trié des labels encodés du type k
+        self._keys = keys
+        sizes = [len(k) for k in keys]
+        self._offsets = np.concatenate([[0], np.cumsum(sizes)]).astype(np.int64)
+        self.kind = np.repeat(np.arange(len(keys), dtype=np.uint8), sizes)
+
+    @staticmethod
+    def _encode(kind, labels):
+        # numéros d'issue en int64 ; issues préfixées ("owner/repo#123"),
+        # logins et repos en octets
+        if kind == ISSUE and (not labels or not isinstance(labels[0], str)):
+            return np.array(labels, dtype=np.int64)
+        return np.array([v.encode("utf-8") for v in labels], dtype=np.bytes_)
+
+    @classmethod
+    def from_labels(cls, labels):
+        labels = list(labels)
+        kinds = np.fromiter((node_kind(v) for v in labels), dtype=np.uint8, count=len(labels))
+        keys = []
+        for k in range(len(KIND_NAMES)):
+            sel = [labels[i] for i in np.flatnonzero(kinds == k)]
+            keys.append(np.unique(cls._encode(k, sel)))
+        return cls(keys)
+
+    @classmethod
+    def merge(cls, indexes):
+        """
+        Union de plusieurs index (un label commun → un seul id).
+        Renvoie (index, remaps) : remaps[i][j] est l'id global de l'id j de indexes[i].
+        """
+        keys = []
+        for k in range(len(KIND_NAMES)):
+            parts = [idx._keys[k] for idx in indexes if len(idx._keys[k])]
+            if len(parts) > 1 and len({p.dtype.kind for p in parts}) > 1:
+                raise TypeError(f"Labels {KIND_NAMES[k]} de types incompatibles entre les index")
+            keys.append(np.unique(np.concatenate(parts)) if parts else indexes[0]._keys[k])
+        merged = cls(keys)
+
+        remaps = []
+        for idx in indexes:
+            remap = np.empty(len(idx), dtype=np.int64)
+            for k in range(len(KIND_NAMES)):
+                local = idx._keys[k]
+                start = idx._offsets[k]
+                remap[start:start + len(local)] = (
+                    merged._offsets[k] + np.searchsorted(merged._keys[k], local)
+                )
+            remaps.append(remap)
+        return merged, remaps
+
+    def __len__(self):
+        return int(self._offsets[-1])
+
+    def kind_counts(self):
+        return {name: len(k) for name, k in zip(KIND_NAMES, self._keys)}
+
+    def take(self, ids):
+        """Sous-index restreint aux ids donnés (triés) : le nouvel id i correspond à ids[i]."""
+        ids = np.asarray(ids, dtype=np.int64)
+        kinds = self.kind[ids]
+        return NodeIndex([
+            self._keys[k][ids[kinds == k] - self._offsets[k]] for k in range(len(self._keys))
+        ])
+
+    def save(self, path):
+        """Sauvegarde les labels (un tableau par type) dans un .npz."""
+        np.savez(path, **{name: k for name, k in zip(KIND_NAMES, self._keys)})
+
+    @classmethod
+    def load(cls, path):
+        with np.load(path) as f:
+            return cls([f[name] for name in KIND_NAMES])
+
+    def digest(self):
+        """Empreinte SHA-256 des labels (identique pour deux index égaux)."""
+        h = hashlib.sha256()
+        for k in self._keys:
+            h.update(f"{k.dtype.str}:{len(k)};".encode())
+            h.update(np.ascontiguousarray(k).tobytes())
+        return h.hexdigest()
+
+    def nbytes(self):
+        """Mémoire occupée par l'index (octets)."""
+        return sum(k.nbytes for k in self._keys) + self.kind.nbytes + self._offsets.nbytes
+
+    # ----------------------------
+    # label → id
+    # ----------------------------
+    def ids(self, labels):
+        labels = list(labels)
+        kinds = np.fromiter((node_kind(v) for v in labels), dtype=np.uint8, count=len(labels))
+        out = np.empty(len(labels), dtype=np.int32)
+
+        for k in np.unique(kinds):
+            mask = kinds == k
+            keys = self._encode(k, [labels[i] for i in np.flatnonzero(mask)])
+            if keys.dtype.kind != self._keys[k].dtype.kind:
+                raise KeyError(labels[np.flatnonzero(mask)[0]])
+            pos = np.searchsorted(self._keys[k], keys)
+            found = pos < len(self._keys[k])
+            found[found] = self._keys[k][pos[found]] == keys[found]
+            if not found.all():
+                missing = keys[~found][0]
+                raise KeyError(missing.decode() if isinstance(missing, bytes) else int(missing))
+            out[mask] = self._offsets[k] + pos
+
+        return out
+
+    def id_of(self, label):
+        return int(self.ids([label])[0])
+
+    # ----------------------------
+    # id → label
+    # ----------------------------
+    def labels(self, ids):
+        ids = np.asarray(ids, dtype=np.int64)
+        kinds = self.kind[ids]
+        out = [None] * len(ids)
+
+        for k in np.unique(kinds):
+            where = np.flatnonzero(kinds == k)
+            values = self._keys[k][ids[where] - self._offsets[k]]
+            if values.dtype.kind == "S":
+                values = [v.decode("utf-8") for v in values]
+            else:
+                values = values.tolist()
+            for i, v in zip(where, values):
+                out[i] = v
+
+        return out
+
+    def label(self, i):
+        return self.labels([i])[0]
+
+    def to_labels(self, df, columns):
+        """Copie de df où les colonnes d'ids listées sont traduites en labels."""
+        df = df.copy()
+        for col in columns:
+            df[col] = self.labels(df[col].to_numpy())
+        return df
@@ -0,0 +1,145 @@
+# pipeline.py
+
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+import pandas as pd
+
+
+# =====================================================================
+# Pipeline d'artefacts (DAG)
+#
+# Chaque artefact est une fonction de ses dépendances, déclarée une fois
+# et calculée à la demande : run(targets) ne calcule que les artefacts
+# nécessaires, chacun une seule fois (les valeurs restent en cache pour
+# les appels suivants), et soumet à un pool de threads tous ceux dont les
+# dépendances sont prêtes.
+#
+# Les threads partagent les objets (graphe, store) sans copie, mais le
+# GIL sérialise le code Python pur : deux artefacts ne se recouvrent que
+# pendant les E/S (lecture/écriture du cache) et les calculs NumPy qui
+# relâchent le GIL. Des simulations NetworkX ne vont pas plus vite avec
+# plus de workers ; le gain vient surtout des artefacts partagés, calculés
+# une seule fois. Pour du calcul Python lourd, passer par un pool de
+# processus (cf. batch_runner) avec des arguments sérialisables.
+# =====================================================================
+
+class Pipeline:
+    """
+    DAG d'artefacts calculés paresseusement.
+
+        pipeline = Pipeline(workers=4)
+        pipeline.add("degree", lambda: dict(G.degree()))
+        pipeline.add("top", lambda degree: top_influencers(G, degree=degree), deps=["degree"])
+        pipeline.run(["top"])["top"]
+    """
+
+    def __init__(self, workers=None):
+        self.workers = workers
+        self.artifacts = {}
+        self.values = {}
+        self.timings = {}
+        self._origin = None
+        self._lock = threading.Lock()
+
+    def add(self, name, fn, deps=()):
+        """Déclare l'artefact name = fn(*valeurs des deps)."""
+        if name in self.artifacts:
+            raise ValueError(f"Artefact déjà déclaré : {name}")
+        self.artifacts[name] = (fn, list(deps))
+        return self
+
+    def artifact(self, name, deps=()):
+        """Décorateur équivalent à add."""
+        def register(fn):
+            self.add(name, fn, deps)
+            return fn
+        return register
+
+    # ----------------------------
+    # Ordonnancement
+    # ----------------------------
+    def _needed(self, targets):
+        """Artefacts à calculer pour targets, dépendances comprises (cycle → ValueError)."""
+        needed, visiting = [], set()
+
+        def visit(name):
+            if name in needed or name in self.values:
+                return
+            if name not in self.artifacts:
+                raise KeyError(f"Artefact inconnu : {name}")
+            if name in visiting:
+                raise ValueError(f"Cycle dans le pipeline autour de {name}")
+            visiting.add(name)
+            for dep in self.artifacts[name][1]:
+                visit(dep)
+            visiting.discard(name)
+            needed.append(name)
+
+        for name in targets:
+            visit(name)
+        return needed
+
+    def _compute(self, name):
+        fn, deps = self.artifacts[name]
+        start = time.perf_counter()
+        value = fn(*[self.values[d] for d in deps])
+        end = time.perf_counter()
+        with self._lock:
+            self.timings[name] = {
+                "artifact": name,
+                "deps": ", ".join(deps),
+                "start": start - self._origin,
+                "seconds": end - start,
+                "thread": threading.current_thread().name
+            }
+        return value
+
+    def run(self, targets=None):
+        """
+        Calcule targets (par défaut : tous les artefacts) et renvoie
+        {nom: valeur}. Une erreur annule les artefacts non commencés et
+        est relancée une fois les artefacts en cours terminés.
+        """
+        targets = list(self.artifacts) if targets is None else list(targets)
+        todo = self._needed(targets)
+        self._origin = self._origin or time.perf_counter()
+
+        with ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="artefact") as pool:
+            running = {}
+            while todo or running:
+                for name in [n for n in todo if all(d in self.values for d in self.artifacts[n][1])]:
+                    todo.remove(name)
+                    running[pool.submit(self._compute, name)] = name
+
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    name = running.pop(future)
+                    try:
+                        self.values[name] = future.result()
+                    except Exception:
+                        todo.clear()
+                        wait(running)
+                        raise
+
+        return {name: self.values[name] for name in targets}
+
+    def __getitem__(self, name):
+        return self.run([name])[name]
+
+    # ----------------------------
+    # Rapport
+    # ----------------------------
+    def report(self):
+        """Temps par artefact (début relatif au premier run, durée, thread)."""
+        df = pd.DataFrame(list(self.timings.values()),
+                          columns=["artifact", "deps", "start", "seconds", "thread"])
+        return df.sort_values("start").reset_index(drop=True)
+
+    def print_report(self):
+        df = self.report()
+        total = (df["start"] + df["seconds"]).max() if len(df) else 0.0
+        print(f"\n=== Pipeline : {len(df)} artefacts en {total:.2f}s "
+              f"(somme des durées {df['seconds'].sum():.2f}s) ===")
+        print(df.round({"start": 3, "seconds": 3}).to_string(index=False))
@@ -0,0 +1,75 @@
+# plugins.py
+
+import importlib
+
+
+# =====================================================================
+# Registre de plugins chargés à la demande
+#
+# Les backends de visualisation (matplotlib, Plotly, Gephi), le scraper
+# (PyGithub) et les analyses sont déclarés ici par leur chemin
+# "module:attribut" ; le module n'est importé qu'au premier appel de
+# plugin(). Un run sans scraping ni graphique ne charge donc aucune de
+# ces bibliothèques lourdes (cf. benchmarks/startup_time.py).
+# =====================================================================
+
+PLUGINS = {
+    # scraping
+    "scraper": "github_scraper:scrape_github",
+
+    # visualisation du graphe
+    "show_graph_simple": "graph_builder:show_graph_simple",
+    "show_graph_plotly": "graph_builder:show_graph_plotly",
+    "export_graph_gephi": "graph_builder:export_graph_gephi",
+
+    # visualisation des cascades
+    "visualize_ic_matplotlib": "ic_model:visualize_ic_matplotlib",
+    "visualize_ic_plotly": "ic_model:visualize_ic_plotly",
+    "animate_ic_plotly": "ic_model:animate_ic_plotly",
+    "visualize_lt_matplotlib": "lt_model:visualize_lt_matplotlib",
+    "visualize_lt_plotly": "lt_model:visualize_lt_plotly",
+
+    # analyses
+    "configure_experiment": "analysis.config_menu:configure_experiment",
+    "compare_ic_lt": "analysis.ic_vs_lt:compare_ic_lt",
+    "plot_ic_lt_comparison": "analysis.ic_vs_lt:plot_ic_lt_comparison",
+    "top_influencers": "analysis.influence_analysis:top_influencers",
+    "structure_vs_diffusion": "analysis.influence_analysis:structure_vs_diffusion",
+    "plot_structure_vs_diffusion": "analysis.influence_analysis:plot_structure_vs_diffusion",
+    "sensitivity_ic": "analysis.sensitivity_analysis:sensitivity_ic",
+    "sensitivity_lt": "analysis.sensitivity_analysis:sensitivity_lt",
+    "plot_sensitivity": "analysis.sensitivity_analysis:plot_sensitivity",
+    "community_analysis": "analysis.community_analysis:community_analysis",
+    "plot_community_flows": "analysis.community_analysis:plot_community_flows"
+}
+
+_LOADED = {}
+
+
+def register(name, target):
+    """
+    Déclare (ou remplace) un plugin : target est un chemin "module:attribut"
+    ou directement l'objet appelable.
+    """
+    _LOADED.pop(name, None)
+    if callable(target):
+        _LOADED[name] = target
+    PLUGINS[name] = target
+
+
+def plugin(name):
+    """Objet du plugin name, importé au premier appel puis mis en cache."""
+    if name in _LOADED:
+        return _LOADED[name]
+    if name not in PLUGINS:
+        raise KeyError(f"Plugin inconnu : {name} (disponibles : {', '.join(sorted(PLUGINS))})")
+
+    module_name, attr = PLUGINS[name].split(":")
+    obj = getattr(importlib.import_module(module_name), attr)
+    _LOADED[name] = obj
+    return obj
+
+
+def loaded():
+    """Noms des plugins déjà chargés."""
+    return sorted(_LOADED)
@@ -0,0 +1,160 @@
+# reachability_sketches.py
+
+import json
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from edge_weights import edge_positions
+from kernels import sketch_sweep
+from node_index import NodeIndex
+
+
+# =====================================================================
+# Esquisses de joignabilité bottom-k (Cohen et al.) pour le modèle IC
+#
+# La diffusion IC d'un seed s est le nombre moyen de nœuds joignables
+# depuis s dans un graphe « arcs vivants » (chaque arc gardé avec sa
+# probabilité). On tire `instances` graphes vivants une fois pour toutes
+# (un bit par instance et par arc) et on donne un rang aléatoire à chaque
+# paire (nœud, instance). L'esquisse de s garde les k plus petits rangs
+# des paires joignables depuis s, toutes instances confondues :
+#
+#   diffusion(s) ≈ (k - 1) / τ_k / instances     (τ_k : k-ième rang, dans ]0, 1])
+#
+# exacte quand s atteint moins de k paires. Écart relatif ≈ 1 / √(k - 2).
+#
+# Les esquisses de tous les nœuds se construisent en un seul balayage
+# par rangs croissants (parcours arrière élagués) : chaque paire reçoit au
+# plus k rangs, d'où un coût total O(k · instances · arcs). Elles tiennent
+# dans n × k entiers et donnent ensuite la diffusion estimée de chaque
+# nœud, ou d'un ensemble de seeds (union des esquisses), sans simulation.
+# =====================================================================
+
+K = 64
+INSTANCES = 32          # au plus 64 (un bit par instance dans un uint64)
+
+
+def live_edge_masks(cg, p=0.1, instances=INSTANCES, rng=None):
+    """
+    Masques des arcs vivants (uint64, alignés sur cg.indices) : le bit i
+    de l'arc e vaut 1 avec la probabilité p (scalaire ou tableau par arc,
+    cf. edge_weights.ic_probabilities).
+    """
+    if not 1 <= instances <= 64:
+        raise ValueError(f"instances doit être entre 1 et 64 ({instances} demandées)")
+    rng = rng if rng is not None else np.random.default_rng()
+    live = np.zeros(cg.n_edges, dtype=np.uint64)
+    for i in range(instances):
+        live |= (rng.random(cg.n_edges) < p).astype(np.uint64) << np.uint64(i)
+    return live
+
+
+class ReachabilitySketches:
+    """
+    Esquisses bottom-k combinées de tous les nœuds d'un graphe compilé.
+
+    sketch    : (n, k) int32, rangs croissants (positions dans la permutation
+                des n × instances paires) ; seules les size[v] premières
+                colonnes de la ligne v sont valides
+    size      : nombre de rangs de chaque esquisse (≤ k)
+    """
+
+    def __init__(self, index, sketch, size, k, instances, meta=None):
+        self.index = index
+        self.sketch = sketch
+        self.size = size
+        self.k = k
+        self.instances = instances
+        self.meta = meta or {}
+
+    @property
+    def n_pairs(self):
+        return len(self.index) * self.instances
+
+    def nbytes(self):
+        return self.sketch.nbytes + self.size.nbytes
+
+    # ----------------------------
+    # Estimations
+    # ----------------------------
+    def _estimate(self, size, kth):
+        # rang j (position 0-based parmi N paires) ≈ (j + 1) / (N + 1)
+        tau = (kth + 1) / (self.n_pairs + 1)
+        return np.where(size >= self.k, (self.k - 1) / tau, size) / self.instances
+
+    def estimate(self):
+        """Diffusion IC estimée de chaque nœud pris comme seed unique."""
+        kth = self.sketch[:, self.k - 1].astype(np.float64)
+        values = self._estimate(self.size, kth)
+        return pd.Series(values, index=self.index.labels(np.arange(len(self.index))),
+                         name="spread_estimate")
+
+    def spread(self, seeds):
+        """Diffusion IC estimée d'un ensemble de seeds (union de leurs esquisses)."""
+        ids = self.index.ids(seeds)
+        ranks = np.unique(np.concatenate(
+            [self.sketch[v, :self.size[v]] for v in ids] or [np.empty(0, dtype=np.int32)]
+        ))[:self.k]
+        kth = float(ranks[-1]) if ranks.size else 0.0
+        return float(self._estimate(np.array(ranks.size), kth))
+
+    def top(self, n=10):
+        """Les n nœuds de plus forte diffusion estimée."""
+        return self.estimate().sort_values(ascending=False).head(n)
+
+    # ----------------------------
+    # Sauvegarde
+    # ----------------------------
+    def save(self, path):
+        """Dossier <path> : esquisses (sketches.npz), labels (index.npz) et paramètres."""
+        path = Path(path)
+        path.mkdir(parents=True, exist_ok=True)
+        np.savez(path / "sketches.npz", sketch=self.sketch, size=self.size)
+        self.index.save(path / "index.npz")
+        with open(path / "meta.json", "w", encoding="utf-8") as f:
+            json.dump({**self.meta, "k": self.k, "instances": self.instances}, f, indent=2)
+
+    @classmethod
+    def load(cls, path):
+        path = Path(path)
+        with open(path / "meta.json", encoding="utf-8") as f:
+            meta = json.load(f)
+        with np.load(path / "sketches.npz") as f:
+            sketch, size = f["sketch"], f["size"]
+        return cls(NodeIndex.load(path / "index.npz"), sketch, size,
+                   meta.pop("k"), meta.pop("instances"), meta)
+
+
+def build_sketches(cg, p=0.1, k=K, instances=INSTANCES, rng=None):
+    """
+    Construit les esquisses de tous les nœuds de cg (CompiledGraph) pour
+    le modèle IC de probabilité p (scalaire ou tableau par arc).
+    """
+    if not 2 <= k <= 255:
+        raise ValueError(f"k doit être entre 2 et 255 ({k} demandé)")
+    rng = rng if rng is not None else np.random.default_rng()
+    start = time.perf_counter()
+    n = cg.n_nodes
+
+    live = live_edge_masks(cg, p, instances, rng)
+    owner = np.repeat(np.arange(n, dtype=np.int64), cg.in_degree())
+    in_live = live[edge_positions(cg, cg.in_indices, owner)]
+    order = rng.permutation(n * instances).astype(np.int64)
+
+    sketch = np.full((n, k), np.iinfo(np.int32).max, dtype=np.int32)
+    size = np.zeros(n, dtype=np.int32)
+    count = np.zeros(n * instances, dtype=np.uint8)
+    mark = np.full(n * instances, -1, dtype=np.int32)
+    stack = np.empty(max(n, 1), dtype=np.int64)
+
+    sketch_sweep(np.asarray(cg.in_indptr), np.asarray(cg.in_indices), in_live, order,
+                 k, sketch, size, count, mark, stack)
+
+    meta = {
+        "p": p if np.isscalar(p) else "per_edge",
+        "seconds": round(time.perf_counter() - start, 3)
+    }
+    return ReachabilitySketches(cg.index, sketch, size, k, instances, meta)
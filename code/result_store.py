@@ -0,0 +1,214 @@
+# result_store.py
+
+import hashlib
+import json
+import os
+import random
+import threading
+import weakref
+from pathlib import Path
+
+import pandas as pd
+
+from compiled_graph import graph_fingerprint
+from ic_model import independent_cascade
+from lt_model import linear_threshold
+
+
+DEFAULT_STORE_DIR = str(Path(__file__).resolve().parent.parent / ".cache" / "results")
+DEFAULT_MAX_BYTES = 512 * 1024 ** 2     # budget disque : 512 Mo
+
+
+# =====================================================================
+# 💾 1. STORE PERSISTANT
+# =====================================================================
+
+class ResultStore:
+    """
+    Cache disque de DataFrames de résultats.
+
+    Clé : (empreinte du graphe, modèle, paramètres, seeds, graine RNG, runs).
+    Chaque entrée est un pickle pandas ; les entrées les moins récemment
+    utilisées sont supprimées quand le budget disque est dépassé.
+    Par défaut, le cache est sous <dépôt>/.cache/results, quel que soit le
+    répertoire courant.
+    """
+
+    def __init__(self, directory=DEFAULT_STORE_DIR, max_bytes=DEFAULT_MAX_BYTES):
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.max_bytes = max_bytes
+        self._fingerprints = weakref.WeakKeyDictionary()    # G → ((V, E), empreinte)
+        self._bytes = None          # taille totale des entrées, mesurée au premier put
+        self._lock = threading.Lock()
+
+    # ----------------------------
+    # Clés
+    # ----------------------------
+    def fingerprint(self, G, refresh=False):
+        """
+        Empreinte de G, mémoïsée par objet graphe (référence faible : une
+        entrée disparaît avec son graphe, pas de confusion sur un id réutilisé).
+        L'empreinte est recalculée si le nombre de nœuds ou d'arcs a changé,
+        ou avec refresh=True après une modification qui les conserve
+        (attributs, arcs remplacés). Une empreinte déjà calculée (str) est
+        renvoyée telle quelle.
+        """
+        if isinstance(G, str):
+            return G
+        shape = (G.number_of_nodes(), G.number_of_edges())
+        with self._lock:
+            memo = self._fingerprints.get(G)
+        if memo is not None and memo[0] == shape and not refresh:
+            return memo[1]
+        fingerprint = graph_fingerprint(G)
+        with self._lock:
+            self._fingerprints[G] = (shape, fingerprint)
+        return fingerprint
+
+    def key(self, G, model, params=None, seeds=(), rng_seed=None, runs=None):
+        """Clé d'une entrée ; G : graphe ou son empreinte (fingerprint)."""
+        payload = json.dumps({
+            "graph": self.fingerprint(G),
+            "model": model,
+            "params": params or {},
+            "seeds": [repr(s) for s in seeds],
+            "rng_seed": rng_seed,
+            "runs": runs
+        }, sort_keys=True, default=repr)
+        return hashlib.sha256(payload.encode()).hexdigest()
+
+    def _path(self, key):
+        return self.directory / f"{key}.pkl"
+
+    # ----------------------------
+    # Lecture / écriture
+    # ----------------------------
+    def get(self, key):
+        path = self._path(key)
+        try:
+            os.utime(path)      # marque l'entrée comme récemment utilisée
+            return pd.read_pickle(path)
+        except FileNotFoundError:   # absente, ou évincée entre-temps par un autre thread
+            return None
+
+    def put(self, key, df):
+        # écriture atomique : un autre thread (cf. pipeline) ne lit jamais
+        # une entrée à moitié écrite
+        path = self._path(key)
+        tmp = path.with_suffix(f".{os.getpid()}.{threading.get_ident()}.tmp")
+        df.to_pickle(tmp)
+        size = tmp.stat().st_size
+        try:
+            replaced = path.stat().st_size
+        except FileNotFoundError:
+            replaced = 0
+        os.replace(tmp, path)
+
+        # taille suivie incrémentalement : le répertoire n'est parcouru qu'au
+        # premier put et quand le budget est dépassé
+        with self._lock:
+            if self._bytes is not None:
+                self._bytes += size - replaced
+            over = self._bytes is None or self._bytes > self.max_bytes
+        if over:
+            self.evict()
+
+    def cached(self, key, compute):
+        """Renvoie l'entrée key, ou la calcule avec compute() et la stocke."""
+        df = self.get(key)
+        if df is None:
+            df = compute()
+            self.put(key, df)
+        return df
+
+    # ----------------------------
+    # Éviction (LRU sous budget disque)
+    # ----------------------------
+    def size(self):
+        return sum(p.stat().st_size for p in self.directory.glob("*.pkl"))
+
+    def evict(self):
+        """
+        Supprime les entrées les moins récemment utilisées jusqu'à repasser
+        sous max_bytes, et remet à jour la taille suivie par put (qui dérive
+        si d'autres processus écrivent dans le même répertoire).
+        """
+        entries = []
+        for p in self.directory.glob("*.pkl"):
+            try:
+                stat = p.stat()
+            except FileNotFoundError:       # supprimée entre-temps par un autre thread
+                continue
+            entries.append((stat.st_mtime, stat.st_size, p))
+        entries.sort()
+
+        total = sum(size for _, size, _ in entries)
+        for _, size, path in entries:
+            if total <= self.max_bytes:
+                break
+            path.unlink(missing_ok=True)
+            total -= size
+        with self._lock:
+            self._bytes = total
+
+    def clear(self):
+        for p in self.directory.glob("*.pkl"):
+            p.unlink()
+        with self._lock:
+            self._bytes = 0
+
+
+# =====================================================================
+# 🎲 2. MONTE CARLO MÉMOÏSÉ
+# =====================================================================
+
+def _run(G, model, seeds, rng, params):
+    if model == "IC":
+        activated, steps = independent_cascade(G, seeds[0], params.get("p", 0.1), rng=rng)
+        return {"activated_nodes": len(activated), "steps": len(steps)}
+
+    activated, steps, thresholds, _ = linear_threshold(
+        G, seeds, params.get("fixed_threshold"), rng=rng
+    )
+    return {"activated_nodes": len(activated), "steps": len(steps),
+            "seed_thresholds": [thresholds[s] for s in seeds]}
+
+
+def monte_carlo(G, model, seeds, runs=1, rng_seed=None, store=None, fingerprint=None, **params):
+    """
+    Exécute runs simulations IC ou LT et renvoie un DataFrame (une ligne par run).
+
+    Avec rng_seed, le run i utilise le générateur random.Random(f"{rng_seed}:{i}") :
+    les runs déjà présents dans le store sont réutilisés et seuls les runs
+    manquants sont simulés quand on en demande davantage.
+    Sans rng_seed, les résultats ne sont pas reproductibles et ne sont pas cachés.
+    fingerprint : empreinte de G déjà calculée (évite de la recalculer pour la clé).
+    """
+    seeds = list(seeds)
+    columns = ["run", "activated_nodes", "steps"]
+    if model == "LT":
+        columns.append("seed_thresholds")     # seuils tirés des seeds, dans leur ordre
+
+    def simulate(start, stop):
+        rows = []
+        for i in range(start, stop):
+            rng = None if rng_seed is None else random.Random(f"{rng_seed}:{i}")
+            rows.append({"run": i, **_run(G, model, seeds, rng, params)})
+        return pd.DataFrame(rows, columns=columns)
+
+    if store is None or rng_seed is None:
+        return simulate(0, runs)
+
+    # Le nombre de runs ne fait pas partie de la clé : une seule entrée par
+    # configuration, complétée au fil des demandes.
+    key = store.key(fingerprint or G, f"monte_carlo_{model}", params, seeds, rng_seed)
+    df = store.get(key)
+    if df is None or not set(columns) <= set(df.columns):     # absente ou d'un ancien format
+        df = simulate(0, runs)
+        store.put(key, df)
+    elif len(df) < runs:
+        df = pd.concat([df, simulate(len(df), runs)], ignore_index=True)
+        store.put(key, df)
+
+    return df.iloc[:runs].reset_index(drop=True)
@@ -0,0 +1,119 @@
+# result_writer.py
+
+import io
+import os
+import time
+from pathlib import Path
+
+import pandas as pd
+
+
+# =====================================================================
+# Écriture en flux des résultats de balayages
+#
+# Les lignes sont mises en tampon (au plus buffer_rows) puis ajoutées en
+# fin de fichier CSV. Le vidage est piloté par les écritures : il n'y a pas
+# de minuterie, flush_seconds n'est vérifié qu'à chaque write(). Si aucune
+# ligne n'arrive, le tampon attend le write() suivant, flush() ou close().
+# Le fichier n'est jamais réécrit : si le balayage s'interrompt, seules
+# les lignes du dernier tampon sont perdues, et read_partial relit le
+# fichier pendant que le balayage tourne encore.
+# =====================================================================
+
+class StreamingResultWriter:
+    """
+    Écrivain CSV en ajout seul.
+
+    columns : ordre des colonnes (par défaut : clés de la première ligne,
+              ou en-tête du fichier existant en mode append) ; une ligne
+              avec une clé hors de columns lève ValueError, une clé
+              absente donne une cellule vide
+    flush_seconds : âge maximal du tampon, vérifié à chaque write()
+    append  : False pour repartir d'un fichier vide
+    fsync   : force l'écriture sur disque à chaque vidage
+    """
+
+    def __init__(self, path, columns=None, buffer_rows=1000, flush_seconds=5.0,
+                 append=True, fsync=False):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.buffer_rows = buffer_rows
+        self.flush_seconds = flush_seconds
+        self.fsync = fsync
+        self.rows_written = 0
+
+        self._buffer = []
+        self._last_flush = time.monotonic()
+
+        if not append and self.path.exists():
+            self.path.unlink()
+        if columns is None and self.path.exists() and self.path.stat().st_size:
+            columns = list(pd.read_csv(self.path, nrows=0).columns)
+        self.columns = list(columns) if columns is not None else None
+
+    def write(self, row):
+        """
+        Ajoute une ligne (dict) ; vide le tampon s'il est plein ou si le
+        vidage précédent date de plus de flush_seconds.
+        """
+        if self.columns is None:
+            self.columns = list(row)
+        unknown = set(row).difference(self.columns)
+        if unknown:
+            raise ValueError(f"Colonnes inconnues pour {self.path.name} : {sorted(map(str, unknown))} "
+                             f"(colonnes : {self.columns})")
+        self._buffer.append(row)
+        if (len(self._buffer) >= self.buffer_rows
+                or time.monotonic() - self._last_flush >= self.flush_seconds):
+            self.flush()
+
+    def write_frame(self, df):
+        for row in df.to_dict("records"):
+            self.write(row)
+
+    def flush(self):
+        self._last_flush = time.monotonic()
+        if not self._buffer:
+            return
+
+        header = not self.path.exists() or self.path.stat().st_size == 0
+        with open(self.path, "a", encoding="utf-8", newline="") as f:
+            pd.DataFrame(self._buffer, columns=self.columns).to_csv(f, header=header, index=False)
+            f.flush()
+            if self.fsync:
+                os.fsync(f.fileno())
+
+        self.rows_written += len(self._buffer)
+        self._buffer = []
+
+    def close(self):
+        self.flush()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def read_partial(path):
+    """
+    Relit un fichier en cours d'écriture. Une dernière ligne incomplète
+    (vidage en cours) est ignorée ; fichier absent → DataFrame vide.
+    """
+    path = Path(path)
+    if not path.exists():
+        return pd.DataFrame()
+
+    text = path.read_text(encoding="utf-8")
+    text = text[:text.rfind("\n") + 1]
+    if not text:
+        return pd.DataFrame()
+    return pd.read_csv(io.StringIO(text))
+
+
+def stream_rows(rows, writer):
+    """Écrit les lignes d'un itérable au fil de l'eau, puis vide le tampon."""
+    for row in rows:
+        writer.write(row)
+    writer.flush()
@@ -0,0 +1,418 @@
+# service.py
+#
+# Service HTTP/JSON local : le graphe est chargé et compilé une seule fois,
+# puis les requêtes sont servies à chaud.
+#
+#   python3 code/service.py --data ../data_github --port 8765
+#
+#   curl -s localhost:8765/seeds -d '{"strategy": "degree", "k": 5}'
+#   curl -s localhost:8765/spread -d '{"model": "IC", "seeds": ["alice"], "p": 0.1, "runs": 200}'
+#   curl -s "localhost:8765/centrality?measure=betweenness&k=10"
+#   curl -s localhost:8765/sensitivity -d '{"model": "LT", "seeds": ["alice"], "values": [0.1, 0.3]}'
+#
+# Les simulations tournent dans un pool de processus (la boucle asyncio
+# reste disponible) ; les requêtes /spread concurrentes sont regroupées en
+# lots envoyés aux workers en une fois.
+
+import argparse
+import asyncio
+import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from urllib.parse import parse_qs, urlsplit
+
+import networkx as nx
+import numpy as np
+
+from cascade_traces import CascadeStats
+from compiled_graph import compile_graph
+from csr_models import independent_cascade_csr, linear_threshold_csr
+from data_loader import load_dataset
+from graph_builder import build_github_graph
+from spread_estimators import ic_influence_bound
+
+
+DEFAULT_PORT = 8765
+BATCH_WINDOW = 0.005        # secondes d'attente pour compléter un lot
+MAX_BATCH = 64
+MAX_RUNS = 100_000
+MAX_STEPS = 1000
+
+
+# ============================================================
+# CÔTÉ WORKER
+# ============================================================
+
+_STATE = {}
+
+
+def _init_worker(G, cg):
+    """Chaque worker reçoit le graphe (NetworkX et compilé) une seule fois."""
+    _STATE["G"] = G
+    _STATE["cg"] = cg
+
+
+def simulate_batch(specs):
+    """
+    Exécute un lot de requêtes /spread ; une ligne de résultats par spec.
+    Une spec en erreur donne {"error": ...} sans faire échouer les autres.
+    """
+    results = []
+    for spec in specs:
+        try:
+            results.append(simulate_spec(spec))
+        except Exception as exc:
+            results.append({"error": repr(exc)})
+    return results
+
+
+def simulate_spec(spec):
+    """Runs d'une requête /spread (spec validée par SimulationService._spec)."""
+    cg = _STATE["cg"]
+    rng = np.random.default_rng(spec["rng_seed"])
+    stats = CascadeStats(cg.n_nodes)
+    for _ in range(spec["runs"]):
+        if spec["model"] == "IC":
+            step = independent_cascade_csr(cg, spec["seed_ids"], spec["p"],
+                                           spec["max_steps"], rng)
+        else:
+            step = linear_threshold_csr(cg, spec["seed_ids"], spec["threshold"], rng)
+        stats.add(step)
+
+    mean, std = stats.spread_mean_std()
+    return {
+        "mean_activated": float(mean),
+        "std_activated": float(std),
+        "mean_steps": float(stats.depth_mean()),
+        "runs": spec["runs"]
+    }
+
+
+def influence_ranking(k, p, max_steps):
+    bound = ic_influence_bound(_STATE["cg"], p, max_steps)
+    return [[node, float(v)] for node, v in bound.nlargest(k).items()]
+
+
+def betweenness(sample):
+    G = _STATE["G"]
+    k = None if sample is None or sample >= G.number_of_nodes() else sample
+    return nx.betweenness_centrality(G, k=k, seed=0 if k else None)
+
+
+# ============================================================
+# REGROUPEMENT DES REQUÊTES
+# ============================================================
+
+class SpreadBatcher:
+    """
+    File des requêtes /spread. Une tâche de fond attend au plus
+    BATCH_WINDOW après la première requête, fusionne les requêtes
+    identiques et répartit le lot sur les workers.
+    """
+
+    def __init__(self, pool, workers):
+        self.pool = pool
+        self.workers = workers
+        self.queue = asyncio.Queue()
+        self.batches = 0
+        self._task = asyncio.create_task(self._loop())
+
+    async def submit(self, spec):
+        future = asyncio.get_running_loop().create_future()
+        await self.queue.put((spec, future))
+        return await future
+
+    async def _collect(self):
+        batch = [await self.queue.get()]
+        deadline = asyncio.get_running_loop().time() + BATCH_WINDOW
+        while len(batch) < MAX_BATCH:
+            timeout = deadline - asyncio.get_running_loop().time()
+            if timeout <= 0:
+                break
+            try:
+                batch.append(await asyncio.wait_for(self.queue.get(), timeout))
+            except asyncio.TimeoutError:
+                break
+        return batch
+
+    async def _loop(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = await self._collect()
+            self.batches += 1
+
+            # requêtes identiques avec la même graine RNG : un seul calcul
+            unique = {}
+            for i, (spec, future) in enumerate(batch):
+                key = i if spec["rng_seed"] is None else json.dumps(spec, sort_keys=True)
+                unique.setdefault(key, (spec, []))[1].append(future)
+            groups = list(unique.values())
+
+            chunks = [groups[i::self.workers] for i in range(min(self.workers, len(groups)))]
+            try:
+                results = await asyncio.gather(*[
+                    loop.run_in_executor(self.pool, simulate_batch, [s for s, _ in chunk])
+                    for chunk in chunks
+                ])
+            except Exception as exc:
+                for _, futures in groups:
+                    for f in futures:
+                        if not f.done():
+                            f.set_exception(exc)
+                continue
+
+            for chunk, chunk_results in zip(chunks, results):
+                for (_, futures), result in zip(chunk, chunk_results):
+                    for f in futures:
+                        if f.done():
+                            continue
+                        if "error" in result:       # erreur propre à cette requête
+                            f.set_exception(RuntimeError(result["error"]))
+                        else:
+                            f.set_result(result)
+
+
+# ============================================================
+# SERVICE
+# ============================================================
+
+class SimulationService:
+    """Graphe chaud + routes JSON."""
+
+    def __init__(self, data_dir, workers=None):
+        start = time.perf_counter()
+        commits, issues, comments, stars = load_dataset(data_dir)
+        self.G = build_github_graph(commits, issues, comments, stars)
+        self.cg = compile_graph(self.G)
+        self.degree = self.cg.degree()
+        self.workers = workers or os.cpu_count()
+        self.pool = ProcessPoolExecutor(
+            max_workers=self.workers, initializer=_init_worker, initargs=(self.G, self.cg)
+        )
+        self._betweenness = {}
+        self.batcher = None
+        print(f"✔ Graphe chargé : {self.cg.n_nodes} nœuds, {self.cg.n_edges} arcs "
+              f"({time.perf_counter() - start:.1f}s)")
+
+    # ----------------------------
+    # Paramètres
+    # ----------------------------
+    @staticmethod
+    def _number(body, name, cast, default, low=None, high=None):
+        """Paramètre numérique optionnel (None autorisé si default est None)."""
+        value = body.get(name, default)
+        if value is None and default is None:
+            return None
+        if isinstance(value, bool) or (cast is int and isinstance(value, float)
+                                       and not value.is_integer()):
+            raise ValueError(f"{name} doit être un {'entier' if cast is int else 'nombre'} "
+                             f"({value!r} reçu)")
+        try:
+            value = cast(value)
+        except (TypeError, ValueError, OverflowError):
+            raise ValueError(f"{name} doit être un {'entier' if cast is int else 'nombre'} "
+                             f"({value!r} reçu)") from None
+        if isinstance(value, float) and not np.isfinite(value):
+            raise ValueError(f"{name} doit être fini")
+        if low is not None and value < low:
+            raise ValueError(f"{name} doit être ≥ {low}" + (f" et ≤ {high}" if high is not None else ""))
+        if high is not None and value > high:
+            raise ValueError(f"{name} doit être ≤ {high}" + (f" et ≥ {low}" if low is not None else ""))
+        return value
+
+    @staticmethod
+    def _list(body, name):
+        """
+        Liste non vide : tableau JSON, ou texte séparé par des virgules
+        (paramètre de query string). Un texte seul n'est jamais parcouru
+        caractère par caractère.
+        """
+        value = body.get(name)
+        if isinstance(value, str):
+            value = [v.strip() for v in value.split(",") if v.strip()]
+        if not isinstance(value, list) or not value:
+            raise ValueError(f"{name} doit être une liste non vide")
+        return value
+
+    def _seed_ids(self, seeds):
+        """Ids des seeds (logins, numéros d'issue) ; "123" vaut l'issue 123 si ce n'est pas un login."""
+        ids = []
+        for label in seeds:
+            if isinstance(label, bool) or not isinstance(label, (str, int)):
+                raise ValueError(f"Seed invalide : {label!r} (login ou numéro d'issue attendu)")
+            candidates = [label] + ([int(label)] if isinstance(label, str) and label.isdigit() else [])
+            for candidate in candidates:
+                try:
+                    ids.append(int(self.cg.ids([candidate])[0]))
+                    break
+                except KeyError:
+                    continue
+            else:
+                raise ValueError(f"Nœud inconnu : {label!r}")
+        return ids
+
+    def _spec(self, body, **override):
+        body = {**body, **override}
+        model = body.get("model", "IC")
+        if model not in ("IC", "LT"):
+            raise ValueError("model doit valoir IC ou LT")
+        seed_ids = self._seed_ids(self._list(body, "seeds"))
+        runs = self._number(body, "runs", int, 100, 1, MAX_RUNS)
+
+        return {
+            "model": model,
+            "seed_ids": seed_ids,
+            "p": self._number(body, "p", float, 0.1, 0.0, 1.0),
+            "threshold": self._number(body, "threshold", float, None, 0.0, 1.0),
+            "runs": runs,
+            "max_steps": self._number(body, "max_steps", int, 20, 1, MAX_STEPS),
+            "rng_seed": self._number(body, "rng_seed", int, None, 0)
+        }
+
+    # ----------------------------
+    # Routes
+    # ----------------------------
+    async def spread(self, body):
+        return await self.batcher.submit(self._spec(body))
+
+    async def seeds(self, body):
+        k = self._number(body, "k", int, 5, 1, max(self.cg.n_nodes, 1))
+        strategy = body.get("strategy", "degree")
+
+        if strategy == "degree":
+            ids = np.argsort(-self.degree, kind="stable")[:k]
+            return {"strategy": strategy, "seeds": self.cg.labels(ids)}
+        if strategy == "random":
+            rng = np.random.default_rng(self._number(body, "rng_seed", int, None, 0))
+            ids = np.sort(rng.choice(self.cg.n_nodes, size=k, replace=False))
+            return {"strategy": strategy, "seeds": self.cg.labels(ids)}
+        if strategy == "ic_bound":
+            ranking = await asyncio.get_running_loop().run_in_executor(
+                self.pool, influence_ranking, k,
+                self._number(body, "p", float, 0.1, 0.0, 1.0),
+                self._number(body, "max_steps", int, 20, 1, MAX_STEPS)
+            )
+            return {"strategy": strategy, "seeds": [n for n, _ in ranking],
+                    "scores": [s for _, s in ranking]}
+        raise ValueError(f"Stratégie de seeds inconnue : {strategy}")
+
+    async def centrality(self, body):
+        k = self._number(body, "k", int, 10, 1, max(self.cg.n_nodes, 1))
+        measure = body.get("measure", "degree")
+
+        if measure == "degree":
+            ids = np.argsort(-self.degree, kind="stable")[:k]
+            return {"measure": measure,
+                    "top": [[n, int(d)] for n, d in zip(self.cg.labels(ids), self.degree[ids])]}
+        if measure == "betweenness":
+            sample = self._number(body, "sample", int, None, 1)
+            if sample not in self._betweenness:
+                self._betweenness[sample] = await asyncio.get_running_loop().run_in_executor(
+                    self.pool, betweenness, sample
+                )
+            values = self._betweenness[sample]
+            top = sorted(values.items(), key=lambda x: x[1], reverse=True)[:k]
+            return {"measure": measure, "top": [[n, round(v, 6)] for n, v in top]}
+        raise ValueError(f"Mesure de centralité inconnue : {measure}")
+
+    async def sensitivity(self, body):
+        """Une requête /spread par valeur de p (IC) ou de seuil (LT), lancées ensemble."""
+        values = self._list(body, "values")
+        key = "p" if body.get("model", "IC") == "IC" else "threshold"
+        specs = [self._spec(body, **{key: v}) for v in values]
+        results = await asyncio.gather(*[self.batcher.submit(s) for s in specs])
+        return {"parameter": key,
+                "rows": [{"value": v, **r} for v, r in zip(values, results)]}
+
+    async def health(self, body):
+        return {"status": "ok", "nodes": self.cg.n_nodes, "edges": self.cg.n_edges,
+                "workers": self.workers, "batches": self.batcher.batches}
+
+    # ----------------------------
+    # HTTP
+    # ----------------------------
+    ROUTES = {
+        "/spread": "spread",
+        "/seeds": "seeds",
+        "/centrality": "centrality",
+        "/sensitivity": "sensitivity",
+        "/health": "health"
+    }
+
+    async def handle(self, reader, writer):
+        try:
+            request_line = await reader.readline()
+            if not request_line:
+                return
+            method, target, _ = request_line.decode("latin-1").split(" ", 2)
+
+            headers = {}
+            while True:
+                line = await reader.readline()
+                if line in (b"\r\n", b"\n", b""):
+                    break
+                name, _, value = line.decode("latin-1").partition(":")
+                headers[name.strip().lower()] = value.strip()
+
+            raw = await reader.readexactly(int(headers.get("content-length", 0)))
+            url = urlsplit(target)
+            body = {k: v[-1] for k, v in parse_qs(url.query).items()}
+            if raw:
+                body.update(json.loads(raw))
+
+            route = self.ROUTES.get(url.path)
+            if route is None:
+                status, payload = 404, {"error": f"Route inconnue : {url.path}"}
+            else:
+                status, payload = 200, await getattr(self, route)(body)
+
+        except (ValueError, KeyError, TypeError) as exc:
+            status, payload = 400, {"error": str(exc)}
+        except Exception as exc:
+            status, payload = 500, {"error": repr(exc)}
+
+        data = json.dumps(payload, ensure_ascii=False, default=str).encode("utf-8")
+        reason = {200: "OK", 400: "Bad Request", 404: "Not Found"}.get(status, "Error")
+        writer.write(
+            f"HTTP/1.1 {status} {reason}\r\n"
+            f"Content-Type: application/json; charset=utf-8\r\n"
+            f"Content-Length: {len(data)}\r\n"
+            f"Connection: close\r\n\r\n".encode("latin-1") + data
+        )
+        try:
+            await writer.drain()
+        finally:
+            writer.close()
+
+    async def serve(self, host="127.0.0.1", port=DEFAULT_PORT):
+        self.batcher = SpreadBatcher(self.pool, self.workers)
+        server = await asyncio.start_server(self.handle, host, port)
+        print(f"✔ Service prêt sur http://{host}:{port}")
+        async with server:
+            await server.serve_forever()
+
+
+# ============================================================
+# MAIN
+# ============================================================
+
+def main():
+    parser = argparse.ArgumentParser(description="Service de simulation IC / LT (graphe en mémoire)")
+    parser.add_argument("--data", default="../data_github", help="dossier du dataset")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument("--workers", type=int, help="processus de simulation")
+    args = parser.parse_args()
+
+    service = SimulationService(args.data, args.workers)
+    try:
+        asyncio.run(service.serve(args.host, args.port))
+    except KeyboardInterrupt:
+        print("\nArrêt du service.")
+    finally:
+        service.pool.shutdown(cancel_futures=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,207 @@
+# spread_estimators.py
+
+import numpy as np
+import pandas as pd
+
+from compiled_graph import compile_graph
+from csr_models import independent_cascade_csr, linear_threshold_csr
+
+
+# =====================================================================
+# Estimateurs analytiques de diffusion (sans Monte Carlo)
+#
+# Toutes les fonctions travaillent sur un CompiledGraph et font des
+# itérations d'algèbre linéaire creuse (bincount sur les arcs) : une
+# itération coûte O(n + m), quel que soit le nombre de seeds candidats.
+# =====================================================================
+
+def _lt_pairs(cg):
+    """
+    Paires (influenceur, cible) du modèle LT du dépôt : les voisins d'un nœud
+    sont ses prédécesseurs ET ses successeurs, chacun de poids 1 / degré.
+    La paire i et la paire i ± m sont le même arc parcouru dans les deux sens.
+    """
+    src = cg.edge_sources()
+    dst = cg.indices
+    influencer = np.concatenate([src, dst])
+    target = np.concatenate([dst, src])
+    degree = cg.degree().astype(np.float64)
+    weight = 1.0 / degree[target]
+    return influencer, target, weight
+
+
+# =====================================================================
+# 🧠 1. INDEPENDENT CASCADE
+# =====================================================================
+
+def ic_activation_probabilities(cg, seeds, p=0.1, max_steps=20):
+    """
+    Probabilité d'activation de chaque nœud (message passing).
+
+    q_t(v) = 1 - Π_{u→v} (1 - p · q_{t-1}(u))
+    Exact sur un arbre, surestime en présence de cycles (les messages
+    reviennent vers leur émetteur).
+    """
+    seed_ids = cg.ids(seeds)
+    src = cg.edge_sources()
+
+    q = np.zeros(cg.n_nodes)
+    q[seed_ids] = 1.0
+
+    with np.errstate(divide="ignore"):
+        for _ in range(max_steps):
+            log_miss = np.bincount(
+                cg.indices, weights=np.log1p(-p * q[src]), minlength=cg.n_nodes
+            )
+            q_next = -np.expm1(log_miss)
+            q_next[seed_ids] = 1.0
+            if np.allclose(q_next, q):
+                break
+            q = q_next
+
+    return pd.Series(q, index=cg.nodes, name="activation_probability")
+
+
+def ic_influence_bound(cg, p=0.1, max_steps=20):
+    """
+    Borne « linear influence » de la diffusion IC pour TOUS les nœuds seeds.
+
+    σ(s) ≤ Σ_{t ≤ max_steps} Σ_{chemins s→v de longueur t} p^t
+    (borne de l'union sur les chemins), plafonnée à n.
+    """
+    src = cg.edge_sources()
+
+    walks = np.ones(cg.n_nodes)
+    spread = np.ones(cg.n_nodes)
+
+    for _ in range(max_steps):
+        walks = p * np.bincount(src, weights=walks[cg.indices], minlength=cg.n_nodes)
+        spread += walks
+        if walks.max(initial=0.0) < 1e-9:
+            break
+
+    return pd.Series(np.minimum(spread, cg.n_nodes), index=cg.nodes, name="spread_estimate")
+
+
+# =====================================================================
+# 🧠 2. LINEAR THRESHOLD (seuils uniformes)
+# =====================================================================
+
+def lt_activation_probabilities(cg, seeds, max_steps=20):
+    """
+    Activation espérée du modèle LT à seuils uniformes (système linéaire).
+
+    a(v) = 1 pour un seed, sinon a(v) = Σ_u w(u, v) · a(u)
+    Résolu par itérations de Jacobi tronquées à max_steps. C'est la
+    probabilité qu'une marche aléatoire partant de v atteigne un seed :
+    la marche peut repasser par un nœud, d'où une surestimation.
+    """
+    seed_ids = cg.ids(seeds)
+    influencer, target, weight = _lt_pairs(cg)
+
+    a = np.zeros(cg.n_nodes)
+    a[seed_ids] = 1.0
+
+    for _ in range(max_steps):
+        a_next = np.bincount(target, weights=weight * a[influencer], minlength=cg.n_nodes)
+        a_next[seed_ids] = 1.0
+        if np.allclose(a_next, a):
+            break
+        a = a_next
+
+    return pd.Series(a, index=cg.nodes, name="activation_probability")
+
+
+def lt_influence_estimate(cg, max_steps=20):
+    """
+    Estimation de la diffusion LT pour TOUS les nœuds seeds.
+
+    Somme des poids des chemins non-rebroussants issus de s :
+    g(x→y) = w(x, y) · (1 + Σ_{z ≠ x} g(y→z)),   σ(s) = 1 + Σ_y g(s→y)
+    Interdire le retour immédiat supprime les cycles de longueur 2 que
+    crée le voisinage non orienté du modèle. Plafonnée à n.
+    """
+    influencer, target, weight = _lt_pairs(cg)
+    m = cg.n_edges
+    reverse = np.concatenate([np.arange(m, 2 * m), np.arange(m)])
+
+    g = np.zeros(2 * m)
+    for _ in range(max_steps):
+        out = np.bincount(influencer, weights=g, minlength=cg.n_nodes)
+        g_next = weight * (1.0 + out[target] - g[reverse])
+        if np.allclose(g_next, g):
+            break
+        g = g_next
+
+    spread = 1.0 + np.bincount(influencer, weights=g, minlength=cg.n_nodes)
+    return pd.Series(np.minimum(spread, cg.n_nodes), index=cg.nodes, name="spread_estimate")
+
+
+# =====================================================================
+# 📏 3. BIAIS PAR RAPPORT AU MONTE CARLO
+# =====================================================================
+
+def _simulate(cg, model, seeds, p, rng):
+    """Nœuds activés (ids) par une cascade depuis un ou plusieurs seeds."""
+    if model == "IC":
+        step = independent_cascade_csr(cg, seeds, p, rng=rng)
+    else:
+        step = linear_threshold_csr(cg, seeds, rng=rng)
+    return np.flatnonzero(step >= 0)
+
+
+def spread_bias(G, estimates, model="IC", p=0.1, candidates=None, runs=100, rng=None):
+    """
+    Compare une estimation de diffusion par nœud seed à un Monte Carlo
+    (runs simulations par candidat) sur le même graphe.
+    """
+    if candidates is None:
+        candidates = estimates.sort_values(ascending=False).index[:10]
+    cg = compile_graph(G)
+    rng = rng if rng is not None else np.random.default_rng()
+
+    rows = []
+    for s in candidates:
+        ids = cg.ids([s])
+        mc = np.mean([_simulate(cg, model, ids, p, rng).size for _ in range(runs)])
+        rows.append({
+            "node": s,
+            "model": model,
+            "estimate": estimates[s],
+            "monte_carlo": mc,
+            "bias": estimates[s] - mc,
+            "relative_bias": (estimates[s] - mc) / mc
+        })
+
+    return pd.DataFrame(rows)
+
+
+def activation_bias(G, estimates, seeds, model="IC", p=0.1, runs=100, rng=None):
+    """
+    Compare des probabilités d'activation estimées aux fréquences
+    d'activation observées sur runs simulations Monte Carlo (un ou
+    plusieurs seeds, comme les estimateurs).
+    """
+    cg = compile_graph(G)
+    rng = rng if rng is not None else np.random.default_rng()
+    ids = cg.ids(list(seeds))
+
+    counts = np.zeros(cg.n_nodes)
+    for _ in range(runs):
+        counts[_simulate(cg, model, ids, p, rng)] += 1
+
+    frequency = pd.Series(counts / runs, index=cg.nodes)
+    df = pd.DataFrame({
+        "estimate": estimates,
+        "monte_carlo": frequency.reindex(estimates.index)
+    })
+    df["bias"] = df["estimate"] - df["monte_carlo"]
+    return df
+
+
+def estimate_all(G, model="IC", p=0.1, max_steps=20):
+    """Raccourci : compile G et renvoie l'estimation de diffusion de chaque nœud."""
+    cg = compile_graph(G)
+    if model == "IC":
+        return ic_influence_bound(cg, p, max_steps)
+    return lt_influence_estimate(cg, max_steps)
@@ -0,0 +1,131 @@
+# synthetic_data.py
+
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+
+# =====================================================================
+# Générateur de données synthétiques au format GitHub
+#
+# Produit les 4 tables attendues par build_github_graph (colonnes déjà
+# renommées "author") : l'activité des auteurs suit une loi de puissance
+# (quelques auteurs très actifs, une longue traîne d'occasionnels).
+# =====================================================================
+
+def _author_names(n_authors):
+    return np.char.add("dev_", np.arange(n_authors).astype(str)).astype(object)
+
+
+def _power_law_authors(rng, names, size, exponent):
+    """Tire size auteurs parmi names avec P(rang r) ∝ r^-exponent."""
+    weights = np.arange(1, len(names) + 1, dtype=np.float64) ** -exponent
+    weights /= weights.sum()
+    return names[rng.choice(len(names), size=size, p=weights)]
+
+
+def _timestamps(rng, size, start="2024-01-01", days=365):
+    """Dates ISO 8601 triées (même format que le scraper)."""
+    offsets = np.sort(rng.integers(0, days * 86400, size=size))
+    dates = np.datetime64(start, "s") + offsets
+    return np.char.add(np.datetime_as_string(dates, unit="s"), "+00:00")
+
+
+def generate_github_data(
+    n_authors=1000,
+    n_commits=100,
+    n_issues=100,
+    n_comments=200,
+    n_stars=100,
+    exponent=1.2,
+    seed=0
+):
+    """
+    Génère (commits, issues, comments, stars) sous forme de DataFrames.
+    Toutes les stars pointent vers le même hub "repo_starred" dans le graphe.
+    """
+    rng = np.random.default_rng(seed)
+    names = _author_names(max(n_authors, n_stars))
+
+    commits = pd.DataFrame({
+        "sha": np.char.zfill(np.arange(n_commits).astype(str), 40),
+        "author": _power_law_authors(rng, names[:n_authors], n_commits, exponent),
+        "date": _timestamps(rng, n_commits),
+        "message": "synthetic commit"
+    })
+
+    numbers = np.arange(1, n_issues + 1)
+    issues = pd.DataFrame({
+        "id": numbers + 10 ** 9,
+        "number": numbers,
+        "author": _power_law_authors(rng, names[:n_authors], n_issues, exponent),
+        "state": rng.choice(["open", "closed"], size=n_issues),
+        "title": "synthetic issue",
+        "body": "",
+        "created_at": _timestamps(rng, n_issues)
+    })
+
+    # Les issues populaires concentrent les commentaires
+    issue_weights = np.arange(1, n_issues + 1, dtype=np.float64) ** -exponent
+    issue_weights /= issue_weights.sum()
+    comments = pd.DataFrame({
+        "issue_number": rng.choice(numbers, size=n_comments, p=issue_weights),
+        "author": _power_law_authors(rng, names[:n_authors], n_comments, exponent),
+        "body": "",
+        "created_at": _timestamps(rng, n_comments)
+    })
+
+    # Stargazers : tous distincts, pris uniformément
+    star_ids = rng.choice(len(names), size=n_stars, replace=False)
+    stars = pd.DataFrame({"author": names[star_ids]})
+
+    return commits, issues, comments, stars
+
+
+def count_edges(commits, issues, comments, stars):
+    """Nombre d'arcs de build_github_graph, calculé sans construire le graphe."""
+    issue_authors = set(issues["author"].dropna())
+    commit_authors = set(commits["author"].dropna())
+    pairs = len(issue_authors) * len(commit_authors) - len(issue_authors & commit_authors)
+    comment_edges = len(comments[["author", "issue_number"]].drop_duplicates())
+    return pairs + comment_edges + stars["author"].nunique()
+
+
+def sizes_for_edges(n_edges, exponent=1.2, seed=0, iterations=3):
+    """
+    Tailles de tables donnant environ n_edges arcs dans build_github_graph :
+    ~60 % de paires issue → commit, ~30 % de commentaires, ~10 % de stars.
+    Les doublons dus à la loi de puissance sont compensés par quelques
+    itérations de calibrage sur des données générées.
+    """
+    sizes = {
+        "n_authors": max(100, n_edges // 5),
+        "n_commits": max(10, int(np.sqrt(0.6 * n_edges))),
+        "n_issues": max(10, int(np.sqrt(0.6 * n_edges))),
+        "n_comments": max(10, int(0.3 * n_edges)),
+        "n_stars": max(10, int(0.1 * n_edges))
+    }
+
+    for _ in range(iterations):
+        commits, issues, comments, _ = generate_github_data(**sizes, exponent=exponent, seed=seed)
+        pairs = issues["author"].nunique() * commits["author"].nunique()
+        comment_edges = len(comments[["author", "issue_number"]].drop_duplicates())
+
+        side = int(sizes["n_commits"] * np.sqrt(0.6 * n_edges / max(pairs, 1)))
+        sizes["n_commits"] = sizes["n_issues"] = max(10, side)
+        sizes["n_comments"] = max(10, int(sizes["n_comments"] * 0.3 * n_edges / max(comment_edges, 1)))
+
+    return sizes
+
+
+def write_dataset(folder, commits, issues, comments, stars):
+    """Écrit les tables au format du scraper (colonne "user" comme GitHub)."""
+    folder = Path(folder)
+    folder.mkdir(parents=True, exist_ok=True)
+
+    for name, df in [("commits", commits), ("issues", issues),
+                     ("comments", comments), ("stars", stars)]:
+        if name != "commits":
+            df = df.rename(columns={"author": "user"})
+        df.to_json(folder / f"{name}.json", orient="records", indent=2, force_ascii=False)
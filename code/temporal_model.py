@@ -0,0 +1,181 @@
+# temporal_model.py
+
+from collections import Counter, deque
+from itertools import islice
+
+import numpy as np
+import pandas as pd
+
+
+# =====================================================================
+# Modèle IC temporel : rejeu de la diffusion sur le journal d'événements
+#
+# Les contacts sont ceux de build_github_graph, datés :
+#   - commentaire de u sur l'issue i à t   → contact u → i à t
+#   - commit de c à t, issue de a ouverte  → contact a → c à t
+#     dans [t - window, t)
+# Un nœud activé à t_a reste contagieux pendant window : il ne peut
+# transmettre que lors de contacts dans [t_a, t_a + window]. Les chemins
+# de diffusion respectent donc l'ordre du temps. Les stars ne sont pas
+# datées par le scraper et sont ignorées.
+# =====================================================================
+
+COMMIT, ISSUE, COMMENT = 0, 1, 2
+EVENT_NAMES = ("commit", "issue", "comment")
+
+
+# =====================================================================
+# 🕒 1. FLUX D'ÉVÉNEMENTS
+# =====================================================================
+
+def _events(df, kind, time_col, issue_col=None):
+    if df.empty or time_col not in df.columns:
+        return None
+    df = df.dropna(subset=["author", time_col])
+    return pd.DataFrame({
+        "time": pd.to_datetime(df[time_col], utc=True).dt.as_unit("ns").astype("int64").to_numpy(),
+        "kind": np.full(len(df), kind, dtype=np.int8),
+        "actor": df["author"].to_numpy(dtype=object),
+        "issue": (df[issue_col].to_numpy(dtype=np.int64) if issue_col
+                  else np.full(len(df), -1, dtype=np.int64))
+    })
+
+
+def build_event_stream(commits, issues, comments):
+    """
+    Fusionne commits, issues et commentaires en un flux trié par date
+    (un seul tri, O(E log E)). Colonnes : time (ns UTC), kind, actor, issue.
+    À date égale, l'ordre est commit < issue < commentaire.
+    """
+    parts = [
+        _events(commits, COMMIT, "date"),
+        _events(issues, ISSUE, "created_at", "number"),
+        _events(comments, COMMENT, "created_at", "issue_number")
+    ]
+    parts = [p for p in parts if p is not None]
+    if not parts:       # aucun événement daté : flux vide, mêmes colonnes
+        return pd.DataFrame({"time": np.empty(0, dtype=np.int64), "kind": np.empty(0, dtype=np.int8),
+                             "actor": np.empty(0, dtype=object), "issue": np.empty(0, dtype=np.int64)})
+    events = pd.concat(parts, ignore_index=True)
+    order = np.lexsort((events["kind"].to_numpy(), events["time"].to_numpy()))
+    return events.iloc[order].reset_index(drop=True)
+
+
+# =====================================================================
+# 🧠 2. REJEU IC TEMPOREL
+# =====================================================================
+
+def temporal_cascade(events, seeds, p=0.1, window="7D", start=None, rng=None):
+    """
+    Rejoue une cascade IC dans l'ordre du temps, en une passe sur events.
+
+    seeds : nœuds actifs à la date start (par défaut : premier événement) ;
+            les issues ouvertes dans [start - window, start) sont déjà dans
+            la fenêtre issue → commit
+    p : probabilité de transmission par contact (p = 1 donne l'ensemble
+        des nœuds atteignables par un chemin respectant le temps)
+    window : durée de contagion et largeur de la fenêtre issue → commit
+
+    Mémoire : seules les issues de la fenêtre courante sont conservées.
+    Coût : O(E) après le tri du flux. Un commit ne parcourt pas les auteurs
+    de la fenêtre : on tient à jour ceux qui sont aussi contagieux, et le
+    premier contact réussi parmi eux est tiré d'un coup (loi géométrique,
+    O(1 / p) en moyenne).
+    Retour : DataFrame (node, activated_at, source) trié par date.
+    """
+    rng = rng if rng is not None else np.random.default_rng()
+    window = pd.Timedelta(window).value
+
+    times = events["time"].to_numpy()
+    kinds = events["kind"].to_numpy()
+    actors = events["actor"].to_numpy()
+    issue_numbers = events["issue"].to_numpy()
+
+    if start is not None:
+        t0 = pd.Timestamp(start).as_unit("ns").value
+    elif times.size:
+        t0 = times[0]
+    else:
+        t0 = None                   # flux vide : seuls les seeds, sans date
+    activated = {s: t0 for s in dict.fromkeys(seeds)}
+    rows = [(s, t0, None) for s in activated]
+
+    recent_issues = deque()         # (date, auteur) des issues de la fenêtre
+    recent_authors = Counter()      # auteur → nombre d'issues dans la fenêtre
+    contagious = deque((t0 + window, s) for s in activated) if t0 is not None else deque()
+    sources = {}                    # auteurs de la fenêtre encore contagieux (ordre d'entrée)
+
+    # le flux est trié : les issues de [t0 - window, t0) précèdent la première
+    # date rejouée, et les seeds qui en sont auteurs sont contagieux dès t0
+    first = 0
+    if t0 is not None:
+        lo, first = np.searchsorted(times, [t0 - window, t0])
+        for i in np.flatnonzero(kinds[lo:first] == ISSUE) + lo:
+            recent_issues.append((times[i], actors[i]))
+            recent_authors[actors[i]] += 1
+        for s in activated:
+            if recent_authors.get(s):
+                sources[s] = None
+
+    def infectious(node, t):
+        t_a = activated.get(node)
+        return t_a is not None and t_a <= t <= t_a + window
+
+    def activate(node, t, source):
+        activated[node] = t
+        rows.append((node, t, source))
+        contagious.append((t + window, node))
+        if recent_authors.get(node):
+            sources[node] = None
+
+    for t, kind, actor, number in zip(times[first:], kinds[first:], actors[first:],
+                                      issue_numbers[first:]):
+        while recent_issues and recent_issues[0][0] < t - window:
+            _, author = recent_issues.popleft()
+            recent_authors[author] -= 1
+            if not recent_authors[author]:
+                del recent_authors[author]
+                sources.pop(author, None)
+        # activations dans l'ordre du temps : les fins de contagion aussi
+        while contagious and contagious[0][0] < t:
+            sources.pop(contagious.popleft()[1], None)
+
+        if kind == ISSUE:
+            recent_authors[actor] += 1
+            recent_issues.append((t, actor))
+            if infectious(actor, t):
+                sources[actor] = None
+
+        elif kind == COMMENT:
+            if number not in activated and infectious(actor, t) and rng.random() < p:
+                activate(number, t, actor)
+
+        elif actor not in activated and sources and p > 0:
+            # un essai de probabilité p par auteur contagieux, dans l'ordre :
+            # le premier succès est le k-ième essai, k ~ Géométrique(p)
+            k = rng.geometric(p)
+            if k <= len(sources):
+                activate(actor, t, next(islice(sources, k - 1, None)))
+
+    df = pd.DataFrame(rows, columns=["node", "activated_at", "source"])
+    df["activated_at"] = pd.to_datetime(df["activated_at"], utc=True)
+    return df
+
+
+# =====================================================================
+# 📊 3. ACTIVATIONS PAR PÉRIODE
+# =====================================================================
+
+def activation_timeline(cascade, freq="7D"):
+    """
+    Nombre d'activations par période de durée freq (périodes consécutives,
+    sans chevauchement : resample), et cumul.
+    """
+    counts = (
+        cascade.set_index("activated_at")["node"]
+        .resample(freq).count()
+        .rename("activations")
+        .to_frame()
+    )
+    counts["cumulative"] = counts["activations"].cumsum()
+    return counts
@@ -0,0 +1,197 @@
+# windowed_graph.py
+
+from collections import Counter
+
+import numpy as np
+import pandas as pd
+
+from compiled_graph import compile_edges
+from node_index import NodeIndex
+from temporal_model import COMMENT, ISSUE, build_event_stream
+
+
+# =====================================================================
+# Graphe GitHub sur fenêtre glissante, maintenu incrémentalement
+#
+# Le graphe de la fenêtre [t - width, t) est celui que construirait
+# build_github_graph sur les seuls événements de la fenêtre :
+#   - auteur d'issue → auteur de commit (les deux présents dans la fenêtre)
+#   - commentateur → numéro d'issue
+#   - stargazer → "repo_starred" (les stars ne sont pas datées : toujours présentes)
+# Avancer la fenêtre ajoute les événements entrants et retire les sortants ;
+# seuls les arcs qui apparaissent ou disparaissent sont touchés.
+# =====================================================================
+
+class WindowedGraph:
+    """
+    Tous les nœuds de la période sont internés une fois (ids stables d'une
+    fenêtre à l'autre, les nœuds absents de la fenêtre sont isolés).
+    """
+
+    def __init__(self, commits, issues, comments, stars, width="30D"):
+        self.events = build_event_stream(commits, issues, comments)
+        self.width = pd.Timedelta(width).value
+
+        star_authors = list(stars["author"].dropna()) if "author" in stars.columns else []
+        labels = set(self.events["actor"])
+        labels |= set(self.events.loc[self.events["kind"] == COMMENT, "issue"])
+        labels |= set(star_authors)
+        if star_authors:
+            labels.add("repo_starred")
+
+        self.index = NodeIndex.from_labels(labels)
+        self.n = len(self.index)
+
+        self._times = self.events["time"].to_numpy()
+        self._kinds = self.events["kind"].to_numpy()
+        self._actors = self.index.ids(self.events["actor"])
+        issue_ids = np.full(len(self.events), -1, dtype=np.int64)
+        is_comment = self._kinds == COMMENT
+        issue_ids[is_comment] = self.index.ids(self.events["issue"][is_comment])
+        self._issues = issue_ids
+
+        # pointeurs dans le flux trié : [_tail, _head) = événements de la fenêtre
+        self._head = 0
+        self._tail = 0
+
+        self.issue_authors = Counter()      # auteur → issues dans la fenêtre
+        self.commit_authors = Counter()     # auteur → commits dans la fenêtre
+        self.comment_pairs = Counter()      # (auteur, issue) → commentaires
+
+        self.edges = set()                  # clés u * n + v
+        self.out_deg = np.zeros(self.n, dtype=np.int64)
+        self.in_deg = np.zeros(self.n, dtype=np.int64)
+        self._added, self._removed = set(), set()
+        self._keys = np.empty(0, dtype=np.int64)
+        self._snapshot = None
+
+        if star_authors:
+            hub = self.index.id_of("repo_starred")
+            for u in self.index.ids(star_authors):
+                self._add_edge(int(u), hub)
+
+    # ----------------------------
+    # Arcs
+    # ----------------------------
+    def _add_edge(self, u, v):
+        key = u * self.n + v
+        if key in self.edges:
+            return
+        self.edges.add(key)
+        self.out_deg[u] += 1
+        self.in_deg[v] += 1
+        if key in self._removed:
+            self._removed.discard(key)
+        else:
+            self._added.add(key)
+
+    def _remove_edge(self, u, v):
+        key = u * self.n + v
+        if key not in self.edges:
+            return
+        self.edges.discard(key)
+        self.out_deg[u] -= 1
+        self.in_deg[v] -= 1
+        if key in self._added:
+            self._added.discard(key)
+        else:
+            self._removed.add(key)
+
+    # ----------------------------
+    # Événements
+    # ----------------------------
+    def _apply(self, i, sign):
+        kind, actor = self._kinds[i], int(self._actors[i])
+
+        if kind == COMMENT:
+            pair = (actor, int(self._issues[i]))
+            self.comment_pairs[pair] += sign
+            if sign > 0 and self.comment_pairs[pair] == 1:
+                self._add_edge(*pair)
+            elif sign < 0 and self.comment_pairs[pair] == 0:
+                del self.comment_pairs[pair]
+                self._remove_edge(*pair)
+            return
+
+        mine, other = (
+            (self.issue_authors, self.commit_authors) if kind == ISSUE
+            else (self.commit_authors, self.issue_authors)
+        )
+        mine[actor] += sign
+
+        # l'auteur entre dans la fenêtre / en sort : arcs avec l'autre rôle
+        if (sign > 0 and mine[actor] == 1) or (sign < 0 and mine[actor] == 0):
+            if mine[actor] == 0:
+                del mine[actor]
+            for partner in other:
+                if partner == actor:
+                    continue
+                u, v = (actor, partner) if kind == ISSUE else (partner, actor)
+                if sign > 0:
+                    self._add_edge(u, v)
+                else:
+                    self._remove_edge(u, v)
+
+    def advance(self, end):
+        """Déplace la fenêtre sur [end - width, end)."""
+        end = pd.Timestamp(end).as_unit("ns").value
+        start = end - self.width
+
+        while self._head < len(self._times) and self._times[self._head] < end:
+            self._apply(self._head, +1)
+            self._head += 1
+        while self._tail < self._head and self._times[self._tail] < start:
+            self._apply(self._tail, -1)
+            self._tail += 1
+
+    # ----------------------------
+    # Lecture
+    # ----------------------------
+    def degree(self):
+        """Degré (entrant + sortant) de chaque nœud dans la fenêtre, tenu à jour en O(1)."""
+        return pd.Series(self.out_deg + self.in_deg, index=self.index.labels(np.arange(self.n)))
+
+    def snapshot(self):
+        """
+        Graphe compilé de la fenêtre courante. Le tableau trié des arcs est
+        mis à jour avec le seul delta depuis l'instantané précédent, puis
+        recompilé en CSR par une passe numpy.
+        """
+        if self._snapshot is not None and not self._added and not self._removed:
+            return self._snapshot
+
+        keys = self._keys
+        if self._removed:
+            removed = np.fromiter(self._removed, np.int64, count=len(self._removed))
+            keys = np.delete(keys, np.searchsorted(keys, removed))
+        if self._added:
+            added = np.sort(np.fromiter(self._added, np.int64, count=len(self._added)))
+            keys = np.insert(keys, np.searchsorted(keys, added), added)
+        self._keys = keys
+        self._added, self._removed = set(), set()
+
+        self._snapshot = compile_edges(self.index, keys // self.n, keys % self.n)
+        return self._snapshot
+
+
+def window_snapshots(commits, issues, comments, stars, width="30D", step="7D",
+                     start=None, end=None):
+    """
+    Itère sur les fenêtres [t - width, t) pour t = start + width, +step, …
+    Renvoie des tuples (début, fin, CompiledGraph) ; rien sans événement daté.
+    """
+    wg = WindowedGraph(commits, issues, comments, stars, width)
+    times = wg.events["time"]
+    if times.empty:
+        return
+    width = pd.Timedelta(width)
+    start = pd.Timestamp(times.iloc[0], tz="UTC") if start is None else pd.Timestamp(start)
+    end = pd.Timestamp(times.iloc[-1] + 1, tz="UTC") if end is None else pd.Timestamp(end)
+
+    t = start + width
+    while True:
+        wg.advance(t)
+        yield t - width, t, wg.snapshot()
+        if t >= end:
+            break
+        t += pd.Timedelta(step)